@@ -0,0 +1,154 @@
+import argparse
+import csv
+import sys
+from datetime import datetime
+
+from controller import Controller
+from controllers.player_import import iter_player_rows
+from tournoi import open_storage
+from view import MenuView
+
+# Number of rejected rows of an import listed on the terminal.
+REJECTS_SHOWN = 10
+
+
+def parse_date(text):
+    """Parse a YYYY-MM-DD date argument."""
+    try:
+        return datetime.strptime(text, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide (YYYY-MM-DD attendu) : {text}")
+
+
+def import_players(controller, args):
+    """Register the players of a JSON or CSV file, and report the rejected rows."""
+    try:
+        result = controller.import_players(iter_player_rows(args.file))
+    except (OSError, ValueError, csv.Error) as error:
+        controller.menu_view.print_message(f"Import impossible : {error}")
+        return False
+    controller.menu_view.print_message(f"{len(result.added)} joueurs ajoutés, {len(result.rejects)} rejetés.")
+    for number, national_id, reason in result.rejects[:REJECTS_SHOWN]:
+        controller.menu_view.print_message(f"  enregistrement {number} ({national_id}) : {reason}")
+    if len(result.rejects) > REJECTS_SHOWN:
+        controller.menu_view.print_message(f"  ... et {len(result.rejects) - REJECTS_SHOWN} autres.")
+    if args.rejects:
+        result.write_rejects(args.rejects)
+        controller.menu_view.print_message(f"Lignes rejetées écrites dans {args.rejects}.")
+    return True
+
+
+def create_tournament(controller, args):
+    """Create a tournament with the given registered players."""
+    index = controller.create_tournament(args.name, args.location, args.start, args.end, args.rounds,
+                                         args.description, args.players)
+    if index is None:
+        return False
+    controller.menu_view.print_message(f"Tournoi {index + 1} créé : {args.name}")
+    return True
+
+
+def pair_round(controller, args):
+    """Pair the next round of a tournament and print its pairings."""
+    index = controller.find_tournament(args.tournament)
+    if index is None:
+        return False
+    new_round = controller.pair_round(index, args.name)
+    if new_round is None:
+        return False
+    controller.menu_view.print_message(f"{new_round.name} :")
+    for board, match in enumerate(new_round.matches, 1):
+        white = f"{match.player1.first_name} {match.player1.last_name} ({match.player1.national_id})"
+        if match.player2 is None:
+            controller.menu_view.print_message(f"  {board}. {white} : exempt")
+        else:
+            black = f"{match.player2.first_name} {match.player2.last_name} ({match.player2.national_id})"
+            controller.menu_view.print_message(f"  {board}. {white} - {black}")
+    return True
+
+
+def enter_results(controller, args):
+    """Enter all the results of the round waiting for them, from a file or the standard input."""
+    index = controller.find_tournament(args.tournament)
+    if index is None:
+        return False
+    try:
+        if args.file == "-":
+            completed = controller.enter_results(index, sys.stdin)
+        else:
+            with open(args.file, encoding="utf-8") as file:
+                completed = controller.enter_results(index, file)
+    except OSError as error:
+        controller.menu_view.print_message(f"Lecture impossible : {error}")
+        return False
+    if completed is None:
+        return False
+    controller.menu_view.print_message(f"Résultats du tour {completed.name} enregistrés.")
+    return True
+
+
+def export_standings(controller, args):
+    """Write the standings of a tournament to a CSV or text file."""
+    index = controller.find_tournament(args.tournament)
+    return index is not None and controller.export_standings(index, args.file) is not None
+
+
+def build_parser():
+    """Build the parser of the command line, with one subcommand per action."""
+    parser = argparse.ArgumentParser(description="Gestion de tournois d'échecs en ligne de commande.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("import-players", help="importer des joueurs d'un fichier JSON ou CSV")
+    command.add_argument("file", help="fichier .json (comme players_placeholder.json) ou .csv")
+    command.add_argument("--rejects", help="fichier CSV où écrire les lignes rejetées")
+    command.set_defaults(run=import_players)
+
+    command = commands.add_parser("create-tournament", help="créer un tournoi")
+    command.add_argument("name", help="nom du tournoi")
+    command.add_argument("--location", required=True, help="lieu du tournoi")
+    command.add_argument("--start", required=True, type=parse_date, help="date de début (YYYY-MM-DD)")
+    command.add_argument("--end", required=True, type=parse_date, help="date de fin (YYYY-MM-DD)")
+    command.add_argument("--rounds", type=int, default=4, help="nombre de tours (4 par défaut)")
+    command.add_argument("--description", default="", help="description du tournoi")
+    command.add_argument("--players", nargs="*", default=[], metavar="ID", help="identifiants des joueurs")
+    command.set_defaults(run=create_tournament)
+
+    command = commands.add_parser("pair-round", help="apparier le tour suivant d'un tournoi")
+    command.add_argument("tournament", help="numéro ou nom du tournoi")
+    command.add_argument("--name", help="nom du tour (Tour <numéro> par défaut)")
+    command.set_defaults(run=pair_round)
+
+    command = commands.add_parser("enter-results", help="saisir les résultats du tour apparié")
+    command.add_argument("tournament", help="numéro ou nom du tournoi")
+    command.add_argument("file", help="un résultat par ligne, précédé ou non de l'échiquier ou des identifiants "
+                         "des joueurs (- pour l'entrée standard)")
+    command.set_defaults(run=enter_results)
+
+    command = commands.add_parser("export-standings", help="exporter le classement d'un tournoi")
+    command.add_argument("tournament", help="numéro ou nom du tournoi")
+    command.add_argument("file", help="fichier .csv, ou texte pour toute autre extension")
+    command.set_defaults(run=export_standings)
+    return parser
+
+
+def main(argv=None):
+    """
+    Run one command of the command line.
+    Args:
+        argv (list): The arguments; sys.argv[1:] if None.
+    Returns:
+        int: The exit status.
+    """
+    args = build_parser().parse_args(argv)
+    menu_view = MenuView()
+    controller = Controller(menu_view, open_storage())
+    try:
+        succeeded = args.run(controller, args)
+    finally:
+        controller.close()
+        menu_view.flush()
+    return 0 if succeeded else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,107 +1,70 @@
-import json
 from datetime import datetime
 
 from models.player import Player
 from models.tournament import Tournament
 from models.round import Round
-from models.match import Match
 from controllers.matchmaking import Matchmaking  # Import Matchmaking class
+from controllers.storage import JsonStorage, dict_to_tournament, dict_to_round
+from controllers.simulation import simulate_tournament
+from controllers.rating import recompute_ratings, update_round_ratings
+from controllers.archive import MatchArchive, build_archive
+from controllers.executor import run_tournaments, simulate_parallel
+from controllers.player_import import register_players
+from controllers.results import apply_results, match_results, parse_results
+from controllers.reports import (
+    players_report, tournaments_report, tournament_players_report, rounds_and_matches_report, standings_report,
+    player_games_report
+)
 
 
 class Controller:
     """
     Controller class to manage players and tournaments data.
+    Persistence is delegated to a storage backend (JsonStorage by default, see controllers/storage.py).
     Methods:
-        __init__(): Initializes the controller and loads players and tournaments data.
-        load_players(): Loads player data from a JSON file.
-        load_tournaments(): Loads tournaments data from a JSON file.
-        save_players(): Saves the current players data to a JSON file.
-        save_tournaments(): Saves the current tournaments data to a JSON file.
-        refresh_json_files(): Refreshes both players and tournaments JSON files with current data.
+        __init__(menu_view, storage): Initializes the controller and loads players and tournaments data.
+            Players are indexed by national ID in a PlayerRegistry (player_registry). Loading interns
+            players, so rosters and matches share the registered Player objects.
+        refresh_json_files(): Writes a full snapshot of the players and tournaments through the storage.
         add_player(last_name, first_name, birth_date, national_id): Adds a new player and updates the JSON file.
         add_tournament(tournament): Adds a new tournament and updates the JSON file.
+        create_tournament(name, location, start_date, end_date, ...): Adds a tournament without prompting.
+        pair_round(tournament_index, round_name): Pairs the next round, whose results are entered later.
+        enter_results(tournament_index, results): Enters the results of the paired round.
+        import_players(rows): Registers players in bulk, with a single save.
+        export_standings(tournament_index, path): Writes the standings of a tournament to a file.
+        find_tournament(reference): Finds a tournament by number or name.
+        close(): Closes the storage.
         add_round_to_tournament(tournament_index, round_name): Adds a new round to a specified tournament.
+        run_tournaments_parallel(tournament_indices, max_workers): Plays several tournaments in worker processes.
+        simulate_tournament(tournament_index, simulations, number_of_rounds, ratings, max_workers):
+            Displays the chances of each player of a tournament.
+        recompute_ratings(): Recomputes the ratings of all players from the archive.
         get_all_tournaments(): Returns a list of all tournaments.
         dict_to_tournament(data): Converts a dictionary to a Tournament object.
         dict_to_round(data): Converts a dictionary to a Round object.
+        show_report(report): Displays a report through the pager (see controllers/reports.py).
+        export_report(report, path): Writes a report to a CSV or text file.
     """
 
-    def __init__(self, menu_view):
+    def __init__(self, menu_view, storage=None):
         self.menu_view = menu_view
-        self.players_data = self.load_players()
-        self.tournaments_data = self.load_tournaments()
-
-    def load_players(self):
-        """
-        Load player data from a JSON file and return a list of Player objects.
-        Returns an empty list if the file is not found or contains invalid JSON.
-        """
-        try:
-            with open("data_players.json", "r") as file:
-                data = json.load(file)
-                return [
-                    Player(
-                        last_name=p["last_name"],
-                        first_name=p["first_name"],
-                        birth_date=datetime.strptime(
-                            p["birth_date"], "%Y-%m-%d"
-                        ).date(),
-                        national_id=p["national_id"],
-                        total_points=p.get("total_points", 0)
-                    ) for p in data.get("players_data", [])
-                ]
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-    def load_tournaments(self):
-        """
-        Load tournaments from a JSON file.
-
-        Returns:
-            list: A list of tournament objects or an empty list if the file is not found or invalid.
-        """
-        try:
-            with open("data_tournaments.json", "r") as file:
-                data = json.load(file)
-                return [
-                    self.dict_to_tournament(t)
-                    for t in data.get("tournaments_data", [])
-                ]
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-    def save_players(self):
-        """Save players' data to a JSON file."""
-        with open("data_players.json", "w") as file:
-            json.dump(
-                {"players_data": [
-                    player.to_dict() for player in self.players_data
-                ]},
-                file,
-                indent=4
-            )
-
-    def save_tournaments(self):
-        """Save the current tournaments data to a JSON file."""
-        with open("data_tournaments.json", "w") as file:
-            json.dump(
-                {"tournaments_data": [
-                    t.to_dict() for t in self.tournaments_data
-                ]},
-                file,
-                indent=4
-            )
+        self.storage = storage if storage is not None else JsonStorage()
+        self.players_data, self.tournaments_data = self.storage.load()
+        self.player_registry = self.storage.registry
 
     def refresh_json_files(self):
-        """Refresh the JSON files with the current data."""
-        self.save_tournaments()
-        self.save_players()
+        """Write a full snapshot of the current data through the storage backend."""
+        self.storage.save()
 
     def add_player(self, last_name, first_name, birth_date, national_id):
         """Adds a new player to the players_data list and updates the JSON files."""
+        if national_id in self.player_registry:
+            self.menu_view.print_message(f"Un joueur avec l'identifiant {national_id} existe déjà.")
+            return
         new_player = Player(last_name, first_name, birth_date, national_id)
-        self.players_data.append(new_player)
-        self.refresh_json_files()
+        self.player_registry.add(new_player)
+        self.storage.player_added(new_player)
         self.menu_view.print_message(f"Player {first_name} {last_name} added successfully.")
 
     def add_tournament(self, name):
@@ -113,33 +76,56 @@ class Controller:
         Args:
             name (str): The name of the tournament.
         """
-        location = input("Entrez le lieu du tournoi: ")
-        start_date_str = input("Date de début du tournoi (YYYY-MM-DD): ")
-        end_date_str = input("Date de fin du tournoi (YYYY-MM-DD): ")
-        number_of_rounds = int(input("Entrez le nombre de tours: "))
-        description = input("Entrez la description du tournoi: ")
+        location = self.menu_view.prompt("Entrez le lieu du tournoi: ")
+        start_date_str = self.menu_view.prompt("Date de début du tournoi (YYYY-MM-DD): ")
+        end_date_str = self.menu_view.prompt("Date de fin du tournoi (YYYY-MM-DD): ")
+        number_of_rounds = int(self.menu_view.prompt("Entrez le nombre de tours: "))
+        description = self.menu_view.prompt("Entrez la description du tournoi: ")
 
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
         end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
 
-        new_tournament = Tournament(name, location, start_date, end_date,
-                                    number_of_rounds, description)
-
+        player_ids = []
         while True:
-            national_id = input("ID national du joueur ('done' pour finir): ")
+            national_id = self.menu_view.prompt("ID national du joueur ('done' pour finir): ")
             if national_id.lower() == 'done':
                 break
-            player = next((p for p in self.players_data
-                           if p.national_id == national_id), None)
+            player = self.player_registry.get(national_id)
             if player:
-                new_tournament.add_player(player)
+                player_ids.append(national_id)
                 self.menu_view.print_message(f"Joueur {player.first_name} {player.last_name} ajouté.")
             else:
                 self.menu_view.print_message("Joueur non trouvé.")
 
+        self.create_tournament(name, location, start_date, end_date, number_of_rounds, description, player_ids)
+        self.menu_view.pause("Tournoi ajouté. Appuyez sur Entrée pour continuer...")
+
+    def create_tournament(self, name, location, start_date, end_date, number_of_rounds=4, description="",
+                          player_ids=()):
+        """
+        Create a tournament without prompting, e.g. from the command line (see cli.py).
+        Args:
+            name (str): The name of the tournament.
+            location (str): The location of the tournament.
+            start_date (date): The start date.
+            end_date (date): The end date.
+            number_of_rounds (int): The number of rounds.
+            description (str): The description.
+            player_ids (Iterable[str]): The national IDs of the registered players taking part.
+        Returns:
+            int: The index of the new tournament, or None if a player is unknown.
+        """
+        unknown = [national_id for national_id in player_ids if national_id not in self.player_registry]
+        if unknown:
+            self.menu_view.print_message(f"Joueurs non trouvés : {', '.join(unknown)}")
+            return None
+        new_tournament = Tournament(name, location, start_date, end_date, number_of_rounds, description)
+        for national_id in dict.fromkeys(player_ids):
+            new_tournament.add_player(self.player_registry.get(national_id))
         self.tournaments_data.append(new_tournament)
-        self.refresh_json_files()
-        input("Tournoi ajouté. Appuyez sur Entrée pour continuer...")
+        index = len(self.tournaments_data) - 1
+        self.storage.tournament_added(index, new_tournament)
+        return index
 
     def add_round_to_tournament(self, tournament_index, round_name):
         """
@@ -155,7 +141,7 @@ class Controller:
         if 0 <= tournament_index < len(self.tournaments_data):
             new_round = Round(round_name)
             self.tournaments_data[tournament_index].add_round(new_round)
-            self.refresh_json_files()
+            self.storage.round_added(tournament_index, new_round)
             return True
         return False
 
@@ -172,7 +158,7 @@ class Controller:
             return
 
         while True:
-            name = input("Entrez le nom du tour (ou 'done' pour terminer): ")
+            name = self.menu_view.prompt("Entrez le nom du tour (ou 'done' pour terminer): ")
             if name.lower() == 'done':
                 break
             if self.add_round_to_tournament(tournament_index, name):
@@ -192,7 +178,7 @@ class Controller:
             self.menu_view.print_message("4. Liste des joueurs du tournoi par ordre alphabétique")
             self.menu_view.print_message("5. Liste de tous les tours du tournoi et de tous les matchs du tour")
             self.menu_view.print_message("6. Retour au menu principal")
-            choice = input("Choisissez une option: ")
+            choice = self.menu_view.prompt("Choisissez une option: ")
 
             if choice == '1':
                 self.report_all_players()
@@ -209,20 +195,45 @@ class Controller:
             else:
                 self.menu_view.print_message("Option invalide, veuillez réessayer.")
 
-    def report_all_players(self):
-        """Report: List all players in alphabetical order."""
-        players_sorted = sorted(self.players_data, key=lambda p: (p.last_name, p.first_name))
-        self.menu_view.print_message("\nListe de tous les joueurs par ordre alphabétique:")
-        for player in players_sorted:
-            self.menu_view.print_message(f"{player.first_name} {player.last_name} ({player.national_id})")
-        input("Appuyez sur Entrée pour continuer...")
+    def show_report(self, report):
+        """
+        Display a report through the pager, and export it if the user asks for it.
+        Args:
+            report (Report): The report, whose lines are built as the pages are displayed.
+        """
+        if self.menu_view.page(report.title, report.lines(), report.empty_message):
+            self.export_report(report, self.menu_view.prompt("Nom du fichier d'export (.csv ou .txt): ").strip())
+
+    def export_report(self, report, path):
+        """
+        Write a report to a CSV file, or to a text file if path does not end with .csv.
+        Rows are written in chunks as they are produced.
+        Args:
+            report (Report): The report.
+            path (str): The path of the file.
+        Returns:
+            int: The number of rows written, or None if nothing was written.
+        """
+        if not path:
+            return None
+        try:
+            if path.lower().endswith(".csv"):
+                count = report.write_csv(path)
+            else:
+                count = report.write_text(path)
+        except OSError as error:
+            self.menu_view.print_message(f"Impossible d'écrire {path} : {error}")
+            return None
+        self.menu_view.print_message(f"{count} lignes exportées dans {path}.")
+        return count
+
+    def report_all_players(self, order="name"):
+        """Report: List all players in alphabetical order, or by points if order is "points"."""
+        self.show_report(players_report(self.player_registry, order))
 
     def report_all_tournaments(self):
-        """Report: List all tournaments."""
-        self.menu_view.print_message("\nListe de tous les tournois:")
-        for tournament in self.tournaments_data:
-            self.menu_view.print_message(f"{tournament.name}")
-        input("Appuyez sur Entrée pour continuer...")
+        """Report: List all tournaments by start date."""
+        self.show_report(tournaments_report(self.tournaments_data))
 
     def report_tournament_details(self, current_tournament):
         """Report: Display the name and dates of the currently loaded tournament."""
@@ -231,32 +242,58 @@ class Controller:
             self.menu_view.print_message(f"Dates: {current_tournament.start_date} - {current_tournament.end_date}")
         else:
             self.menu_view.print_message("Tournoi non sélectionné.")
-        input("Appuyez sur Entrée pour continuer...")
+        self.menu_view.pause()
 
     def report_tournament_players(self, current_tournament):
         """Report: List the players of the currently loaded tournament in alphabetical order."""
         if current_tournament:
-            players_sorted = sorted(current_tournament.players, key=lambda p: (p.last_name, p.first_name))
-            self.menu_view.print_message(f"\nListe alphabétique des joueurs du tournoi {current_tournament.name} :")
-            for player in players_sorted:
-                self.menu_view.print_message(f"{player.first_name} {player.last_name} ({player.national_id})")
+            self.show_report(tournament_players_report(current_tournament))
         else:
             self.menu_view.print_message("Tournoi non sélectionné.")
-        input("Appuyez sur Entrée pour continuer...")
+            self.menu_view.pause()
+
+    def report_tournament_standings(self, current_tournament):
+        """Report: Rank the players of the currently loaded tournament by points, then by tiebreaks."""
+        if current_tournament:
+            self.show_report(standings_report(current_tournament))
+        else:
+            self.menu_view.print_message("Tournoi non sélectionné.")
+            self.menu_view.pause()
+
+    def open_archive(self):
+        """
+        Open the match archive of the completed tournaments, building it again from the storage if it changed.
+        Returns:
+            MatchArchive: The archive.
+        """
+        stamp = self.storage.stamp()
+        try:
+            archive = MatchArchive()
+            if not archive.is_stale(stamp):
+                return archive
+            archive.close()
+        except (FileNotFoundError, ValueError, KeyError):
+            pass
+        return build_archive(self.storage.iter_tournaments(), stamp)
+
+    def report_player_games(self, national_id):
+        """Report: List the games of a player in every completed tournament, read from the match archive."""
+        player = self.player_registry.get(national_id)
+        if player is None:
+            self.menu_view.print_message("Joueur introuvable.")
+            self.menu_view.pause()
+        else:
+            self.show_report(
+                player_games_report(player, self.open_archive, self.tournaments_data, self.player_registry)
+            )
 
     def report_tournament_rounds_and_matches(self, current_tournament):
         """Report: List all rounds of the currently loaded tournament and all matches of the round."""
         if current_tournament:
-            self.menu_view.print_message(f"\nListe des tours du tournoi {current_tournament.name} et ses matchs:")
-            for round in current_tournament.rounds:
-                self.menu_view.print_message(f"Round: {round.name}")
-                for match in round.matches:
-                    self.menu_view.print_message(
-                        f"  Match: {match.player1} ({match.score1}) vs {match.player2} ({match.score2})"
-                    )
+            self.show_report(rounds_and_matches_report(current_tournament))
         else:
             self.menu_view.print_message("Tournoi non sélectionné.")
-        input("Appuyez sur Entrée pour continuer...")
+            self.menu_view.pause()
 
     def filter_players_and_load_tours(self, tournament_index):
         """Filter players and load tours based on the selected tournament."""
@@ -268,13 +305,11 @@ class Controller:
                 )
         else:
             selected_tournament = tournaments_data[tournament_index]
-            tournament_players = [
-                player.national_id for player in selected_tournament.players
-            ]
-            if not self.players_data:
+            if not selected_tournament.players:
                 self.menu_view.print_message("Aucun joueur dans le tournoi")
-            for player in self.players_data:
-                if player.national_id in tournament_players:
+            for national_id in dict.fromkeys(player.national_id for player in selected_tournament.players):
+                player = self.player_registry.get(national_id)
+                if player:
                     self.menu_view.print_message(
                         f"\t\tJoueur: {player.first_name} {player.last_name} ({player.national_id})"
                     )
@@ -298,6 +333,134 @@ class Controller:
                         f"Match: {match.player1} ({match.score1}) vs {match.player2} ({match.score2})"
                     )
 
+    def find_tournament(self, reference):
+        """
+        Find a tournament by its number in the list (1-based, as in the menu) or by its name.
+        Args:
+            reference (str): The number or the name of the tournament.
+        Returns:
+            int: The index of the tournament, or None if there is none.
+        """
+        if reference.isdigit() and 1 <= int(reference) <= len(self.tournaments_data):
+            return int(reference) - 1
+        for index in range(len(self.tournaments_data)):
+            if self.tournaments_data.header(index).name == reference:
+                return index
+        self.menu_view.print_message(f"Tournoi introuvable : {reference}")
+        return None
+
+    def pending_round(self, tournament):
+        """
+        Return the last round of a tournament if it was paired by pair_round() and still waits for its results.
+        Args:
+            tournament (Tournament): The tournament.
+        Returns:
+            Round: The round, or None.
+        """
+        if not tournament.rounds:
+            return None
+        last_round = tournament.rounds[-1]
+        if last_round.end_datetime is None and any(
+            match.player2 is not None and match.score1 + match.score2 == 0 for match in last_round.matches
+        ):
+            return last_round
+        return None
+
+    def restore_tournament_points(self, tournament):
+        """Set the tournament_points of the players to their points in the given tournament, before pairing it."""
+        for player in tournament.players:
+            player.tournament_points = tournament.player_points.get(player.national_id, 0)
+
+    def pair_round(self, tournament_index, round_name=None):
+        """
+        Pair the next round of a tournament without playing it: its results are entered with enter_results().
+        Args:
+            tournament_index (int): Index of the tournament in the list.
+            round_name (str): The name of the round; "Tour <number>" if None.
+        Returns:
+            Round: The paired round, or None if the tournament cannot be paired.
+        """
+        tournament = self.tournaments_data[tournament_index]
+        pending = self.pending_round(tournament)
+        if pending is not None:
+            self.menu_view.print_message(f"Le tour {pending.name} attend ses résultats.")
+            return None
+        if len(tournament.rounds) >= int(tournament.number_of_rounds):
+            self.menu_view.print_message("Tous les tours du tournoi ont été joués.")
+            return None
+        if len(tournament.players) < 2:
+            self.menu_view.print_message("Il faut au moins deux joueurs pour apparier un tour.")
+            return None
+        self.restore_tournament_points(tournament)
+        new_round = Round(round_name or f"Tour {len(tournament.rounds) + 1}")
+        new_round.matches = Matchmaking(self.menu_view).create_pairings(tournament.players, tournament)
+        tournament.add_round(new_round)
+        self.storage.round_added(tournament_index, new_round)
+        return new_round
+
+    def enter_results(self, tournament_index, results):
+        """
+        Enter all the results of the round waiting for them at once (see controllers/results.py).
+        The results are validated against the pairings of the round and every error is reported;
+        nothing is changed unless they are all valid. The points of the players are then updated in
+        one pass, the played games are rated (not the forfeits), and only this tournament and the
+        players of the round are persisted.
+        Args:
+            tournament_index (int): Index of the tournament in the list.
+            results (Iterable): The lines of a results file (str), or ResultEntry objects.
+                Each game is given as 1-0, 0-1, 1/2-1/2 or a forfeit (+/-, -/+, -/-), alone in board
+                order, after its board number or after the national IDs of its players.
+        Returns:
+            Round: The completed round, or None if the results do not match the round.
+        """
+        tournament = self.tournaments_data[tournament_index]
+        pending = self.pending_round(tournament)
+        if pending is None:
+            self.menu_view.print_message("Aucun tour n'attend de résultats.")
+            return None
+        entries, errors = parse_results(results)
+        positions, mismatches = match_results(pending, entries)
+        errors += mismatches
+        for error in errors:
+            self.menu_view.print_message(error)
+        if errors:
+            return None
+        players = apply_results(tournament, pending, positions)
+        update_round_ratings(pending, unrated=[position for position, entry in positions.items() if entry.forfeit])
+        pending.end_round()
+        tournament.invalidate_history()  # The round was recorded in the tiebreaks before its results
+        self.storage.tournament_updated(tournament_index, tournament)
+        self.storage.players_updated(players)
+        return pending
+
+    def import_players(self, rows):
+        """
+        Register players in bulk without prompting (see controllers/player_import.py).
+        Rows are validated by batches, national IDs already registered are rejected through the
+        registry index, and all the new players are registered and persisted with a single save once
+        the whole file was read: an error partway through the file imports nothing.
+        Args:
+            rows (Iterable[dict]): The players, with the keys of Player.to_dict() (at least last_name,
+                first_name, birth_date and national_id), e.g. from iter_player_rows().
+        Returns:
+            ImportResult: The added players and the rejected rows.
+        """
+        result = register_players(rows, self.player_registry)
+        if result.added:
+            self.storage.players_added(result.added)
+        return result
+
+    def export_standings(self, tournament_index, path):
+        """
+        Write the standings of a tournament to a CSV file, or to a text file if path does not end with .csv.
+        Args:
+            tournament_index (int): Index of the tournament in the list.
+            path (str): The path of the file.
+        Returns:
+            int: The number of players written, or None if the file could not be written.
+        """
+        return self.export_report(standings_report(self.tournaments_data[tournament_index]), path)
+
     def run_tournament(self, tournament_index, display_winner_callback):
         """Run the tournament by calling the matchmaking controller."""
         if tournament_index is None:
@@ -305,7 +468,7 @@ class Controller:
         else:
             self.run_matchmaking(tournament_index, display_winner_callback)
             self.menu_view.print_message("Le tournoi a été lancé avec succès.")
-        input("Appuyez sur Entrée pour continuer...")
+        self.menu_view.pause()
 
     def run_matchmaking(self, tournament_index, display_winner_callback):
         """
@@ -321,88 +484,132 @@ class Controller:
                 player.tournament_points = 0  # Reset tournament points for each player
             matchmaking = Matchmaking(self.menu_view)
             all_round_winners = matchmaking.run_tournament(tournament)  # noqa: F841
-            self.refresh_json_files()
+            tournament.sync_player_points()
+            self.storage.tournament_updated(tournament_index, tournament)
+            self.storage.players_updated(tournament.players)
+
+    def run_tournaments_parallel(self, tournament_indices, max_workers=None):
+        """
+        Run several independent tournaments (e.g. the sections of an event) in worker processes,
+        then save them all at once. See controllers.executor.run_tournaments.
+        Args:
+            tournament_indices (list): Indices of the tournaments in the list.
+            max_workers (int): The number of worker processes; the number of CPUs if None.
+        Returns:
+            list: The played Tournament objects, or None if an index is invalid.
+        """
+        indices = list(dict.fromkeys(tournament_indices))
+        if not all(isinstance(i, int) and 0 <= i < len(self.tournaments_data) for i in indices):
+            self.menu_view.print_message("Tournoi non sélectionné")
+            return None
+        tournaments = [self.tournaments_data[i] for i in indices]
+        for tournament in tournaments:
+            tournament.rounds = []  # Clear existing rounds to avoid duplication
+        played = run_tournaments(tournaments, self.player_registry, max_workers)
+        for index, tournament in zip(indices, played):
+            self.tournaments_data[index] = tournament
+        players = list(dict.fromkeys(player for tournament in played for player in tournament.players))
+        self.storage.tournaments_updated(dict(zip(indices, played)), players)
+        for tournament in played:
+            self.menu_view.print_message(f"Tournoi {tournament.name} terminé.")
+        return played
+
+    def simulate_tournament(self, tournament_index, simulations=10000, number_of_rounds=None, ratings=None,
+                            max_workers=1):
+        """
+        Simulate the tournament many times and display the chances of each player.
+        Args:
+            tournament_index (int): Index of the tournament in the list.
+            simulations (int): The number of tournaments to simulate.
+            number_of_rounds (int): The number of rounds to simulate; the tournament's own if None.
+            ratings (list): The rating of each player of the roster; the players' ratings if None.
+            max_workers (int): The number of worker processes sharing the simulations; the number of CPUs if None.
+        Returns:
+            SimulationResult: The outcome counts, or None if the simulation could not run.
+        """
+        if not (isinstance(tournament_index, int) and 0 <= tournament_index < len(self.tournaments_data)):
+            self.menu_view.print_message("Tournoi non sélectionné")
+            return None
+        tournament = self.tournaments_data[tournament_index]
+        players = list(dict.fromkeys(tournament.players))
+        if not players:
+            self.menu_view.print_message("Aucun joueur inscrit à ce tournoi.")
+            return None
+        if number_of_rounds is None:
+            number_of_rounds = int(tournament.number_of_rounds)
+        if ratings is None:
+            ratings = [player.rating for player in players]
+        try:
+            if max_workers == 1:
+                result = simulate_tournament(ratings, number_of_rounds, simulations)
+            else:
+                result = simulate_parallel(ratings, number_of_rounds, simulations, max_workers=max_workers)
+        except RuntimeError as error:
+            self.menu_view.print_message(str(error))
+            return None
+
+        self.menu_view.print_message(f"Simulation de {simulations} tournois en {number_of_rounds} tours :")
+        wins, podiums, points = result.win_probability(), result.podium_probability(), result.expected_score()
+        for i in sorted(range(len(players)), key=lambda i: -points[i]):
+            player = players[i]
+            self.menu_view.print_message(
+                f"{player.first_name} {player.last_name} ({player.national_id}) : {points[i]:.2f} points en moyenne, "
+                f"victoire {wins[i]:.1%}, podium {podiums[i]:.1%}"
+            )
+        return result
+
+    def recompute_ratings(self):
+        """
+        Recompute the ratings of all players by replaying every game of the archive, then save them.
+        Returns:
+            int: The number of games rated.
+        """
+        games = recompute_ratings(self.iter_tournaments(), self.players_data)
+        self.storage.players_updated(self.players_data)
+        self.menu_view.print_message(f"Classements Elo recalculés sur {games} parties.")
+        return games
 
     def get_all_tournaments(self):
         """
         Get all tournaments data.
 
         Returns:
-            list: List of all tournaments.
+            LazyTournamentList: List of all tournaments, loaded when accessed.
         """
         return self.tournaments_data
 
-    def dict_to_tournament(self, data):
+    def iter_tournaments(self):
         """
-        Converts a dictionary representation of a tournament into a Tournament object.
+        Iterate over every tournament of the archive with bounded memory, e.g. for exports or statistics.
 
-        Args:
-            data (dict): A dictionary containing tournament data with the following keys:
-            - name (str): The name of the tournament.
-            - location (str): The location where the tournament is held.
-            - start_date (str): The start date of the tournament in ISO format (YYYY-MM-DD).
-            - end_date (str): The end date of the tournament in ISO format (YYYY-MM-DD).
-            - number_of_rounds (int): The number of rounds in the tournament.
-            - description (str): A description of the tournament.
-            - rounds (list): A list of dictionaries, each representing a round.
-            - players (list): A list of dictionaries, each representing a player.
+        Yields:
+            Tournament: The tournaments, one at a time.
+        """
+        return self.storage.iter_tournaments()
+
+    def get_tournament_headers(self):
+        """
+        Get the headers (name, location, dates, number of rounds) of all tournaments
+        without loading their rounds and matches.
 
         Returns:
-            Tournament: An instance of the Tournament class populated with the provided data.
-        """
-        tournament = Tournament(
-            name=data["name"],
-            location=data["location"],
-            start_date=datetime.fromisoformat(data["start_date"]).date(),
-            end_date=datetime.fromisoformat(data["end_date"]).date(),
-            number_of_rounds=data["number_of_rounds"],
-            description=data["description"]
-        )
-        tournament.rounds = [self.dict_to_round(r) for r in data["rounds"]]
-        tournament.players = [Player(
-            last_name=p["last_name"],
-            first_name=p["first_name"],
-            birth_date=datetime.strptime(p["birth_date"], "%Y-%m-%d").date(),
-            national_id=p["national_id"],
-            tournament_points=p.get("tournament_points", 0)
-        ) for p in data["players"]]
-        return tournament
+            list: List of TournamentHeader objects.
+        """
+        return [self.tournaments_data.header(i) for i in range(len(self.tournaments_data))]
+
+    def dict_to_tournament(self, data):
+        """
+        Converts a dictionary representation of a tournament into a Tournament object.
+        See controllers.storage.dict_to_tournament for the expected keys.
+        """
+        return dict_to_tournament(data, self.player_registry)
 
     def dict_to_round(self, data):
         """
         Turn a dictionary into a Round object.
-
-        Args:
-            data (dict): A dictionary with round details like:
-            - "name" (str): The round's name.
-            - "start_datetime" (str): When the round starts (in ISO format).
-            - "end_datetime" (str or None): When the round ends (in ISO format) or None if it hasn't ended.
-            - "matches" (list): A list of dictionaries for each match.
-
-        Returns:
-            Round: A Round object filled with the provided data.
-
-        Note:
-            The `start_datetime` and `end_datetime` are converted from ISO format strings
-            to `datetime` objects using `datetime.fromisoformat`. This makes sure the datetime
-            values are correctly parsed and can be used for datetime operations in the Round object.
-        """
-        round = Round(name=data["name"])
-        round.start_datetime = datetime.fromisoformat(data["start_datetime"])
-        round.end_datetime = (
-            datetime.fromisoformat(data["end_datetime"])
-            if data["end_datetime"]
-            else None
-        )
-        round.matches = [
-            Match(
-                player1=Player(**m["player1"]) if m["player1"] else None,
-                score1=m["score1"],
-                player2=Player(**m["player2"]) if m["player2"] else None,
-                score2=m["score2"]
-            ) for m in data["matches"]
-        ]
-        return round
+        See controllers.storage.dict_to_round for the expected keys.
+        """
+        return dict_to_round(data, self.player_registry)
 
     def handle_choice_1(self, current_tournament):
         """
@@ -414,21 +621,21 @@ class Controller:
         """
         tournaments = self.get_all_tournaments()
         if not tournaments:
-            print("Aucun tournoi disponible")
+            self.menu_view.print_message("Aucun tournoi disponible")
         else:
-            for i, tournament in enumerate(tournaments):
-                print(f"{i + 1}. {tournament.name}")
-            index = int(input(f"Num. de tournoi (1-{len(tournaments)}): "))
+            for i, header in enumerate(self.get_tournament_headers()):
+                self.menu_view.print_message(f"{i + 1}. {header.name}")
+            index = int(self.menu_view.prompt(f"Num. de tournoi (1-{len(tournaments)}): "))
             index -= 1
-            print(" ")
-            print(" ")
+            self.menu_view.print_message(" ")
+            self.menu_view.print_message(" ")
             if 0 <= index < len(tournaments):
                 current_tournament = tournaments[index]
                 self.menu_view.print_header(current_tournament)
                 self.filter_players_and_load_tours(index)
             else:
-                print("Index invalide")
-            input()
+                self.menu_view.print_message("Index invalide")
+            self.menu_view.pause()
         return current_tournament
 
     def handle_choice_2(self, current_tournament):
@@ -438,30 +645,30 @@ class Controller:
             current_tournament: The current tournament object.
         """
         if current_tournament is None:
-            print("Tournoi non sélectionné")
-            input()
+            self.menu_view.print_message("Tournoi non sélectionné")
+            self.menu_view.pause()
         else:
-            tour_index = int(input("Entrez l'index du tour: ")) - 1
+            tour_index = int(self.menu_view.prompt("Entrez l'index du tour: ")) - 1
             tournament_index = self.tournaments_data.index(current_tournament)
             self.load_matches(tournament_index, tour_index)
-            input()
+            self.menu_view.pause()
 
     def handle_choice_3(self):
         """
         Handle the choice to add a new player.
         """
-        print()
-        print("Informations du joueur: (Echap ou entrée vide pour annuler)")
-        last_name = input("Entrez le nom de famille du joueur: ")
+        self.menu_view.print_message("")
+        self.menu_view.print_message("Informations du joueur: (Echap ou entrée vide pour annuler)")
+        last_name = self.menu_view.prompt("Entrez le nom de famille du joueur: ")
         if len(last_name) == 0:
             return
-        first_name = input("Entrez le prénom du joueur: ")
+        first_name = self.menu_view.prompt("Entrez le prénom du joueur: ")
         if len(first_name) == 0:
             return
-        birth_date = input("Date de naissance du joueur (YYYY-MM-DD): ")
+        birth_date = self.menu_view.prompt("Date de naissance du joueur (YYYY-MM-DD): ")
         if len(birth_date) == 0:
             return
-        national_id = input("Entrez l'identifiant national du joueur: ")
+        national_id = self.menu_view.prompt("Entrez l'identifiant national du joueur: ")
         if len(national_id) == 0:
             return
         self.add_player(last_name, first_name, birth_date, national_id)
@@ -473,8 +680,8 @@ class Controller:
             current_tournament: The current tournament object.
         """
         if current_tournament is None:
-            print("Tournoi non sélectionné")
-            input()
+            self.menu_view.print_message("Tournoi non sélectionné")
+            self.menu_view.pause()
         else:
             tournament_index = self.tournaments_data.index(current_tournament)
             self.add_tour(tournament_index)
@@ -486,8 +693,8 @@ class Controller:
             current_tournament: The current tournament object.
         """
         if current_tournament is None:
-            print("Tournoi non sélectionné")
-            input()
+            self.menu_view.print_message("Tournoi non sélectionné")
+            self.menu_view.pause()
         else:
             tournament_index = self.tournaments_data.index(current_tournament)
             self.run_tournament(tournament_index, self.menu_view.display_winner)
@@ -499,18 +706,21 @@ class Controller:
             current_tournament: The current tournament object.
         """
         if current_tournament is None:
-            print("Tournoi non sélectionné")
-            input()
+            self.menu_view.print_message("Tournoi non sélectionné")
+            self.menu_view.pause()
         else:
             while True:
-                print("\nRapports disponibles:")
-                print("1. Liste de tous les joueurs par ordre alphabétique")
-                print("2. Liste de tous les tournois")
-                print("3. Nom et dates du tournoi ouvert")
-                print("4. Liste des joueurs du tournoi par ordre alphabétique")
-                print("5. Liste de tous les tours du tournoi et de tous les matchs du tour")
-                print("6. Retour au menu principal")
-                choice = input("Choisissez une option: ")
+                self.menu_view.print_message("\nRapports disponibles:")
+                self.menu_view.print_message("1. Liste de tous les joueurs par ordre alphabétique")
+                self.menu_view.print_message("2. Liste de tous les tournois")
+                self.menu_view.print_message("3. Nom et dates du tournoi ouvert")
+                self.menu_view.print_message("4. Liste des joueurs du tournoi par ordre alphabétique")
+                self.menu_view.print_message("5. Liste de tous les tours du tournoi et de tous les matchs du tour")
+                self.menu_view.print_message("6. Classement du tournoi avec départages")
+                self.menu_view.print_message("7. Historique des parties d'un joueur (tournois terminés)")
+                self.menu_view.print_message("8. Liste de tous les joueurs par points")
+                self.menu_view.print_message("9. Retour au menu principal")
+                choice = self.menu_view.prompt("Choisissez une option: ")
 
                 if choice == '1':
                     self.report_all_players()
@@ -523,23 +733,36 @@ class Controller:
                 elif choice == '5':
                     self.report_tournament_rounds_and_matches(current_tournament)
                 elif choice == '6':
+                    self.report_tournament_standings(current_tournament)
+                elif choice == '7':
+                    self.report_player_games(self.menu_view.prompt("Numéro d'identification national du joueur: "))
+                elif choice == '8':
+                    self.report_all_players("points")
+                elif choice == '9':
                     break
                 else:
-                    print("Option invalide, veuillez réessayer.")
+                    self.menu_view.print_message("Option invalide, veuillez réessayer.")
 
     def handle_choice_7(self):
         """
         Handle the choice to quit the application.
+        The storage is closed, which waits for the pending writes of the background writer.
         Returns:
             False to indicate the application should quit.
         """
-        print("Au revoir!")
+        self.close()
+        self.menu_view.print_message("Au revoir!")
+        self.menu_view.flush()
         return False
 
+    def close(self):
+        """Close the storage, which writes the pending changes and waits for the background writer."""
+        self.storage.close()
+
     def handle_choice_0(self):
         """
         Handle the choice to add a new tournament.
         """
-        print()
-        name = input("Entrez le nom du tournoi: ")
+        self.menu_view.print_message("")
+        name = self.menu_view.prompt("Entrez le nom du tournoi: ")
         self.add_tournament(name)
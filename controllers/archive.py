@@ -0,0 +1,280 @@
+import json
+import mmap
+import os
+import sys
+from array import array
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional: scans then go through memoryviews in plain Python
+    np = None
+
+from models.match_table import NO_PLAYER
+from controllers.write_behind import atomic_write
+
+ARCHIVE_VERSION = 2
+
+# The column files of the archive, with their array type codes. Each game is stored twice,
+# once from each player's point of view; a bye has no opponent (NO_OPPONENT).
+ARCHIVE_COLUMNS = (
+    ("player", "i"),
+    ("opponent", "i"),
+    ("score", "f"),
+    ("round", "H"),
+    ("tournament", "i"),
+)
+
+NO_OPPONENT = -1
+
+# Number of rows buffered in memory before they are appended to the column files.
+FLUSH_ROWS = 100_000
+
+
+def build_archive(tournaments, stamp=None, directory="archive"):
+    """
+    Freeze the completed tournaments of the storage into the column files of a match archive.
+    The tournaments are read one at a time (see Storage.iter_tournaments) and their games appended
+    to the columns by batches, read from the columns of their MatchTable, so memory stays bounded
+    whatever the size of the archive. A tournament is complete when all its planned rounds were played.
+
+    Args:
+        tournaments (Iterable[Tournament]): Every tournament of the storage, in order, e.g. from
+            Storage.iter_tournaments(). Their positions are the tournament indices of the archive.
+        stamp (list): The Storage.stamp() of the storage, recorded to tell when the archive is out of date.
+        directory (str): Directory of the archive, created if needed.
+
+    Returns:
+        MatchArchive: The archive, opened.
+    """
+    os.makedirs(directory, exist_ok=True)
+    players, player_ids, frozen = [], {}, []
+    columns = {name: array(typecode) for name, typecode in ARCHIVE_COLUMNS}
+    files = {name: open(os.path.join(directory, name + ".bin.tmp"), "wb") for name, _ in ARCHIVE_COLUMNS}
+    rows = 0
+
+    def player_index(player):
+        index = player_ids.get(player.national_id)
+        if index is None:
+            index = player_ids[player.national_id] = len(players)
+            players.append(player.national_id)
+        return index
+
+    try:
+        for position, tournament in enumerate(tournaments):
+            if not tournament.rounds or len(tournament.rounds) < int(tournament.number_of_rounds):
+                continue
+            frozen.append([position, tournament.name, tournament.location, tournament.start_date.isoformat(),
+                           tournament.end_date.isoformat()])
+            for round_number, round in enumerate(tournament.rounds, 1):
+                table = round.matches
+                # Only the players of the round: table.players may be a list shared by every round
+                # (e.g. the whole registry for tournaments of a binary snapshot)
+                used = set(table.player1)
+                used.update(table.player2)
+                used.discard(NO_PLAYER)
+                indices = {i: player_index(table.players[i]) for i in sorted(used)}
+                for player1, score1, player2, score2 in zip(table.player1, table.score1, table.player2, table.score2):
+                    if player1 == NO_PLAYER:
+                        continue
+                    first = indices[player1]
+                    second = NO_OPPONENT if player2 == NO_PLAYER else indices[player2]
+                    _append_row(columns, first, second, score1, round_number, position)
+                    if player2 != NO_PLAYER:
+                        _append_row(columns, second, first, score2, round_number, position)
+            if len(columns["player"]) >= FLUSH_ROWS:
+                rows += _flush(columns, files)
+        rows += _flush(columns, files)
+    finally:
+        for file in files.values():
+            file.close()
+
+    # Without a manifest the archive cannot be opened, so a crash while the columns are replaced
+    # leaves no manifest whose rows do not match the columns: the archive is built again instead
+    manifest_path = os.path.join(directory, "manifest.json")
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    for name, _ in ARCHIVE_COLUMNS:
+        os.replace(os.path.join(directory, name + ".bin.tmp"), os.path.join(directory, name + ".bin"))
+    with atomic_write(manifest_path, encoding="utf-8") as file:
+        json.dump({
+            "version": ARCHIVE_VERSION,
+            "byteorder": sys.byteorder,
+            "rows": rows,
+            "source": stamp,
+            "players": players,
+            "tournaments": frozen
+        }, file, separators=(",", ":"))
+    return MatchArchive(directory)
+
+
+class MatchArchive:
+    """
+    A class to scan the games of the frozen tournaments without loading them.
+    Each column file is memory-mapped and exposed as a NumPy array (a memoryview without
+    NumPy) sharing the mapped pages, so a query reads the columns it needs in place.
+    Attributes:
+        players (List[str]): The national ID of each player index.
+        tournaments (List[list]): The [index, name, location, start_date, end_date] of each frozen tournament,
+            the index being its position in the tournaments list of the storage.
+        rows (int): The number of rows (two per game, one per bye).
+    Methods:
+        column(name): Returns a column of the archive.
+        games_of(national_id): Returns the games of a player.
+        score_distribution(year): Returns the number of results of each score.
+        is_stale(stamp): Tells whether the storage changed since the archive was built.
+        close(): Unmaps the column files.
+    """
+
+    def __init__(self, directory="archive"):
+        """
+        Open an archive built by build_archive().
+
+        Raises:
+            FileNotFoundError: If the archive does not exist.
+            ValueError: If the archive was written by another version or on a machine of another byte order.
+        """
+        self.directory = directory
+        with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as file:
+            manifest = json.load(file)
+        if manifest["version"] != ARCHIVE_VERSION or manifest["byteorder"] != sys.byteorder:
+            raise ValueError(f"Unsupported match archive in {directory}")
+        self.manifest = manifest
+        self.players = manifest["players"]
+        self.tournaments = manifest["tournaments"]
+        self.rows = manifest["rows"]
+        self._player_ids = {national_id: index for index, national_id in enumerate(self.players)}
+        self._maps = []
+        self._columns = {}
+        for name, typecode in ARCHIVE_COLUMNS:
+            self._columns[name] = self._map(os.path.join(directory, name + ".bin"), typecode)
+
+    def _map(self, path, typecode):
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:  # An empty file cannot be mapped
+                buffer = b""
+            else:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._maps.append(buffer)
+        if np is not None:
+            return np.frombuffer(buffer, dtype=np.dtype(typecode))
+        return memoryview(buffer).cast("B").cast(typecode)
+
+    def column(self, name):
+        """
+        Returns a column of the archive, without copying it.
+
+        Args:
+            name (str): One of player, opponent, score, round or tournament.
+
+        Returns:
+            ndarray or memoryview: The column.
+        """
+        return self._columns[name]
+
+    def games_of(self, national_id):
+        """
+        Returns the games of a player, in archive order.
+
+        Args:
+            national_id (str): The national ID of the player.
+
+        Returns:
+            list: (tournament index, round number, opponent national ID or None for a bye, score) tuples.
+        """
+        index = self._player_ids.get(national_id)
+        if index is None:
+            return []
+        player = self._columns["player"]
+        if np is not None:
+            rows = np.flatnonzero(player == index).tolist()
+        else:
+            rows = [row for row, value in enumerate(player) if value == index]
+        opponent, score = self._columns["opponent"], self._columns["score"]
+        round, tournament = self._columns["round"], self._columns["tournament"]
+        return [
+            (int(tournament[row]), int(round[row]),
+             None if opponent[row] == NO_OPPONENT else self.players[opponent[row]], float(score[row]))
+            for row in rows
+        ]
+
+    def score_distribution(self, year=None):
+        """
+        Returns the number of results of each score, e.g. {1.0: 120, 0.5: 30, 0.0: 120}.
+
+        Args:
+            year (int): Only count the tournaments starting that year; every tournament if None.
+
+        Returns:
+            dict: The number of rows of each score.
+        """
+        tournaments = [
+            index for index, _, _, start_date, _ in self.tournaments
+            if year is None or date.fromisoformat(start_date).year == year
+        ]
+        score = self._columns["score"]
+        if np is not None:
+            if year is not None:
+                score = score[np.isin(self._columns["tournament"], tournaments)]
+            values, counts = np.unique(score, return_counts=True)
+            return {float(value): int(count) for value, count in zip(values, counts)}
+        selected = set(tournaments)
+        distribution = {}
+        for value, tournament in zip(score, self._columns["tournament"]):
+            if year is None or tournament in selected:
+                distribution[value] = distribution.get(value, 0) + 1
+        return distribution
+
+    def is_stale(self, stamp):
+        """
+        Tells whether the storage changed since the archive was built.
+
+        Args:
+            stamp (list): The current Storage.stamp() of the storage; None if the storage cannot tell.
+        """
+        return stamp is None or self.manifest["source"] != stamp
+
+    def close(self):
+        """Unmaps the column files. Mappings still referenced by a column obtained from column() stay open."""
+        self._columns = {}
+        for buffer in self._maps:
+            try:
+                buffer.close()
+            except BufferError:
+                pass
+        self._maps = []
+
+    def __repr__(self):
+        """Returns a string representation of the archive with its number of games and tournaments."""
+        return f"MatchArchive ({self.rows} rows, {len(self.tournaments)} tournaments)"
+
+
+def _append_row(columns, player, opponent, score, round_number, tournament):
+    columns["player"].append(player)
+    columns["opponent"].append(opponent)
+    columns["score"].append(score)
+    columns["round"].append(round_number)
+    columns["tournament"].append(tournament)
+
+
+def _flush(columns, files):
+    """Append the buffered rows to the column files and empty the buffers. Returns the number of rows."""
+    rows = len(columns["player"])
+    for name, column in columns.items():
+        column.tofile(files[name])
+        del column[:]
+    return rows
+
+
+if __name__ == "__main__":
+    from controllers.storage import JsonStorage
+    from tournoi import open_storage
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else "archive"
+    storage = open_storage() or JsonStorage()
+    storage.load()
+    try:
+        archive = build_archive(storage.iter_tournaments(), storage.stamp(), directory)
+    finally:
+        storage.close()
+    print(f"{archive.rows} résultats de {len(archive.tournaments)} tournois archivés dans {directory}")
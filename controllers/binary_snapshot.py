@@ -0,0 +1,309 @@
+import math
+import os
+import struct
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+from models.player import Player
+from models.tournament import Tournament
+from models.round import Round
+from models.match_table import MatchTable, NO_PLAYER
+from controllers.lazy_tournaments import TournamentHeader
+
+SNAPSHOT_MAGIC = b"TRNB"
+SNAPSHOT_VERSION = 1
+
+# Magic, version, byte order, then the (size, mtime_ns) of the players and tournaments JSON files.
+_HEADER = struct.Struct("<4sHc1xqqqq")
+_COLUMN = struct.Struct("<cQ")
+
+# Stored in the datetime columns for a round that is not finished.
+_NO_DATETIME = -1
+_MICROSECOND = timedelta(microseconds=1)
+
+# The columns of the snapshot, in file order, with their array type codes.
+# Strings are indices in the string table; dates are ordinals; datetimes are microseconds since datetime.min;
+# *_start columns hold, for each record, the position of its first child row (plus a final end position).
+_COLUMNS = (
+    ("string_lengths", "I"),
+    ("player_last_name", "I"), ("player_first_name", "I"), ("player_national_id", "I"),
+    ("player_birth_date", "i"), ("player_total_points", "d"), ("player_tournament_points", "d"),
+    ("player_rating", "d"), ("player_rating_deviation", "d"),
+    ("tournament_name", "I"), ("tournament_location", "I"), ("tournament_description", "I"),
+    ("tournament_start_date", "i"), ("tournament_end_date", "i"), ("tournament_number_of_rounds", "i"),
+    ("tournament_roster_start", "I"), ("tournament_round_start", "I"),
+    ("tournament_json_offset", "q"), ("tournament_json_length", "q"),
+    ("roster_player", "i"), ("roster_points", "d"),
+    ("round_name", "I"), ("round_start_datetime", "q"), ("round_end_datetime", "q"), ("round_match_start", "I"),
+    ("match_player1", "i"), ("match_score1", "f"), ("match_player2", "i"), ("match_score2", "f"),
+)
+
+
+def file_stamp(path):
+    """Return the (size, mtime_ns) of a file, or (-1, -1) if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return -1, -1
+    return stat.st_size, stat.st_mtime_ns
+
+
+class BinarySnapshot:
+    """
+    A class to read a binary snapshot of the players and tournaments.
+    The snapshot is a struct header followed by typed columns (see _COLUMNS) read with
+    array.frombytes, and a UTF-8 string table decoded in one call. Players are rebuilt with a
+    single constructor call each; tournaments are rebuilt on demand, and the matches of a round
+    are slices of the match columns given to a MatchTable, without any per-match Python work.
+    Attributes:
+        players (List[Player]): The players of the snapshot, in order.
+        columns (dict): The columns of the snapshot, by name.
+    Methods:
+        read(path, stamps): Reads a snapshot if it matches the given JSON file stamps.
+        headers(): Returns the TournamentHeader of each tournament.
+        tournament(index): Rebuilds a tournament.
+    """
+
+    def __init__(self, columns, strings):
+        self.columns = columns
+        self.strings = strings
+        c = columns
+        # Column by column, with map() over C-level callables rather than a Python loop per player
+        self.players = Player.from_columns(len(c["player_national_id"]), {
+            "last_name": [strings[i] for i in c["player_last_name"]],
+            "first_name": [strings[i] for i in c["player_first_name"]],
+            "birth_date": map(date.fromordinal, c["player_birth_date"]),
+            "national_id": [strings[i] for i in c["player_national_id"]],
+            "total_points": _numbers(c["player_total_points"]),
+            "tournament_points": _numbers(c["player_tournament_points"]),
+            "rating": c["player_rating"],
+            "rating_deviation": [None if math.isnan(deviation) else deviation
+                                 for deviation in c["player_rating_deviation"]],
+        })
+        # The matches tables of the rounds share this list; it is not the registry's list
+        self._match_players = list(self.players)
+
+    @classmethod
+    def read(cls, path, stamps):
+        """
+        Reads a snapshot.
+
+        Args:
+            path (str): Path of the snapshot file.
+            stamps (tuple): The file_stamp() of the players and tournaments JSON files the
+                snapshot must have been written from.
+
+        Returns:
+            BinarySnapshot: The snapshot, or None if it is missing, invalid or out of date.
+        """
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+        if len(data) < _HEADER.size:
+            return None
+        magic, version, byteorder, *stored_stamps = _HEADER.unpack_from(data)
+        if (magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION
+                or tuple(stored_stamps) != tuple(stamps[0]) + tuple(stamps[1])):
+            return None
+        swap = byteorder.decode() != sys.byteorder[0]
+        view = memoryview(data)
+        position = _HEADER.size
+        columns = {}
+        try:
+            for name, typecode in _COLUMNS:
+                stored_typecode, count = _COLUMN.unpack_from(data, position)
+                position += _COLUMN.size
+                column = array(typecode)
+                if stored_typecode.decode() != typecode:
+                    return None
+                end = position + count * column.itemsize
+                column.frombytes(view[position:end])
+                if swap:
+                    column.byteswap()
+                columns[name] = column
+                position = end
+            text = bytes(view[position:]).decode("utf-8")
+        except (struct.error, ValueError):
+            return None
+        bounds = list(accumulate(columns["string_lengths"], initial=0))
+        strings = list(map(text.__getitem__, map(slice, bounds, bounds[1:])))
+        return cls(columns, strings)
+
+    def headers(self):
+        """Returns the TournamentHeader of each tournament, with the byte range of its JSON record."""
+        c, strings = self.columns, self.strings
+        round_start = c["tournament_round_start"]
+        return [
+            TournamentHeader(strings[name], strings[location], date.fromordinal(start_date),
+                             date.fromordinal(end_date), number_of_rounds, round_start[i + 1] - round_start[i],
+                             offset, length)
+            for i, (name, location, start_date, end_date, number_of_rounds, offset, length) in enumerate(zip(
+                c["tournament_name"], c["tournament_location"], c["tournament_start_date"],
+                c["tournament_end_date"], c["tournament_number_of_rounds"], c["tournament_json_offset"],
+                c["tournament_json_length"]))
+        ]
+
+    def __len__(self):
+        return len(self.columns["tournament_name"])
+
+    def tournament(self, index):
+        """
+        Rebuilds a tournament from the columns.
+
+        Args:
+            index (int): The index of the tournament.
+
+        Returns:
+            Tournament: The tournament, referencing the snapshot's Player objects.
+        """
+        c, strings = self.columns, self.strings
+        tournament = Tournament(
+            strings[c["tournament_name"][index]], strings[c["tournament_location"][index]],
+            date.fromordinal(c["tournament_start_date"][index]), date.fromordinal(c["tournament_end_date"][index]),
+            c["tournament_number_of_rounds"][index], strings[c["tournament_description"][index]]
+        )
+        first, last = c["tournament_roster_start"][index], c["tournament_roster_start"][index + 1]
+        tournament.players = [self.players[i] for i in c["roster_player"][first:last]]
+        tournament.player_points = {
+            self.players[i].national_id: _number(points)
+            for i, points in zip(c["roster_player"][first:last], c["roster_points"][first:last])
+        }
+        rounds = []
+        for r in range(c["tournament_round_start"][index], c["tournament_round_start"][index + 1]):
+            round = Round(strings[c["round_name"][r]])
+            round.start_datetime = _to_datetime(c["round_start_datetime"][r])
+            round.end_datetime = _to_datetime(c["round_end_datetime"][r])
+            first, last = c["round_match_start"][r], c["round_match_start"][r + 1]
+            table = MatchTable()
+            table.players = self._match_players
+            table.player1, table.score1 = c["match_player1"][first:last], c["match_score1"][first:last]
+            table.player2, table.score2 = c["match_player2"][first:last], c["match_score2"][first:last]
+            round.matches = table
+            rounds.append(round)
+        tournament.rounds = rounds
+        return tournament
+
+    def __repr__(self):
+        """Returns a string representation of the snapshot with its number of players and tournaments."""
+        return f"BinarySnapshot ({len(self.players)} players, {len(self)} tournaments)"
+
+
+def write_snapshot(path, players, tournaments, headers, stamps):
+    """
+    Write a binary snapshot of the players and tournaments (see BinarySnapshot).
+    The file is written to a temporary file then renamed, so a reader never sees a partial snapshot.
+
+    Args:
+        path (str): Path of the snapshot file.
+        players (list): The Player objects; every player referenced by a tournament must be included.
+        tournaments (iterable): The Tournament objects, in order.
+        headers (list): The TournamentHeader of each tournament, holding the byte range of its JSON record.
+        stamps (tuple): The file_stamp() of the players and tournaments JSON files.
+    """
+    columns = {name: array(typecode) for name, typecode in _COLUMNS}
+    strings = {}
+
+    def string(value):
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    positions = {}
+    for player in players:
+        positions[id(player)] = len(positions)
+        columns["player_last_name"].append(string(player.last_name))
+        columns["player_first_name"].append(string(player.first_name))
+        columns["player_national_id"].append(string(player.national_id))
+        columns["player_birth_date"].append(player.birth_date.toordinal())
+        columns["player_total_points"].append(player.total_points)
+        columns["player_tournament_points"].append(player.tournament_points)
+        columns["player_rating"].append(player.rating)
+        columns["player_rating_deviation"].append(
+            math.nan if player.rating_deviation is None else player.rating_deviation
+        )
+
+    # Positions of the players of the MatchTable players lists shared by many rounds (e.g. those of
+    # a snapshot), computed once per list; lists kept alive so that their id is not reused
+    shared_remaps = {}
+    columns["tournament_roster_start"].append(0)
+    columns["tournament_round_start"].append(0)
+    columns["round_match_start"].append(0)
+    for tournament, header in zip(tournaments, headers):
+        columns["tournament_name"].append(string(tournament.name))
+        columns["tournament_location"].append(string(tournament.location))
+        columns["tournament_description"].append(string(tournament.description))
+        columns["tournament_start_date"].append(tournament.start_date.toordinal())
+        columns["tournament_end_date"].append(tournament.end_date.toordinal())
+        columns["tournament_number_of_rounds"].append(int(tournament.number_of_rounds))
+        columns["tournament_json_offset"].append(header.offset if header.offset is not None else -1)
+        columns["tournament_json_length"].append(header.length if header.length is not None else -1)
+        for player in tournament.players:
+            columns["roster_player"].append(positions[id(player)])
+            columns["roster_points"].append(tournament.player_points.get(player.national_id, 0))
+        for round in tournament.rounds:
+            columns["round_name"].append(string(round.name))
+            columns["round_start_datetime"].append(_from_datetime(round.start_datetime))
+            columns["round_end_datetime"].append(_from_datetime(round.end_datetime))
+            table = round.matches
+            if len(table.players) > 2 * len(table):
+                players_list, remap = shared_remaps.get(id(table.players), (None, None))
+                if players_list is not table.players or len(remap) != len(table.players):
+                    remap = [positions[id(player)] for player in table.players]
+                    shared_remaps[id(table.players)] = (table.players, remap)
+            else:
+                remap = [positions[id(player)] for player in table.players]
+            columns["match_player1"].extend(NO_PLAYER if i == NO_PLAYER else remap[i] for i in table.player1)
+            columns["match_player2"].extend(NO_PLAYER if i == NO_PLAYER else remap[i] for i in table.player2)
+            columns["match_score1"].extend(table.score1)
+            columns["match_score2"].extend(table.score2)
+            columns["round_match_start"].append(len(columns["match_player1"]))
+        columns["tournament_roster_start"].append(len(columns["roster_player"]))
+        columns["tournament_round_start"].append(len(columns["round_name"]))
+
+    columns["string_lengths"].extend(len(value) for value in strings)
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as file:
+        file.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, sys.byteorder[0].encode(), *stamps[0], *stamps[1]))
+        for name, typecode in _COLUMNS:
+            file.write(_COLUMN.pack(typecode.encode(), len(columns[name])))
+            columns[name].tofile(file)
+        file.write("".join(strings).encode("utf-8"))
+    os.replace(temp_path, path)
+
+
+def _number(value):
+    """Return a stored point count as an int when it is a whole number, as it was entered."""
+    return int(value) if value.is_integer() else value
+
+
+def _numbers(column):
+    """Return a column of point counts, whole numbers as ints (see _number)."""
+    values = column.tolist()
+    if all(map(float.is_integer, values)):
+        return list(map(int, values))
+    return list(map(_number, values))
+
+
+def _from_datetime(value):
+    return _NO_DATETIME if value is None else (value - datetime.min) // _MICROSECOND
+
+
+def _to_datetime(value):
+    return None if value == _NO_DATETIME else datetime.min + value * _MICROSECOND
+
+
+if __name__ == "__main__":
+    from controllers.storage import JsonStorage
+
+    storage = JsonStorage()
+    players, tournaments = storage.load()
+    try:
+        storage.save_snapshot()
+    finally:
+        storage.close()
+    print(f"{len(players)} joueurs et {len(tournaments)} tournois écrits dans {storage.snapshot_path}")
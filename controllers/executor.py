@@ -0,0 +1,146 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional: only the simulation batches need it
+    np = None
+
+from models.player_registry import PlayerRegistry
+from controllers.matchmaking import Matchmaking
+from controllers.simulation import simulate_tournament
+from controllers.storage import encode_tournament, decode_tournament
+
+
+class _SilentView:
+    """Stand-in for the MenuView in worker processes, where nothing is displayed."""
+
+    def print_message(self, message):
+        pass
+
+
+def pack_tournament(tournament):
+    """
+    Serialize the state needed to play a tournament in another process: the normalized
+    tournament record (see encode_tournament) and the records of the players of its roster.
+
+    Args:
+        tournament (Tournament): The tournament to play.
+
+    Returns:
+        tuple: The tournament record and the list of player records.
+    """
+    players = dict.fromkeys(tournament.players)
+    return encode_tournament(tournament), [player.to_dict() for player in players]
+
+
+def play_packed_tournament(packed, seed=None):
+    """
+    Play a serialized tournament with a private registry, as done in a worker process.
+
+    Args:
+        packed (tuple): The state returned by pack_tournament.
+        seed (int): Seed of the random results, for reproducible runs.
+
+    Returns:
+        tuple: The normalized record of the played tournament and the new [rating, deviation] of its players.
+    """
+    data, player_records = packed
+    random.seed(seed)  # Workers forked from the same process would otherwise share their random state
+    registry = PlayerRegistry()
+    for record in player_records:
+        registry.intern(record)
+    tournament = decode_tournament(data, registry)
+    Matchmaking(_SilentView()).run_tournament(tournament)
+    tournament.sync_player_points()
+    ratings = {player.national_id: [player.rating, player.rating_deviation] for player in registry}
+    return encode_tournament(tournament), ratings
+
+
+def run_tournaments(tournaments, registry, max_workers=None, seed=None):
+    """
+    Play independent tournaments in parallel worker processes.
+    Each tournament is sent as a compact record holding only its roster, played by a worker,
+    and decoded back with the given registry so its matches reference the canonical players.
+    The points won and the rating changes are then applied to the players, as a run in the
+    UI process would do.
+
+    Args:
+        tournaments (list): The Tournament objects to play, with their rounds cleared.
+        registry (PlayerRegistry): The registry of the canonical players.
+        max_workers (int): The number of worker processes; the number of CPUs if None.
+            With a single worker, the tournaments are played in the current process.
+        seed (int): Seed of the random results, for reproducible runs.
+
+    Returns:
+        list: The played Tournament objects, in the same order.
+    """
+    packed = [pack_tournament(tournament) for tournament in tournaments]
+    seeds = _task_seeds(seed, len(packed))
+    workers = min(max_workers or os.cpu_count() or 1, len(packed))
+    if workers <= 1:
+        records = list(map(play_packed_tournament, packed, seeds))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            records = list(executor.map(play_packed_tournament, packed, seeds))
+
+    played = []
+    for (_, player_records), (record, ratings) in zip(packed, records):
+        tournament = decode_tournament(record, registry)
+        for player in tournament.players:
+            points = tournament.player_points.get(player.national_id, 0)
+            player.tournament_points = points
+            player.total_points += points
+        for previous in player_records:  # Rating changes add up when a player is in several tournaments
+            player = registry.get(previous["national_id"])
+            rating, deviation = ratings[previous["national_id"]]
+            player.rating += rating - previous["rating"]
+            player.rating_deviation = deviation
+        played.append(tournament)
+    return played
+
+
+def simulate_parallel(ratings, number_of_rounds, simulations=10000, draw_rate=0.1, seed=None, max_workers=None):
+    """
+    Split a Monte Carlo simulation (see simulation.simulate_tournament) into one chunk per
+    worker process and merge the outcome counts. Each chunk gets an independent random stream
+    spawned from the seed, so results are reproducible for a given seed and number of workers.
+
+    Args:
+        ratings (sequence): The rating of each player.
+        number_of_rounds (int): The number of rounds of each tournament.
+        simulations (int): The total number of tournaments to simulate.
+        draw_rate (float): The probability of a draw between two equal players.
+        seed (int): Seed of the random generator.
+        max_workers (int): The number of worker processes; the number of CPUs if None.
+
+    Returns:
+        SimulationResult: The merged outcome counts.
+
+    Raises:
+        RuntimeError: If numpy is not installed.
+    """
+    if np is None:
+        raise RuntimeError("Le simulateur nécessite numpy (pip install numpy)")
+    workers = max(1, min(max_workers or os.cpu_count() or 1, simulations))
+    sizes = [simulations // workers + (1 if i < simulations % workers else 0) for i in range(workers)]
+    streams = np.random.SeedSequence(seed).spawn(workers)
+    ratings = [float(rating) for rating in ratings]
+    if workers == 1:
+        return simulate_tournament(ratings, number_of_rounds, sizes[0], draw_rate, streams[0])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(simulate_tournament, ratings, number_of_rounds, size, draw_rate, stream)
+            for size, stream in zip(sizes, streams)
+        ]
+        return reduce(lambda a, b: a.merge(b), (future.result() for future in futures))
+
+
+def _task_seeds(seed, count):
+    """Return one seed per task, derived from seed, or None (fresh entropy) for each task."""
+    if seed is None:
+        return [None] * count
+    generator = random.Random(seed)
+    return [generator.getrandbits(64) for _ in range(count)]
@@ -0,0 +1,77 @@
+import json
+import os
+
+
+class Journal:
+    """
+    Append-only log of the mutations applied on top of the JSON snapshot files.
+    Each line of the journal file is one JSON record with an "op" key and its payload, and a "seq"
+    key numbering the records in the order they were written. Numbers keep increasing when the
+    journal is emptied, so a snapshot can tell which records it already holds.
+    Attributes:
+        size (int): The number of records in the journal file.
+        last_seq (int): The number of the last record written.
+    Methods:
+        __init__(path): Initialize the journal on the given file path.
+        append(op, payload): Append one mutation record to the journal file.
+        extend(records): Append several mutation records with a single write.
+        replay(): Yield the records of the journal, oldest first.
+        clear(): Empty the journal once its records are folded into a snapshot.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.size = 0
+        self.last_seq = 0
+        for record in self.replay():
+            self.size += 1
+            self.last_seq = max(self.last_seq, record.get("seq", 0))
+
+    def append(self, op, payload):
+        """
+        Append one mutation record to the journal file.
+        Args:
+            op (str): The name of the mutation (e.g. "add_player").
+            payload (dict): The data needed to replay the mutation.
+        """
+        self.extend([dict(payload, op=op)])
+
+    def extend(self, records):
+        """
+        Append several mutation records to the journal file with a single write, numbering them.
+        Args:
+            records (list): The records, each a dict with an "op" key and its payload.
+        """
+        lines = "".join(
+            json.dumps(dict(record, seq=seq), separators=(",", ":")) + "\n"
+            for seq, record in enumerate(records, self.last_seq + 1)
+        )
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(lines)
+        self.size += len(records)
+        self.last_seq += len(records)
+
+    def replay(self):
+        """
+        Yield the records of the journal, oldest first.
+        A truncated last line (interrupted write) is ignored.
+        Yields:
+            dict: A mutation record.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                for line in file:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        return
+        except FileNotFoundError:
+            return
+
+    def clear(self):
+        """Empty the journal once its records are folded into a snapshot. Record numbers keep increasing."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.size = 0
@@ -0,0 +1,121 @@
+import json
+
+# Size of the chunks read from the file by the streaming parser.
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_array_items(path, key, chunk_size=CHUNK_SIZE):
+    """
+    Yield the items of a top-level JSON array one at a time, without loading the whole document.
+    The file is read by chunks and each item is decoded with json.JSONDecoder.raw_decode
+    as soon as it is complete, so memory stays bounded by the size of the largest item.
+
+    Args:
+        path (str): Path of the JSON file, e.g. data_tournaments.json.
+        key (str): The key of the top-level array, e.g. "tournaments_data", or None if the
+            document itself is the array.
+        chunk_size (int): Number of characters read at a time.
+
+    Yields:
+        The decoded items of the array.
+
+    Raises:
+        ValueError: If the document is not an object holding the array under the given key.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r") as file:
+        reader = _Reader(file, chunk_size)
+        if key is None:
+            if reader.next_char() != "[":
+                raise ValueError(f"{path} is not a JSON array")
+            yield from _iter_items(reader, decoder, path, "array")
+            return
+        if reader.next_char() != "{":
+            raise ValueError(f"{path} is not a JSON object")
+        while True:
+            char = reader.next_char()
+            if char == "}" or char is None:
+                return
+            if char == ",":
+                continue
+            reader.position -= 1
+            name = reader.decode(decoder)
+            if reader.next_char() != ":":
+                raise ValueError(f"Invalid JSON object in {path}")
+            if name != key:
+                reader.decode(decoder)
+                continue
+            if reader.next_char() != "[":
+                raise ValueError(f"{key} is not an array in {path}")
+            yield from _iter_items(reader, decoder, path, key)
+            return
+
+
+def _iter_items(reader, decoder, path, name):
+    """Yield the items of the array whose opening bracket was just read."""
+    while True:
+        char = reader.next_char()
+        if char == "]":
+            return
+        if char is None:
+            raise ValueError(f"Unterminated array {name} in {path}")
+        if char == ",":
+            continue
+        reader.position -= 1
+        yield reader.decode(decoder)
+
+
+class _Reader:
+    """Buffer over a text file that decodes JSON values as they become complete."""
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self):
+        """
+        Read one more chunk, dropping the part of the buffer already consumed.
+        The read size grows with the pending data so that a large item is not re-parsed too often.
+        """
+        chunk = self.file.read(max(self.chunk_size, len(self.buffer) - self.position))
+        if not chunk:
+            self.eof = True
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+
+    def next_char(self):
+        """Return the next non-whitespace character, or None at the end of the file."""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                char = self.buffer[self.position]
+                self.position += 1
+                return char
+            if self.eof:
+                return None
+            self.fill()
+
+    def decode(self, decoder):
+        """Decode the JSON value starting at the next non-whitespace character, reading more chunks if needed."""
+        if self.next_char() is not None:  # raw_decode does not skip the whitespace before a value
+            self.position -= 1
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+            # A number can be cut by the end of the buffer: make sure it is followed by something
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.position = end
+            return value
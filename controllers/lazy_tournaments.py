@@ -0,0 +1,194 @@
+import weakref
+from collections import OrderedDict
+
+from models.sorted_index import SortedIndex
+
+# Number of unmodified tournaments kept in memory once opened.
+TOURNAMENT_CACHE_SIZE = 32
+
+
+class TournamentHeader:
+    """
+    A class to represent the lightweight description of a stored tournament.
+    Attributes:
+        name (str): The name of the tournament.
+        location (str): The location where the tournament is held.
+        start_date (date): The start date of the tournament.
+        end_date (date): The end date of the tournament.
+        number_of_rounds (int): The planned number of rounds.
+        rounds_count (int): The number of rounds already stored.
+        offset (int or None): Byte offset of the tournament record in its file, if any.
+        length (int or None): Byte length of the tournament record in its file, if any.
+    """
+
+    def __init__(self, name, location, start_date, end_date, number_of_rounds, rounds_count,
+                 offset=None, length=None):
+        self.name = name
+        self.location = location
+        self.start_date = start_date
+        self.end_date = end_date
+        self.number_of_rounds = number_of_rounds
+        self.rounds_count = rounds_count
+        self.offset = offset
+        self.length = length
+
+    @classmethod
+    def from_tournament(cls, tournament, offset=None, length=None):
+        """Builds the header of a loaded Tournament object."""
+        return cls(tournament.name, tournament.location, tournament.start_date, tournament.end_date,
+                   tournament.number_of_rounds, len(tournament.rounds), offset, length)
+
+    def __repr__(self):
+        """Returns a string representation of the header with the tournament name and dates."""
+        return f"TournamentHeader {self.name} ({self.start_date} - {self.end_date})"
+
+
+class LazyTournamentList:
+    """
+    A list-like collection of tournaments that only materializes a tournament when it is accessed.
+    Headers are kept for every tournament. Opened tournaments are kept in an LRU cache, and
+    stay the same object as long as something references them. Modified tournaments are pinned
+    in memory until the storage has written them.
+    Methods:
+        __init__(headers, loader, cache_size): Initialize the collection from the stored headers.
+        from_tournaments(tournaments): Builds a collection from tournaments already in memory.
+        header(index): Returns the up-to-date header of a tournament without loading it.
+        loaded(index): Returns a tournament if it is in memory, without loading it.
+        pin(index): Keeps a tournament in memory until it is unpinned.
+        unpin_all(): Releases the pinned tournaments once they have been saved.
+        pins(): Returns the pin counters of the pinned tournaments.
+        unpin(pins): Releases the tournaments that were not pinned again since pins() was called.
+        sorted_by_date(): Returns the tournament indices sorted by start date.
+    """
+
+    def __init__(self, headers, loader, cache_size=TOURNAMENT_CACHE_SIZE):
+        self.headers = list(headers)
+        self.loader = loader
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._live = weakref.WeakValueDictionary()
+        self._pinned = {}
+        self._pin_counts = {}  # Incremented by each pin, so a save only releases what it wrote
+        self._sorted_by_date = None
+
+    @classmethod
+    def from_tournaments(cls, tournaments, cache_size=TOURNAMENT_CACHE_SIZE):
+        """
+        Builds a collection from tournaments already in memory. They are all pinned.
+        Args:
+            tournaments (list): A list of Tournament objects.
+        Returns:
+            LazyTournamentList: The collection.
+        """
+        collection = cls([], None, cache_size)
+        for tournament in tournaments:
+            collection.append(tournament)
+        return collection
+
+    def header(self, index):
+        """Returns the up-to-date header of a tournament without loading it."""
+        tournament = self.loaded(index)
+        if tournament is not None:
+            stored = self.headers[index]
+            return TournamentHeader.from_tournament(tournament, stored.offset, stored.length)
+        return self.headers[index]
+
+    def loaded(self, index):
+        """Returns the tournament at the given index if it is in memory, or None."""
+        tournament = self._pinned.get(index)
+        if tournament is None:
+            tournament = self._live.get(index)
+        return tournament
+
+    def pin(self, index):
+        """Keeps the tournament at the given index in memory until unpin_all() or unpin() releases it."""
+        self._pinned[index] = self[index]
+        self._pin_counts[index] = self._pin_counts.get(index, 0) + 1
+
+    def unpin_all(self):
+        """Releases the pinned tournaments, which can be reloaded from the storage."""
+        self._pinned.clear()
+        self._pin_counts.clear()
+
+    def pins(self):
+        """Returns the pin counter of each pinned tournament, to be given to unpin() once they are saved."""
+        return dict(self._pin_counts)
+
+    def unpin(self, pins):
+        """
+        Releases the tournaments pinned when pins() was called, unless they were pinned again since,
+        i.e. modified after the state being saved was captured.
+        Args:
+            pins (dict): The pin counters returned by pins().
+        """
+        for index, count in pins.items():
+            if self._pin_counts.get(index) == count:
+                del self._pin_counts[index]
+                self._pinned.pop(index, None)
+
+    def sorted_by_date(self):
+        """
+        Returns the indices of the tournaments sorted by start date, read from the headers.
+        The index is built on first use, then kept up to date by append() and item assignment.
+        """
+        if self._sorted_by_date is None:
+            self._sorted_by_date = SortedIndex(lambda index: self.header(index).start_date, range(len(self.headers)))
+        return self._sorted_by_date
+
+    def index(self, tournament):
+        """Returns the index of a tournament object in the collection."""
+        for index in list(self._pinned) + list(self._live.keys()):
+            if self.loaded(index) is tournament:
+                return index
+        raise ValueError(f"{tournament!r} is not in the list")
+
+    def append(self, tournament):
+        """Adds a new tournament at the end of the collection. It stays pinned until saved."""
+        self.headers.append(TournamentHeader.from_tournament(tournament))
+        index = len(self.headers) - 1
+        self._pinned[index] = tournament
+        self._pin_counts[index] = self._pin_counts.get(index, 0) + 1
+        self._live[index] = tournament
+        if self._sorted_by_date is not None:
+            self._sorted_by_date.add(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self.headers)
+        if not 0 <= index < len(self.headers):
+            raise IndexError("tournament index out of range")
+        tournament = self.loaded(index)
+        if tournament is None:
+            tournament = self.loader(index, self.headers[index])
+            self._live[index] = tournament
+        self._cache[index] = tournament
+        self._cache.move_to_end(index)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return tournament
+
+    def __setitem__(self, index, tournament):
+        stored = self.headers[index]
+        self.headers[index] = TournamentHeader.from_tournament(tournament, stored.offset, stored.length)
+        self._pinned[index] = tournament
+        self._pin_counts[index] = self._pin_counts.get(index, 0) + 1
+        self._live[index] = tournament
+        self._cache.pop(index, None)
+        if self._sorted_by_date is not None:
+            self._sorted_by_date.update(index)
+
+    def __iter__(self):
+        for index in range(len(self.headers)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self.headers)
+
+    def __bool__(self):
+        return bool(self.headers)
+
+    def __repr__(self):
+        """Returns a string representation with the number of tournaments and how many are in memory."""
+        return f"LazyTournamentList ({len(self.headers)} tournaments, {len(self._live)} loaded)"
@@ -1,54 +1,71 @@
 from models.round import Round
 import random
 from models.match import Match
+from models.standings import Standings
+from controllers.pairing import SwissPairing
+from controllers.rating import expected_score, update_round_ratings
+from controllers.reports import format_score
 
 
 class Matchmaking:
     """
     A class to handle matchmaking logic for tournaments.
+    The pairing of each round is delegated to a strategy object (SwissPairing by default,
+    or RandomPairing) exposing a pair(players, tournament, standings) method.
     Methods:
-        __init__(menu_view): Initialize the matchmaking with a MenuView instance.
-        create_matches(players): Create matches for a given list of players.
+        __init__(menu_view, pairing): Initialize the matchmaking with a MenuView instance and a pairing strategy.
+        create_matches(players, tournament, standings): Create matches for a given list of players.
+        create_pairings(players, tournament): Create the matches of a round whose results are not known yet.
         run_tournament(tournament): Run the tournament round by round.
     """
 
-    def __init__(self, menu_view):
+    def __init__(self, menu_view, pairing=None):
         self.menu_view = menu_view
+        self.pairing = pairing if pairing is not None else SwissPairing()
 
-    def create_matches(self, players):
+    def create_matches(self, players, tournament=None, standings=None):
         """
         Create matches for a given list of players.
         Args:
             players (list): A list of Player objects.
+            tournament (Tournament): The tournament being played, used by the pairing strategy.
+            standings (Standings): The players ranked for the pairing (see SwissPairing.standings()), or None.
         Returns:
             list: A list of Match objects.
         """
         matches = []
-        random.shuffle(players)  # Shuffle players for the first round
-        for i in range(0, len(players) - 1, 2):
-            player1 = players[i]
-            player2 = players[i + 1]
-            score1, score2 = self.assign_scores(player1, player2)
-            matches.append(Match(player1, score1, player2, score2))
-
-        # Handle odd player count by pairing the last player with a "bye" (free win)
-        if len(players) % 2 == 1:
-            last_player = players[-1]
-            matches.append(Match(last_player, 1, None, 0))  # Last player gets a free win
-
+        for player1, player2 in self.pairing.pair(players, tournament, standings):
+            if player2 is None:
+                matches.append(Match(player1, 1, None, 0))  # Bye: a free win
+            else:
+                score1, score2 = self.assign_scores(player1, player2)
+                matches.append(Match(player1, score1, player2, score2))
         return matches
 
+    def create_pairings(self, players, tournament=None):
+        """
+        Create the matches of a round whose results will be entered later.
+        Games start at 0-0; a bye is a free win, as in create_matches().
+        Args:
+            players (list): A list of Player objects.
+            tournament (Tournament): The tournament being played, used by the pairing strategy.
+        Returns:
+            list: A list of Match objects.
+        """
+        return [Match(player1, 1, None, 0) if player2 is None else Match(player1, 0, player2, 0)
+                for player1, player2 in self.pairing.pair(list(players), tournament)]
+
     def assign_scores(self, player1, player2):
         """
         Assign scores to players for a match.
+        The winner is drawn at random, with the Elo expected score of player1 as its chance to win.
         Args:
             player1 (Player): The first player.
             player2 (Player): The second player.
         Returns:
             tuple: A tuple containing the scores of player1 and player2.
         """
-        winner = random.choice([player1, player2])  # Randomly choose a winner for demonstration
-        if winner == player1:
+        if random.random() < expected_score(player1.rating, player2.rating):
             return 1, 0  # Player 1 wins
         else:
             return 0, 1  # Player 2 wins
@@ -62,20 +79,28 @@ class Matchmaking:
             list: A list of winners for each round.
         """
         all_round_winners = []
+        standings = Standings(tournament.players, tiebreaks=tournament.tiebreaks.key)
+        seeding = SwissPairing.standings(tournament.players)  # Ranked by points then rating, for the pairing
         for round_number in range(tournament.number_of_rounds):
             self.menu_view.print_message(f"Début du tour {round_number + 1}")
 
             # Create matches for this round
-            matches = self.create_matches(tournament.players)
+            matches = self.create_matches(tournament.players, tournament, seeding)
             new_round = Round(name=f"Tour {round_number + 1}")
             new_round.matches = matches
+            new_round.end_round()
             tournament.add_round(new_round)
 
-            # Update player scores based on match results
+            # Update player scores and ratings based on match results
             self.update_player_scores(matches)
+            update_round_ratings(new_round)
 
-            # Sort players by points for the next round
-            tournament.players.sort(key=lambda p: p.tournament_points, reverse=True)
+            # Move the players whose score, rating or tiebreaks changed (those of the round and their
+            # past opponents) to their new place
+            changed = [(player, player.tournament_points)
+                       for player in map(standings.player, tournament.tiebreaks.changed) if player is not None]
+            standings.set_scores(changed)
+            seeding.set_scores(changed)
 
             # Determine the winners of this round
             round_winners = self.determine_round_winners(matches)
@@ -86,8 +111,10 @@ class Matchmaking:
             # Display the winners of this round
             self.display_round_winners(round_number, round_winners)
 
-        # Display the final scores of the tournament
-        self.display_final_scores(tournament)
+        # Rank the roster by points then every tiebreak, progressive score included, with one sort
+        standings = Standings(standings.players(), tiebreaks=tournament.tiebreaks.ranking_key)
+        tournament.players = list(standings)
+        self.display_final_scores(tournament, standings)
 
         return all_round_winners
 
@@ -135,15 +162,23 @@ class Matchmaking:
         winner_names = ", ".join(f"{winner.first_name} {winner.last_name}" for winner in round_winners)
         self.menu_view.print_message(f"Gagnant(s) du tour {round_number + 1}: {winner_names}")
 
-    def display_final_scores(self, tournament):
+    def display_final_scores(self, tournament, standings=None):
         """
         Display the final scores of the tournament.
         Args:
             tournament (Tournament): The tournament object.
+            standings (Standings): The standings of the tournament, built from its points and tiebreaks if None.
         """
+        if standings is None:
+            standings = Standings.from_tournament(tournament, tournament.tiebreaks.ranking_key)
         self.menu_view.print_message("Tournoi terminé. Scores finaux :")
-        for player in tournament.players:
-            self.menu_view.print_message(f"{player.first_name} {player.last_name} : {player.tournament_points} points")
+        for rank, player in enumerate(standings, 1):
+            tiebreaks = tournament.tiebreaks.values(player.national_id)
+            buchholz, sonneborn_berger, progressive = map(format_score, tiebreaks)
+            self.menu_view.print_message(
+                f"{rank}. {player.first_name} {player.last_name} : {format_score(standings.score_of(player))} points "
+                f"(Buchholz {buchholz}, Sonneborn-Berger {sonneborn_berger}, progressif {progressive})"
+            )
 
     def update_player_scores(self, matches):
         """
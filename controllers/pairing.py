@@ -0,0 +1,269 @@
+import itertools
+import random
+
+from models.history import PairingHistory
+from models.standings import Standings
+
+# Number of candidates examined to find an opponent with a compatible colour preference.
+COLOUR_WINDOW = 8
+
+# Largest difference between a player's whites and blacks. Like three games in a row with the
+# same colour, going beyond it is forbidden rather than merely avoided.
+MAX_COLOUR_DIFFERENCE = 2
+
+
+class RandomPairing:
+    """
+    Pairing strategy that shuffles the players and pairs neighbours.
+    The last player gets a bye when the number of players is odd.
+    Methods:
+        pair(players, tournament, standings): Returns the (white, black) pairs of the next round.
+    """
+
+    def pair(self, players, tournament=None, standings=None):
+        """
+        Pair the players at random.
+        Args:
+            players (list): A list of Player objects. The list is shuffled in place.
+            tournament (Tournament): The tournament being played (unused).
+            standings (Standings): The standings of the players (unused).
+        Returns:
+            list: (white, black) tuples of Player objects; black is None for a bye.
+        """
+        random.shuffle(players)  # Shuffle players for the first round
+        pairs = [(players[i], players[i + 1]) for i in range(0, len(players) - 1, 2)]
+        if len(players) % 2 == 1:
+            pairs.append((players[-1], None))
+        return pairs
+
+
+class SwissPairing:
+    """
+    Swiss-system pairing strategy.
+    Players are ranked by points (then by rating) and paired inside score groups: the top half of a group
+    meets the bottom half, rematches are avoided by trying the next opponents of the half
+    (then by floating the player down to the next group), colours are given to balance each
+    player's whites and blacks, and the bye goes to the lowest ranked player who has not had one.
+    The colour rules are constraints, like rematches: no player gets the same colour three times
+    in a row or more than MAX_COLOUR_DIFFERENCE more whites than blacks (or blacks than whites).
+    Opponents who cannot be given colours within the rules are skipped like rematches, and the
+    pairs left in breach of them are repaired by exchanging opponents with the nearest pairs.
+    Each score group is paired in a single pass over its players, so a round of several
+    thousand players is paired in a fraction of a second.
+    The score groups are read from a Standings ranked by points then rating (see standings()):
+    a caller pairing several rounds keeps one up to date with the players whose results changed,
+    instead of a full sort of the roster every round.
+    The played pairs, colours and byes come from the tournament's PairingHistory.
+    Methods:
+        standings(players): Returns the standings the players are paired from.
+        pair(players, tournament, standings): Returns the (white, black) pairs of the next round.
+    """
+
+    @staticmethod
+    def standings(players):
+        """
+        Rank players for the pairing: by tournament points, then by rating, then in seeding order.
+        Keep it up to date with Standings.set_score() when their points or ratings change.
+        Args:
+            players (list): A list of Player objects, in seeding order.
+        Returns:
+            Standings: The ranked players.
+        """
+        return Standings(players, tiebreaks=lambda player: (player.rating,))
+
+    def pair(self, players, tournament=None, standings=None):
+        """
+        Pair the players for the next round.
+        Args:
+            players (list): A list of Player objects, in seeding order (used between equal ratings).
+            tournament (Tournament): The tournament being played, used for the pairing history.
+            standings (Standings): The players ranked for the pairing (see standings()), up to date
+                with their points and ratings; built from players if None.
+        Returns:
+            list: (white, black) tuples of Player objects; black is None for a bye.
+        """
+        history = tournament.history if tournament is not None else PairingHistory()
+        seeds = {id(player): rank for rank, player in enumerate(players)}
+        if standings is None:
+            standings = self.standings(players)
+        groups = [group for _, group in standings.score_groups()]
+        colours = {player.national_id: self._colour_state(history.colour_sequence(player.national_id))
+                   for group in groups for player in group}
+
+        pairs = []
+        if len(standings) % 2 == 1:
+            bye = self._bye(groups, history)
+            pairs.append((bye, None))
+            groups = [group for group in groups if group]
+
+        floaters = []
+        for position, group in enumerate(groups):
+            last = position == len(groups) - 1
+            bracket_pairs, floaters = self._pair_bracket(floaters + group, history, colours, allow_rematch=last)
+            pairs.extend(bracket_pairs)
+        self._repair_rematches(pairs, history)
+        self._repair_colours(pairs, history, colours)
+
+        games = [self._allocate_colours(a, b, history, seeds, colours) for a, b in pairs if b is not None]
+        return games + [pair for pair in pairs if pair[1] is None]
+
+    def _bye(self, groups, history):
+        """Remove from its score group and return the lowest ranked player who has not had a bye (else the last)."""
+        for group in reversed(groups):
+            for position in range(len(group) - 1, -1, -1):
+                if not history.had_bye(group[position].national_id):
+                    return group.pop(position)
+        return groups[-1].pop()
+
+    def _pair_bracket(self, bracket, history, colours, allow_rematch):
+        """
+        Pair a score group (with the players floated down from the group above).
+        The top half is paired against the bottom half; the players left without an opponent
+        are paired together in rank order, and those who have met all of them (or cannot be
+        given colours with them) float down to the next group. In the last group, rematches and
+        colour conflicts are allowed rather than leaving players out.
+        Returns:
+            tuple: The list of pairs and the list of players floated down.
+        """
+        half = len(bracket) // 2
+        top, bottom = bracket[:half], bracket[half:]
+        used = [False] * len(bottom)
+        pairs, leftovers = [], []
+        for i, player in enumerate(top):
+            j = self._find_opponent(player, bottom, used, i, history, colours)
+            if j is None:
+                leftovers.append(player)
+            else:
+                used[j] = True
+                pairs.append((player, bottom[j]))
+        leftovers.extend(player for j, player in enumerate(bottom) if not used[j])
+
+        rank = {id(player): position for position, player in enumerate(bracket)}
+        leftovers.sort(key=lambda p: rank[id(p)])
+        used = [False] * len(leftovers)
+        floaters = []
+        for i, player in enumerate(leftovers):
+            if used[i]:
+                continue
+            used[i] = True
+            j = self._find_opponent(player, leftovers, used, i + 1, history, colours)
+            if j is None and allow_rematch:
+                j = next((k for k in range(i + 1, len(leftovers)) if not used[k]), None)
+            if j is None:
+                floaters.append(player)
+            else:
+                used[j] = True
+                pairs.append((player, leftovers[j]))
+        return pairs, floaters
+
+    def _find_opponent(self, player, candidates, used, start, history, colours):
+        """
+        Return the index of the first unused candidate, from start and wrapping around, not met before
+        and with whom colours can be given within the colour rules.
+        Among the next COLOUR_WINDOW candidates, one whose colour preference is compatible is preferred.
+        """
+        need, forbidden = colours[player.national_id]
+        fallback = None
+        for checked, j in enumerate(itertools.chain(range(start, len(candidates)), range(0, start))):
+            if used[j] or history.has_played(player.national_id, candidates[j].national_id):
+                continue
+            candidate_need, candidate_forbidden = colours[candidates[j].national_id]
+            if forbidden is not None and forbidden == candidate_forbidden:
+                continue  # Both must get the same colour
+            if need * candidate_need <= 0:
+                return j
+            if fallback is None:
+                fallback = j
+            if checked >= COLOUR_WINDOW:
+                break
+        return fallback
+
+    @staticmethod
+    def _colour_state(sequence):
+        """
+        Return the colour need and the forbidden colour of a player from the colours played, e.g. "WBW".
+        The need is 1 if the player should get white, -1 if black, 0 without preference. The forbidden
+        colour ("W" or "B", None if both are allowed) is the one that would break the colour rules.
+        """
+        balance = sequence.count("W") - sequence.count("B")
+        if balance:
+            need = -1 if balance > 0 else 1
+        elif sequence:
+            need = -1 if sequence[-1] == "W" else 1
+        else:
+            need = 0
+        forbidden = None
+        if balance >= MAX_COLOUR_DIFFERENCE or sequence[-2:] == "WW":
+            forbidden = "W"
+        elif balance <= -MAX_COLOUR_DIFFERENCE or sequence[-2:] == "BB":
+            forbidden = "B"
+        return need, forbidden
+
+    def _repair_rematches(self, pairs, history):
+        """
+        Replace the rematches left by the last group by exchanging opponents with another pair,
+        starting from the lowest pairs.
+        """
+        for i, (a, b) in enumerate(pairs):
+            if b is None or not history.has_played(a.national_id, b.national_id):
+                continue
+            for k in range(len(pairs) - 1, -1, -1):
+                c, d = pairs[k]
+                if k == i or d is None:
+                    continue
+                if (not history.has_played(a.national_id, c.national_id)
+                        and not history.has_played(b.national_id, d.national_id)):
+                    pairs[i], pairs[k] = (a, c), (b, d)
+                    break
+                if (not history.has_played(a.national_id, d.national_id)
+                        and not history.has_played(b.national_id, c.national_id)):
+                    pairs[i], pairs[k] = (a, d), (c, b)
+                    break
+
+    def _repair_colours(self, pairs, history, colours):
+        """
+        Replace the pairs whose players must both get the same colour by exchanging opponents with
+        another pair, trying the nearest pairs first so that players stay in their score group.
+        An exchange is only made when it creates no rematch and no other colour conflict.
+        """
+        def conflict(a, b):
+            forbidden = colours[a.national_id][1]
+            return forbidden is not None and forbidden == colours[b.national_id][1]
+
+        def allowed(a, b):
+            return not conflict(a, b) and not history.has_played(a.national_id, b.national_id)
+
+        for i, (a, b) in enumerate(pairs):
+            if b is None or not conflict(a, b):
+                continue
+            nearest = (k for distance in range(1, len(pairs)) for k in (i + distance, i - distance)
+                       if 0 <= k < len(pairs) and pairs[k][1] is not None)
+            for k in nearest:
+                c, d = pairs[k]
+                if allowed(a, c) and allowed(b, d):
+                    pairs[i], pairs[k] = (a, c), (b, d)
+                    break
+                if allowed(a, d) and allowed(b, c):
+                    pairs[i], pairs[k] = (a, d), (c, b)
+                    break
+
+    def _allocate_colours(self, a, b, history, seeds, colours):
+        """
+        Give each player a colour allowed by the colour rules, then give white to the player who
+        needs it most: the one with fewer whites than blacks, then the one who had black last,
+        then the higher seed.
+        Returns:
+            tuple: The (white, black) pair.
+        """
+        forbidden_a, forbidden_b = colours[a.national_id][1], colours[b.national_id][1]
+        if forbidden_a != forbidden_b:
+            if forbidden_a == "W" or forbidden_b == "B":
+                return b, a
+            return a, b
+
+        def preference(player):
+            sequence = history.colour_sequence(player.national_id)
+            balance = sequence.count("W") - sequence.count("B")
+            last = sequence[-1:] == "W"
+            return (balance, last, seeds[id(player)])
+        return (a, b) if preference(a) <= preference(b) else (b, a)
@@ -0,0 +1,177 @@
+import csv
+from datetime import date, datetime
+from itertools import islice
+
+from models.player import DEFAULT_RATING, Player
+from controllers.json_stream import iter_array_items
+from controllers.write_behind import atomic_write
+
+# Number of rows validated together: their dates are parsed once per distinct value.
+IMPORT_BATCH_SIZE = 5000
+
+# Columns (CSV) or keys (JSON) every imported player must have.
+REQUIRED_FIELDS = ("last_name", "first_name", "birth_date", "national_id")
+
+# Accepted birth date formats, besides ISO (YYYY-MM-DD).
+DATE_FORMATS = ("%d/%m/%Y",)
+
+
+class ImportResult:
+    """
+    A class to describe the outcome of a bulk player import.
+    Attributes:
+        added (List[Player]): The registered players, in file order.
+        rejects (List[tuple]): (record number, national ID, reason) of each rejected row, numbered from 1.
+    Methods:
+        write_rejects(path): Writes the rejected rows to a CSV file.
+    """
+
+    def __init__(self):
+        self.added = []
+        self.rejects = []
+
+    def write_rejects(self, path):
+        """
+        Writes the rejected rows to a CSV file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        with atomic_write(path, newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(("enregistrement", "identifiant", "motif"))
+            writer.writerows(self.rejects)
+
+    def __repr__(self):
+        """Returns a string representation with the number of added and rejected players."""
+        return f"ImportResult ({len(self.added)} added, {len(self.rejects)} rejected)"
+
+
+def iter_player_rows(path):
+    """
+    Yield the players of a file as dictionaries, one at a time.
+    CSV files need a header line naming the columns (comma, semicolon or tab separated); JSON files
+    hold either an array of players or an object with a players_data array, as players_placeholder.json.
+    JSON files are read with the streaming parser, so the whole file is never in memory.
+
+    Args:
+        path (str): The path of the file.
+
+    Yields:
+        dict: The fields of a player.
+
+    Raises:
+        ValueError: If the file is not a CSV file with a header or a JSON array of players.
+    """
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            sample = file.read(4096)
+            file.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+            except csv.Error:
+                dialect = csv.excel
+            yield from csv.DictReader(file, dialect=dialect)
+        return
+    with open(path, encoding="utf-8") as file:
+        first = file.read(4096).lstrip()[:1]
+    yield from iter_array_items(path, None if first == "[" else "players_data")
+
+
+def parse_dates(values):
+    """
+    Parse the distinct birth dates of a batch of rows.
+
+    Args:
+        values (Iterable[str]): The dates, as YYYY-MM-DD or DD/MM/YYYY.
+
+    Returns:
+        dict: The date of each valid value; invalid values are missing.
+    """
+    dates = {}
+    for value in set(value for value in values if isinstance(value, (str, date))):
+        if isinstance(value, date):
+            dates[value] = value
+            continue
+        text = str(value).strip()
+        try:
+            dates[value] = date.fromisoformat(text)
+            continue
+        except ValueError:
+            pass
+        for date_format in DATE_FORMATS:
+            try:
+                dates[value] = datetime.strptime(text, date_format).date()
+                break
+            except ValueError:
+                pass
+    return dates
+
+
+def register_players(rows, registry, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Validate rows of players by batches and register the valid ones.
+    Rows are rejected when a required field is missing or empty, the birth date is invalid or in
+    the future, the rating is not a number, or the national ID is already registered or repeated
+    in the file. The valid players are registered only once every row was read, so an error
+    raised partway through the rows (e.g. a malformed file) leaves the registry unchanged.
+    Nothing is persisted: the caller saves the added players once.
+
+    Args:
+        rows (Iterable[dict]): The players, e.g. from iter_player_rows().
+        registry (PlayerRegistry): The registry of the known players, updated with the new ones.
+        batch_size (int): The number of rows validated together.
+
+    Returns:
+        ImportResult: The added players and the rejected rows.
+    """
+    result = ImportResult()
+    imported = set()  # National IDs added by this import
+    today = date.today()
+    numbered = enumerate(rows, 1)
+    while True:
+        batch = list(islice(numbered, batch_size))
+        if not batch:
+            break
+        dates = parse_dates(row.get("birth_date") for _, row in batch if isinstance(row, dict))
+        for number, row in batch:
+            reason, player = _validate(row, dates, today, registry, imported)
+            if reason is None:
+                imported.add(player.national_id)
+                result.added.append(player)
+            else:
+                national_id = row.get("national_id") if isinstance(row, dict) else None
+                result.rejects.append((number, national_id or "", reason))
+    for player in result.added:
+        registry.add(player)
+    return result
+
+
+def _validate(row, dates, today, registry, imported):
+    """Returns (None, the new Player) for a valid row, or (the reason of the reject, None)."""
+    if not isinstance(row, dict):
+        return "ligne invalide", None
+    fields = {}
+    for name in REQUIRED_FIELDS:
+        value = row.get(name)
+        value = value.strip() if isinstance(value, str) else value
+        if value in (None, ""):
+            return f"champ {name} manquant", None
+        fields[name] = value
+    birth_date = dates.get(row["birth_date"]) if isinstance(row["birth_date"], (str, date)) else None
+    if birth_date is None:
+        return f"date de naissance invalide : {row['birth_date']}", None
+    if birth_date > today:
+        return f"date de naissance future : {row['birth_date']}", None
+    national_id = str(fields["national_id"])
+    if national_id in imported:
+        return "identifiant en double dans le fichier", None
+    if national_id in registry:
+        return "identifiant déjà enregistré", None
+    rating = row.get("rating")
+    try:
+        rating = float(rating) if rating not in (None, "") else DEFAULT_RATING
+    except (TypeError, ValueError):
+        return f"classement invalide : {rating}", None
+    player = Player(str(fields["last_name"]), str(fields["first_name"]), birth_date, national_id, rating=rating)
+    return None, player
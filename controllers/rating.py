@@ -0,0 +1,231 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional: ratings are then updated with plain Python loops
+    np = None
+
+from models.player import DEFAULT_RATING
+
+# Maximum Elo rating change of a single game.
+K_FACTOR = 20
+
+# Glicko rating deviation of a new player, and the lower bound it converges to.
+INITIAL_DEVIATION = 350
+MIN_DEVIATION = 30
+
+_Q = math.log(10) / 400
+
+
+def expected_score(rating, opponent_rating):
+    """
+    Elo expected score of a player against an opponent.
+    Works on numbers as well as on NumPy arrays of ratings.
+
+    Args:
+        rating (float or ndarray): Rating of the player.
+        opponent_rating (float or ndarray): Rating of the opponent.
+
+    Returns:
+        float or ndarray: The expected score, between 0 and 1.
+    """
+    return 1.0 / (1.0 + 10.0 ** ((opponent_rating - rating) / 400.0))
+
+
+def game_score(match):
+    """Return the share of the points won by the first player of a match (1, 0.5 or 0 for usual results)."""
+    total = match.score1 + match.score2
+    return match.score1 / total if total else 0.5
+
+
+def is_rated(match):
+    """Return whether a match is a rated game: byes and double forfeits (0-0) are not."""
+    return match.player1 is not None and match.player2 is not None and match.score1 + match.score2 > 0
+
+
+def update_round_ratings(round, k_factor=K_FACTOR, unrated=()):
+    """
+    Update the ratings of the players of a round after its results, in one pass over all its games.
+    Players with a rating deviation are rated with Glicko, the others with Elo. Byes and double
+    forfeits are not rated.
+
+    Args:
+        round (Round): The played round.
+        k_factor (float): The Elo K-factor.
+        unrated (Iterable[int]): Positions of other matches of the round not to rate, e.g. forfeits.
+    """
+    unrated = set(unrated)
+    games = [match for position, match in enumerate(round.matches) if is_rated(match) and position not in unrated]
+    if not games:
+        return
+    players = list(dict.fromkeys(player for match in games for player in (match.player1, match.player2)))
+    position = {id(player): i for i, player in enumerate(players)}
+    ratings, deviations = _rating_arrays(players)
+    ratings, deviations = rate_games(
+        ratings, deviations,
+        [position[id(match.player1)] for match in games],
+        [position[id(match.player2)] for match in games],
+        [game_score(match) for match in games],
+        k_factor
+    )
+    _store_ratings(players, ratings, deviations)
+
+
+def recompute_ratings(tournaments, players, k_factor=K_FACTOR):
+    """
+    Recompute the ratings of the players from scratch by replaying every game of the archive,
+    tournament by tournament in chronological order and round by round.
+    Each tournament is reduced to arrays of player indices and scores as it is read, so the
+    tournaments can be streamed (e.g. from Controller.iter_tournaments), and each round is
+    rated in a single vectorized pass.
+
+    Args:
+        tournaments (iterable): The Tournament objects of the archive.
+        players (list): The players to rate; their ratings are reset before the replay.
+        k_factor (float): The Elo K-factor.
+
+    Returns:
+        int: The number of games rated.
+    """
+    players = list(players)
+    position = {player.national_id: i for i, player in enumerate(players)}
+    for player in players:
+        player.rating = DEFAULT_RATING
+        if player.rating_deviation is not None:
+            player.rating_deviation = INITIAL_DEVIATION
+
+    schedule = []
+    for order, tournament in enumerate(tournaments):
+        rounds = []
+        for round in tournament.rounds:
+            white, black, scores = [], [], []
+            for match in round.matches:
+                if not is_rated(match):
+                    continue
+                for player in (match.player1, match.player2):
+                    if player.national_id not in position:  # Not registered: rated, but not stored
+                        position[player.national_id] = len(position)
+                white.append(position[match.player1.national_id])
+                black.append(position[match.player2.national_id])
+                scores.append(game_score(match))
+            if white:
+                rounds.append((white, black, scores))
+        schedule.append((tournament.start_date, order, rounds))
+    schedule.sort(key=lambda item: item[:2])
+
+    unregistered = len(position) - len(players)
+    ratings, deviations = _rating_arrays(players)
+    if np is None:
+        ratings, deviations = ratings + [DEFAULT_RATING] * unregistered, deviations + [None] * unregistered
+    else:
+        ratings = np.concatenate((ratings, np.full(unregistered, float(DEFAULT_RATING))))
+        deviations = np.concatenate((deviations, np.full(unregistered, np.nan)))
+    games = 0
+    for _, _, rounds in schedule:
+        for white, black, scores in rounds:
+            ratings, deviations = rate_games(ratings, deviations, white, black, scores, k_factor)
+            games += len(scores)
+    _store_ratings(players, ratings[:len(players)], deviations[:len(players)])
+    return games
+
+
+def rate_games(ratings, deviations, white, black, scores, k_factor=K_FACTOR):
+    """
+    Rate a set of simultaneous games, as one rating period: every game is rated from the ratings
+    before the set, then the rating changes of a player's games are added up, and so are the
+    precisions (1 / deviation²) they gain. A player playing several games of the set (e.g. listed
+    twice in a roster) gets the updates of all of them.
+
+    Args:
+        ratings (ndarray or list): The rating of every player.
+        deviations (ndarray or list): The Glicko deviation of every player, NaN (None without NumPy) for Elo.
+        white (list): Index of the first player of each game.
+        black (list): Index of the second player of each game.
+        scores (list): Score of the first player of each game, between 0 and 1.
+        k_factor (float): The Elo K-factor.
+
+    Returns:
+        tuple: The updated ratings and deviations.
+    """
+    if np is None:
+        rating_gains, precision_gains = {}, {}
+        for a, b, score in zip(white, black, scores):
+            for player, opponent, result in ((a, b, score), (b, a, 1 - score)):
+                rating, deviation = _rate_one(ratings[player], deviations[player], ratings[opponent],
+                                              deviations[opponent], result, k_factor)
+                rating_gains[player] = rating_gains.get(player, 0) + rating - ratings[player]
+                if deviation is not None:
+                    gain = 1 / deviation ** 2 - 1 / deviations[player] ** 2
+                    precision_gains[player] = precision_gains.get(player, 0) + gain
+        ratings, deviations = list(ratings), list(deviations)
+        for player, gain in rating_gains.items():
+            ratings[player] += gain
+        for player, gain in precision_gains.items():
+            deviations[player] = max(math.sqrt(1 / (1 / deviations[player] ** 2 + gain)), MIN_DEVIATION)
+        return ratings, deviations
+
+    white, black, scores = np.asarray(white), np.asarray(black), np.asarray(scores, dtype=float)
+    rating_a, deviation_a = _rate_many(ratings[white], deviations[white], ratings[black], deviations[black],
+                                       scores, k_factor)
+    rating_b, deviation_b = _rate_many(ratings[black], deviations[black], ratings[white], deviations[white],
+                                       1 - scores, k_factor)
+    players = np.concatenate((white, black))
+    new_ratings, new_deviations = np.concatenate((rating_a, rating_b)), np.concatenate((deviation_a, deviation_b))
+    counts = np.bincount(players, minlength=len(ratings))
+    if counts.max(initial=0) <= 1:  # Each player plays once: the updates are assigned as they are
+        ratings[players], deviations[players] = new_ratings, new_deviations
+        return ratings, deviations
+    # Fancy assignment would keep one update per player: the gains are added up with bincount (as np.add.at)
+    played = counts > 0
+    rating_gains = np.bincount(players, weights=new_ratings - ratings[players], minlength=len(ratings))
+    precision_gains = np.bincount(players, weights=1 / new_deviations ** 2 - 1 / deviations[players] ** 2,
+                                  minlength=len(ratings))
+    ratings[played] += rating_gains[played]
+    deviations[played] = np.maximum(np.sqrt(1 / (1 / deviations[played] ** 2 + precision_gains[played])),
+                                    MIN_DEVIATION)
+    return ratings, deviations
+
+
+def _rate_many(rating, deviation, opponent_rating, opponent_deviation, score, k_factor):
+    """Vectorized Elo or Glicko update (see _rate_one) of one side of a set of games."""
+    elo = rating + k_factor * (score - expected_score(rating, opponent_rating))
+    glicko = ~np.isnan(deviation)
+    if not glicko.any():
+        return elo, deviation
+    g = 1 / np.sqrt(1 + 3 * (_Q * np.nan_to_num(opponent_deviation)) ** 2 / math.pi ** 2)
+    expected = 1 / (1 + 10 ** (-g * (rating - opponent_rating) / 400))
+    precision = 1 / np.where(glicko, deviation, INITIAL_DEVIATION) ** 2 + _Q ** 2 * g ** 2 * expected * (1 - expected)
+    new_rating = rating + _Q / precision * g * (score - expected)
+    new_deviation = np.maximum(np.sqrt(1 / precision), MIN_DEVIATION)
+    return np.where(glicko, new_rating, elo), np.where(glicko, new_deviation, np.nan)
+
+
+def _rate_one(rating, deviation, opponent_rating, opponent_deviation, score, k_factor):
+    """
+    Rating update of one player after one game: Elo if the player has no deviation, otherwise
+    Glicko with the game as a rating period (an opponent without deviation counts as certain).
+    Returns:
+        tuple: The new rating and deviation.
+    """
+    if deviation is None:
+        return rating + k_factor * (score - expected_score(rating, opponent_rating)), None
+    g = 1 / math.sqrt(1 + 3 * (_Q * (opponent_deviation or 0)) ** 2 / math.pi ** 2)
+    expected = 1 / (1 + 10 ** (-g * (rating - opponent_rating) / 400))
+    precision = 1 / deviation ** 2 + _Q ** 2 * g ** 2 * expected * (1 - expected)
+    return rating + _Q / precision * g * (score - expected), max(math.sqrt(1 / precision), MIN_DEVIATION)
+
+
+def _rating_arrays(players):
+    """Return the ratings and deviations of the players, as NumPy arrays (NaN for no deviation) when available."""
+    ratings = [float(player.rating) for player in players]
+    deviations = [player.rating_deviation for player in players]
+    if np is None:
+        return ratings, deviations
+    return np.array(ratings), np.array([math.nan if d is None else d for d in deviations], dtype=float)
+
+
+def _store_ratings(players, ratings, deviations):
+    """Write the computed ratings and deviations back to the Player objects."""
+    for player, rating, deviation in zip(players, ratings, deviations):
+        player.rating = float(rating)
+        player.rating_deviation = None if deviation is None or math.isnan(deviation) else float(deviation)
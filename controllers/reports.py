@@ -0,0 +1,316 @@
+import csv
+import weakref
+from itertools import islice
+
+from models.sorted_index import SortedIndex
+from models.standings import Standings
+from models.tiebreaks import Tiebreaks
+from controllers.write_behind import atomic_write
+
+# Number of rows formatted and written at once when a report is exported.
+EXPORT_CHUNK_SIZE = 1000
+
+# Sorted rosters of the tournaments, kept up to date as players join (tournament -> SortedIndex).
+_rosters = weakref.WeakKeyDictionary()
+
+
+def format_score(value):
+    """
+    Format a score or a tiebreak value the same way in every report and export: whole values without
+    decimals whether they are stored as int or float (2 and 2.0 give "2"), others as 2.5.
+    """
+    return f"{value:.15g}"
+
+
+class Report:
+    """
+    A class to describe a report whose rows are produced lazily.
+    Rows come from a generator, so the pager only builds the rows of the pages it displays,
+    and an export writes the rows chunk by chunk instead of building the whole report in memory.
+    Attributes:
+        title (str): The title of the report.
+        columns (tuple): The column names, written as the header of a CSV export.
+        empty_message (str): Displayed instead of the report when it has no rows, or None.
+        group (Callable): Returns the heading line of the group of a row (e.g. its round), or None.
+            The heading is inserted in the text lines before the first row of each group.
+    Methods:
+        rows(): Returns a generator of the rows (tuples) of the report.
+        lines(): Returns a generator of the rows formatted as text lines.
+        write_csv(path, chunk_size): Writes the rows to a CSV file.
+        write_text(path, chunk_size): Writes the title and the lines to a text file.
+    """
+
+    def __init__(self, title, columns, rows, format_row, empty_message=None, group=None):
+        """
+        Args:
+            title (str): The title of the report.
+            columns (tuple): The column names.
+            rows (Callable): Returns an iterable of the rows, each a tuple of column values.
+            format_row (Callable): Returns the text line of a row.
+            empty_message (str): Displayed instead of the report when it has no rows.
+            group (Callable): Returns the heading line of the group of a row.
+        """
+        self.title = title
+        self.columns = columns
+        self._rows = rows
+        self._format_row = format_row
+        self.empty_message = empty_message
+        self.group = group
+
+    def rows(self):
+        """Returns a generator of the rows of the report, built as they are consumed."""
+        yield from self._rows()
+
+    def lines(self):
+        """Returns a generator of the rows formatted as text lines."""
+        format_row, group = self._format_row, self.group
+        heading = None
+        for row in self.rows():
+            if group is not None and group(row) != heading:
+                heading = group(row)
+                yield heading
+            yield format_row(row)
+
+    def write_csv(self, path, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Writes the rows to a CSV file, with the column names as the first line.
+
+        Args:
+            path (str): The path of the file.
+            chunk_size (int): The number of rows written at once.
+
+        Returns:
+            int: The number of rows written.
+        """
+        written = 0
+        with atomic_write(path, newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.columns)
+            for chunk in _chunks(self.rows(), chunk_size):
+                writer.writerows(chunk)
+                written += len(chunk)
+        return written
+
+    def write_text(self, path, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Writes the title and the text lines of the report to a file.
+
+        Args:
+            path (str): The path of the file.
+            chunk_size (int): The number of lines written at once.
+
+        Returns:
+            int: The number of lines written, title excluded.
+        """
+        written = 0
+        with atomic_write(path, encoding="utf-8") as file:
+            file.write(self.title + "\n")
+            for chunk in _chunks(self.lines(), chunk_size):
+                file.write("\n".join(chunk) + "\n")
+                written += len(chunk)
+        return written
+
+    def __repr__(self):
+        """Returns a string representation of the report with its title."""
+        return f"Report {self.title}"
+
+
+def _chunks(iterable, size):
+    """Yields lists of at most size items of an iterable."""
+    iterator = iter(iterable)
+    return iter(lambda: list(islice(iterator, size)), [])
+
+
+def _player_name(player):
+    return f"{player.first_name} {player.last_name}"
+
+
+def tournament_roster(tournament):
+    """
+    Returns the players of a tournament sorted by last name, then first name.
+    The sorted roster is built once per tournament, then players who joined since are inserted.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Returns:
+        SortedIndex: The sorted players.
+    """
+    players = tournament.players
+    entry = _rosters.get(tournament)
+    if entry is None or entry[0] is not players or len(players) < entry[1]:
+        roster = SortedIndex(lambda player: (player.last_name, player.first_name), players,
+                             version=lambda player: player.version)
+    else:
+        roster = entry[2]
+        for player in players[entry[1]:]:
+            roster.add(player)
+        roster.refresh()
+    _rosters[tournament] = (players, len(players), roster)
+    return roster
+
+
+def players_report(registry, order="name"):
+    """
+    Report of all the players, by name or by decreasing total points.
+
+    Args:
+        registry (PlayerRegistry): The registered players.
+        order (str): "name" or "points".
+
+    Returns:
+        Report: The report.
+    """
+    if order == "points":
+        title = "Liste de tous les joueurs par points:"
+    else:
+        title = "Liste de tous les joueurs par ordre alphabétique:"
+
+    def rows():
+        index = registry.sorted_by_points() if order == "points" else registry.sorted_by_name()
+        for player in index:
+            yield (player.last_name, player.first_name, player.national_id, format_score(player.total_points),
+                   round(player.rating))
+
+    return Report(
+        title, ("nom", "prénom", "identifiant", "points", "elo"), rows,
+        lambda row: f"{row[1]} {row[0]} ({row[2]}) - {row[3]} points - Elo {row[4]}"
+        if order == "points" else f"{row[1]} {row[0]} ({row[2]}) - Elo {row[4]}",
+        "Aucun joueur."
+    )
+
+
+def tournaments_report(tournaments):
+    """
+    Report of all the tournaments by start date, read from their headers without loading them.
+
+    Args:
+        tournaments (LazyTournamentList): The tournaments.
+
+    Returns:
+        Report: The report.
+    """
+    def rows():
+        for index in tournaments.sorted_by_date():
+            header = tournaments.header(index)
+            yield header.name, header.location, header.start_date, header.end_date, header.rounds_count
+
+    return Report(
+        "Liste de tous les tournois par date:", ("nom", "lieu", "début", "fin", "tours"), rows,
+        lambda row: f"{row[0]} ({row[2]} - {row[3]})", "Aucun tournoi."
+    )
+
+
+def tournament_players_report(tournament):
+    """
+    Report of the players of a tournament in alphabetical order.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Returns:
+        Report: The report.
+    """
+    def rows():
+        for player in tournament_roster(tournament):
+            yield player.last_name, player.first_name, player.national_id
+
+    return Report(
+        f"Liste alphabétique des joueurs du tournoi {tournament.name} :", ("nom", "prénom", "identifiant"), rows,
+        lambda row: f"{row[1]} {row[0]} ({row[2]})", "Aucun joueur dans le tournoi."
+    )
+
+
+def rounds_and_matches_report(tournament):
+    """
+    Report of the rounds of a tournament and of their matches, one row per match.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Returns:
+        Report: The report.
+    """
+    def rows():
+        for round in tournament.rounds:
+            for match in round.matches:
+                yield (round.name, _player_label(match.player1), format_score(match.score1),
+                       _player_label(match.player2), format_score(match.score2))
+
+    return Report(
+        f"Liste des tours du tournoi {tournament.name} et ses matchs:",
+        ("tour", "joueur 1", "score 1", "joueur 2", "score 2"), rows,
+        lambda row: f"  Match: {row[1]} ({row[2]}) vs {row[3]} ({row[4]})", "Aucun tour dans le tournoi.",
+        group=lambda row: f"Round: {row[0]}"
+    )
+
+
+def _player_label(player):
+    return f"{_player_name(player)} ({player.national_id})" if player is not None else "exempt"
+
+
+def standings_report(tournament):
+    """
+    Report of the players of a tournament ranked by points, then by tiebreaks.
+
+    Args:
+        tournament (Tournament): The tournament.
+
+    Returns:
+        Report: The report.
+    """
+    def rows():
+        tiebreaks = tournament.tiebreaks
+        standings = Standings.from_tournament(tournament, tiebreaks.ranking_key)
+        for rank, player in enumerate(standings, 1):
+            yield (rank, _player_name(player), player.national_id, format_score(standings.score_of(player)),
+                   *map(format_score, tiebreaks.values(player.national_id)))
+
+    return Report(
+        f"Classement du tournoi {tournament.name} :\nRang, joueur, points, " + ", ".join(Tiebreaks.NAMES),
+        ("rang", "joueur", "identifiant", "points") + Tiebreaks.NAMES, rows,
+        lambda row: f"{row[0]}. {row[1]} ({row[2]}) : {row[3]}, " + ", ".join(row[4:]),
+        "Aucun joueur dans le tournoi."
+    )
+
+
+def player_games_report(player, open_archive, tournaments, registry):
+    """
+    Report of the games of a player in every completed tournament, read from the match archive.
+    The archive is opened when the rows are first consumed, and closed once they are all consumed
+    or the consumer stops.
+
+    Args:
+        player (Player): The player.
+        open_archive (Callable): Returns the MatchArchive.
+        tournaments (LazyTournamentList): The tournaments, for their names.
+        registry (PlayerRegistry): The registered players, for the names of the opponents.
+
+    Returns:
+        Report: The report.
+    """
+    def rows():
+        archive = open_archive()
+        try:
+            for tournament_index, round_number, opponent, score in archive.games_of(player.national_id):
+                if tournament_index < len(tournaments):
+                    name = tournaments.header(tournament_index).name
+                else:
+                    name = f"Tournoi {tournament_index + 1}"
+                known = registry.get(opponent) if opponent else None
+                yield (name, round_number, opponent or "", _player_name(known) if known is not None else "",
+                       format_score(score))
+        finally:
+            archive.close()
+
+    def format_row(row):
+        if row[3]:
+            against = f"contre {row[3]}"
+        else:
+            against = f"contre {row[2]}" if row[2] else "exempt"
+        return f"  {row[0]}, tour {row[1]} : {row[4]} ({against})"
+
+    return Report(
+        f"Parties de {_player_name(player)} :", ("tournoi", "tour", "adversaire", "nom de l'adversaire", "score"),
+        rows, format_row, "Aucune partie archivée."
+    )
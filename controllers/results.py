@@ -0,0 +1,210 @@
+from typing import Dict, List, Optional, Tuple
+
+from models.match_table import NO_PLAYER
+
+# Result codes accepted for a game: (score of the first player, score of the second player, forfeit).
+RESULT_CODES = {
+    "1-0": (1, 0, False),
+    "0-1": (0, 1, False),
+    "1/2-1/2": (0.5, 0.5, False),
+    "½-½": (0.5, 0.5, False),
+    "0.5-0.5": (0.5, 0.5, False),
+    "=": (0.5, 0.5, False),
+    "+/-": (1, 0, True),   # Second player forfeited
+    "-/+": (0, 1, True),   # First player forfeited
+    "-/-": (0, 0, True),   # Both players forfeited
+    "+-": (1, 0, True),
+    "-+": (0, 1, True),
+    "--": (0, 0, True),
+}
+
+
+class ResultEntry:
+    """
+    A class to represent the result of one game, as read from a results file or list.
+    The game is identified by its board number, by the national IDs of its players, or by its
+    position in the results (board order, byes excluded) when neither is given.
+    Attributes:
+        score1 (float): The score of the first player (white).
+        score2 (float): The score of the second player (black).
+        forfeit (bool): Whether the game was not played; forfeits are not rated.
+        board (int): The board number, as displayed with the pairings (byes included), or None.
+        player_ids (tuple): The national IDs of the two players, or None.
+        line (int): The line of the entry in its file or list, for error messages.
+    """
+
+    __slots__ = ("score1", "score2", "forfeit", "board", "player_ids", "line")
+
+    def __init__(self, score1: float, score2: float, forfeit: bool = False, board: Optional[int] = None,
+                 player_ids: Optional[Tuple[str, str]] = None, line: int = 0):
+        self.score1 = score1
+        self.score2 = score2
+        self.forfeit = forfeit
+        self.board = board
+        self.player_ids = player_ids
+        self.line = line
+
+    @classmethod
+    def parse(cls, text: str, line: int = 0):
+        """
+        Parse a line of a results file. The result is the last field, preceded by nothing
+        (board order), a board number, or the national IDs of the two players:
+            1-0
+            12 1/2-1/2
+            FR12345 FR67890 -/+
+        Fields are separated by spaces, commas, semicolons or tabs.
+
+        Args:
+            text (str): The line.
+            line (int): The line number, for error messages.
+
+        Returns:
+            ResultEntry: The entry.
+
+        Raises:
+            ValueError: If the line cannot be parsed.
+        """
+        fields = text.replace(",", " ").replace(";", " ").split()
+        code = fields[-1] if fields else ""
+        if code not in RESULT_CODES:
+            raise ValueError(f"Ligne {line} : résultat invalide {text.strip()!r}")
+        score1, score2, forfeit = RESULT_CODES[code]
+        if len(fields) == 1:
+            return cls(score1, score2, forfeit, line=line)
+        if len(fields) == 2 and fields[0].isdigit():
+            return cls(score1, score2, forfeit, board=int(fields[0]), line=line)
+        if len(fields) == 3:
+            return cls(score1, score2, forfeit, player_ids=(fields[0], fields[1]), line=line)
+        raise ValueError(f"Ligne {line} : échiquier ou joueurs invalides {text.strip()!r}")
+
+    def __repr__(self):
+        """Returns a string representation of the entry with its game and scores."""
+        game = f"board {self.board}" if self.board else (" - ".join(self.player_ids) if self.player_ids else "next")
+        return f"ResultEntry {game}: {self.score1}-{self.score2}{' (forfeit)' if self.forfeit else ''}"
+
+
+def parse_results(lines) -> Tuple[List[ResultEntry], List[str]]:
+    """
+    Parse the lines of a results file, or a list of lines. Blank lines and lines starting with # are
+    ignored, and ResultEntry objects are kept as they are.
+
+    Args:
+        lines (Iterable): The lines (str) or entries (ResultEntry).
+
+    Returns:
+        tuple: The entries and the error messages of the lines that could not be parsed.
+    """
+    entries, errors = [], []
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, ResultEntry):
+            entries.append(line)
+            continue
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        try:
+            entries.append(ResultEntry.parse(line, number))
+        except ValueError as error:
+            errors.append(str(error))
+    return entries, errors
+
+
+def match_results(round, entries) -> Tuple[Dict[int, ResultEntry], List[str]]:
+    """
+    Validate results against the pairings of a round: every game of the round must get exactly one
+    result, and every result must belong to a game of the round. All the errors are collected so
+    they can be corrected at once.
+
+    Args:
+        round (Round): The round whose results are entered.
+        entries (List[ResultEntry]): The results.
+
+    Returns:
+        tuple: The entry of each match position, and the error messages (the results must not be
+            applied if there are any). The scores of an entry naming the players in the reverse
+            order of the pairing are swapped.
+    """
+    table = round.matches
+    positions, games, by_players = {}, [], {}
+    for position in range(len(table)):
+        player1, player2 = table.player(table.player1[position]), table.player(table.player2[position])
+        if player2 is not None:
+            games.append(position)
+            by_players[(player1.national_id, player2.national_id)] = (position, False)
+            by_players[(player2.national_id, player1.national_id)] = (position, True)
+
+    errors = []
+    next_game = 0
+    for entry in entries:
+        where = f"Ligne {entry.line}" if entry.line else "Résultat"
+        if entry.board is not None:
+            position = entry.board - 1
+            if not 0 <= position < len(table):
+                errors.append(f"{where} : l'échiquier {entry.board} n'existe pas.")
+                continue
+            if table.player2[position] == NO_PLAYER:
+                errors.append(f"{where} : l'échiquier {entry.board} est un exempt.")
+                continue
+        elif entry.player_ids is not None:
+            found = by_players.get(tuple(entry.player_ids))
+            if found is None:
+                errors.append(f"{where} : {entry.player_ids[0]} et {entry.player_ids[1]} ne jouent pas ensemble.")
+                continue
+            position, swapped = found
+            if swapped:
+                entry = ResultEntry(entry.score2, entry.score1, entry.forfeit, entry.board, entry.player_ids[::-1],
+                                    entry.line)
+        else:
+            if next_game >= len(games):
+                errors.append(f"{where} : plus de résultats que de parties.")
+                continue
+            position = games[next_game]
+            next_game += 1
+        if position in positions:
+            errors.append(f"{where} : l'échiquier {position + 1} a déjà un résultat.")
+            continue
+        positions[position] = entry
+
+    missing = [str(position + 1) for position in games if position not in positions]
+    if missing and not errors:
+        errors.append(f"Résultats manquants pour les échiquiers {', '.join(missing)}.")
+    return positions, errors
+
+
+def apply_results(tournament, round, results: Dict[int, ResultEntry]) -> List:
+    """
+    Record validated results in a round, and update the points of its players in one pass:
+    the points won are summed per player, then each player and the points of the tournament
+    are updated once. A bye gives 1 point. The ratings are not updated (see update_round_ratings).
+
+    Args:
+        tournament (Tournament): The tournament of the round.
+        round (Round): The round.
+        results (Dict[int, ResultEntry]): The result of each game, by match position, from match_results().
+
+    Returns:
+        list: The players of the round.
+    """
+    table = round.matches
+    won: Dict[int, float] = {}  # Points won by each player of the table, by index in table.players
+    for position in range(len(table)):
+        player1, player2 = table.player1[position], table.player2[position]
+        if player2 == NO_PLAYER:
+            score1 = 1  # Bye
+        else:
+            entry = results[position]
+            score1 = table.score1[position] = entry.score1
+            table.score2[position] = entry.score2
+            won[player2] = won.get(player2, 0) + entry.score2
+        won[player1] = won.get(player1, 0) + score1
+    table.version += 1
+
+    points = dict(tournament.player_points)
+    players = []
+    for index, score in won.items():
+        player = table.players[index]
+        points[player.national_id] = points.get(player.national_id, 0) + score
+        player.tournament_points = points[player.national_id]
+        player.total_points += score
+        players.append(player)
+    tournament.player_points = points
+    return players
@@ -0,0 +1,392 @@
+import gzip
+import json
+import os
+import shutil
+import sys
+import zlib
+from datetime import date
+
+from models.player_registry import PlayerRegistry
+from controllers.binary_snapshot import file_stamp
+from controllers.lazy_tournaments import LazyTournamentList, TournamentHeader
+from controllers.storage import Storage, JsonStorage, encode_tournament, decode_tournament
+from controllers.write_behind import WriteBehind, atomic_write
+
+MANIFEST_VERSION = 1
+
+# Number of files the players are spread over, by checksum of their national ID.
+PLAYER_SHARDS = 32
+
+
+def checksum(data):
+    """Return the CRC-32 of some bytes, as stored in the manifest."""
+    return zlib.crc32(data) & 0xFFFFFFFF
+
+
+def player_shard(national_id):
+    """Return the number of the players file holding a national ID."""
+    return checksum(national_id.encode("utf-8")) % PLAYER_SHARDS
+
+
+class ShardedStorage(Storage):
+    """
+    Storage backend keeping each tournament in its own file under a data directory:
+        data/manifest.json: the header and the file of each tournament, and the files of the players.
+        data/tournaments/000012-1a2b3c4d.json: the normalized record of a tournament (see encode_tournament),
+            possibly compressed (.json.gz).
+        data/players/07-5e6f7a8b.json: the records of the players whose national ID falls in shard 7.
+    File names end with the CRC-32 of their content, which is checked when they are read. A change
+    writes new files, then the manifest, and only then removes the replaced files: the manifest is
+    the commit point, so a crash leaves the previous state readable, and a corrupted file only
+    affects its own tournament or shard of players.
+    Saving a tournament writes its file, the manifest and the players files of the changed players,
+    whatever the size of the archive. Writes are done by a WriteBehind thread, like JsonStorage.
+    Attributes:
+        directory (str): The data directory.
+        files (list): The (file name, checksum) of each tournament.
+        player_files (list): The (file name, checksum) of each players shard, None for an empty shard.
+        writer (WriteBehind): The thread writing the files.
+    Methods:
+        __init__(directory): Initialize the backend on a data directory.
+        load_tournament(index, header): Reads and decodes the file of one tournament.
+        read_file(name, expected): Reads a data file and checks its checksum.
+        import_data(players, tournaments): Replaces the content of the directory with the given data.
+        compress_completed(): Compresses the files of the tournaments whose rounds were all played.
+        backup(directory): Copies the data files missing from a backup directory, then the manifest.
+        stamp(): Returns the size and modification time of the manifest.
+    """
+
+    def __init__(self, directory="data"):
+        super().__init__()
+        self.directory = directory
+        self.files = []
+        self.player_files = [None] * PLAYER_SHARDS
+        self.writer = WriteBehind()
+        self._saved_pins = []
+        self._player_versions = {}  # Version of each player when its shard was last encoded
+        self._shard_members = [{} for _ in range(PLAYER_SHARDS)]  # national_id -> player, by shard
+
+    def load(self):
+        """
+        Load the players and the tournament headers listed by the manifest. Tournaments are read when opened.
+        Returns:
+            tuple: The list of Player objects and the list of Tournament objects.
+        """
+        try:
+            with open(os.path.join(self.directory, "manifest.json"), "r", encoding="utf-8") as file:
+                manifest = json.load(file)
+        except FileNotFoundError:
+            manifest = {"version": MANIFEST_VERSION, "players": [None] * PLAYER_SHARDS, "tournaments": []}
+        if manifest["version"] != MANIFEST_VERSION or len(manifest["players"]) != PLAYER_SHARDS:
+            raise ValueError(f"Unsupported data directory {self.directory}")
+
+        self.registry = PlayerRegistry()
+        self.players = self.registry.players
+        self.player_files = [tuple(entry) if entry else None for entry in manifest["players"]]
+        for entry in self.player_files:
+            if entry:
+                for record in json.loads(self.read_file(*entry)):
+                    self.registry.intern(record)
+        self._player_versions = {player.national_id: player.version for player in self.players}
+        self._index_players(self.players, rebuild=True)
+
+        headers = []
+        self.files = []
+        for name, crc, title, location, start_date, end_date, rounds, played in manifest["tournaments"]:
+            self.files.append((name, crc))
+            headers.append(TournamentHeader(title, location, date.fromisoformat(start_date),
+                                            date.fromisoformat(end_date), rounds, played))
+        self.tournaments = LazyTournamentList(headers, self.load_tournament)
+        return self.players, self.tournaments
+
+    def load_tournament(self, index, header):
+        """
+        Read and decode the file of one tournament.
+        Args:
+            index (int): The index of the tournament.
+            header (TournamentHeader): The header of the tournament.
+        Returns:
+            Tournament: The decoded tournament.
+        """
+        tournament = decode_tournament(json.loads(self.read_file(*self.files[index])), self.registry)
+        tournament.mark_saved()
+        return tournament
+
+    def read_file(self, name, expected):
+        """
+        Read a data file, uncompressed, after checking its checksum.
+        Args:
+            name (str): The file name, relative to the data directory.
+            expected (int): The checksum recorded in the manifest.
+        Returns:
+            bytes: The content of the file.
+        Raises:
+            ValueError: If the file does not match its checksum.
+        """
+        with open(os.path.join(self.directory, name), "rb") as file:
+            data = file.read()
+        if checksum(data) != expected:
+            raise ValueError(f"Corrupted data file {name}")
+        return gzip.decompress(data) if name.endswith(".gz") else data
+
+    def encode_player(self, player):
+        """Return the record of a player and remember the version it was encoded at."""
+        self._player_versions[player.national_id] = player.version
+        return player.to_dict()
+
+    def import_data(self, players, tournaments):
+        """
+        Fill the data directory with the given players and tournaments, in place of its current content.
+        Tournaments are written one at a time, so they can be streamed from another storage.
+        Args:
+            players (list): A list of Player objects.
+            tournaments (iterable): The Tournament objects, in order.
+        """
+        self.flush()
+        headers, self.files = [], []
+        for index, tournament in enumerate(tournaments):
+            data = json.dumps(encode_tournament(tournament), separators=(",", ":")).encode("ascii")
+            name = f"tournaments/{index:06d}-{checksum(data):08x}.json"
+            self._write_file(name, data)
+            self.files.append((name, checksum(data)))
+            headers.append(TournamentHeader.from_tournament(tournament))
+        self.tournaments = LazyTournamentList(headers, self.load_tournament)
+        self.registry = PlayerRegistry(list(players))
+        self.players = self.registry.players
+        self.player_files = [None] * PLAYER_SHARDS
+        self._player_versions = {}
+        self._index_players(self.players, rebuild=True)
+        self._queue_change((), range(PLAYER_SHARDS))  # Also writes the manifest
+        self.flush()
+
+    def save(self):
+        """Write the files of the tournaments in memory that changed, and of every players shard."""
+        self._index_players(self.players, rebuild=True)  # Also players registered without an event
+        self._queue_change(range(len(self.tournaments)), range(PLAYER_SHARDS))
+
+    def player_added(self, player):
+        """Write the players shard of a new player."""
+        self._queue_change((), self._index_players([player]))
+
+    def players_added(self, players):
+        """Write the players shards of many new players at once."""
+        self._queue_change((), self._index_players(players))
+
+    def tournament_added(self, index, tournament):
+        """Write the file of a new tournament."""
+        self._queue_change((index,), ())
+
+    def round_added(self, tournament_index, round):
+        """Write the file of a tournament whose rounds changed."""
+        self.tournaments.pin(tournament_index)
+        self._queue_change((tournament_index,), ())
+
+    def tournament_updated(self, index, tournament):
+        """Write the file of a tournament whose rounds or scores changed."""
+        self.tournaments.pin(index)
+        self._queue_change((index,), ())
+
+    def players_updated(self, players):
+        """Write the players shards of the given players."""
+        self._queue_change((), self._index_players(players))
+
+    def tournaments_updated(self, tournaments, players):
+        """Write the files of several tournaments and the players shards of their players at once."""
+        for index in tournaments:
+            self.tournaments.pin(index)
+        self._queue_change(tournaments, self._index_players(players))
+
+    def flush(self):
+        """Wait until the queued writes are on disk."""
+        self.writer.flush()
+        self._release_saved()
+
+    def stamp(self):
+        """
+        Return the backend, size and modification time of the manifest, once the queued writes are on disk:
+        every change ends with a new manifest.
+        Returns:
+            list: The stamp.
+        """
+        self.flush()
+        path = os.path.join(self.directory, "manifest.json")
+        return ["sharded", os.path.abspath(path), *file_stamp(path)]
+
+    def close(self):
+        """Wait for the queued writes before quitting."""
+        self.writer.close()
+        self._release_saved()
+
+    def compress_completed(self):
+        """
+        Compress the files of the tournaments whose rounds were all played, which are not expected to change.
+        Returns:
+            int: The number of files compressed.
+        """
+        self.flush()
+        files = {}
+        for index in range(len(self.tournaments)):
+            header = self.tournaments.header(index)  # Up to date with the rounds played since the load
+            name, crc = self.files[index]
+            if name.endswith(".gz") or header.rounds_count < header.number_of_rounds or header.rounds_count == 0:
+                continue
+            data = gzip.compress(self.read_file(name, crc), mtime=0)
+            self.tournaments.pin(index)  # Its file is not readable until the change is written
+            files[index] = (f"tournaments/{index:06d}-{checksum(data):08x}.json.gz", data)
+        self._queue_files(files, {})
+        self.flush()
+        return len(files)
+
+    def backup(self, directory):
+        """
+        Copy the data files missing from a backup directory, then the manifest.
+        File names change with their content, so only the files changed since the previous backup are copied.
+        Args:
+            directory (str): The backup directory, created if needed.
+        Returns:
+            int: The number of files copied.
+        """
+        self.flush()
+        names = [name for name, _ in self.files] + [entry[0] for entry in self.player_files if entry]
+        copied = 0
+        for name in names:
+            target = os.path.join(directory, name)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(os.path.join(self.directory, name), target)
+                copied += 1
+        shutil.copy2(os.path.join(self.directory, "manifest.json"), os.path.join(directory, "manifest.json"))
+        return copied
+
+    def _index_players(self, players, rebuild=False):
+        """
+        Record the players in the membership index of their shard, so writing a shard does not scan every player.
+        Args:
+            players (Iterable[Player]): The players, in registration order.
+            rebuild (bool): Whether the index is emptied first, e.g. when players holds every player.
+        Returns:
+            set: The shards of the players.
+        """
+        if rebuild:
+            self._shard_members = [{} for _ in range(PLAYER_SHARDS)]
+        shards = set()
+        for player in players:
+            shard = player_shard(player.national_id)
+            self._shard_members[shard][player.national_id] = player
+            shards.add(shard)
+        return shards
+
+    def _queue_change(self, indices, shards):
+        """
+        Encode the given tournaments (when changed) and players shards on the calling thread,
+        then queue their files and the new manifest for the writer thread.
+        """
+        while len(self.files) < len(self.tournaments):
+            self.files.append(None)  # Tournaments added since the last change
+        files = {}
+        for index in indices:
+            tournament = self.tournaments.loaded(index)
+            if tournament is not None and (tournament.dirty or self.files[index] is None):
+                data = json.dumps(encode_tournament(tournament), separators=(",", ":")).encode("ascii")
+                files[index] = (f"tournaments/{index:06d}-{checksum(data):08x}.json", data)
+                tournament.mark_saved()
+                self.tournaments.pin(index)  # Its new file is not readable until the change is written
+        player_files = {}
+        for shard in shards:
+            players = list(self._shard_members[shard].values())
+            if players and self.player_files[shard] is not None and all(
+                    self._player_versions.get(player.national_id) == player.version for player in players):
+                continue  # Nothing changed in this shard
+            data = json.dumps([self.encode_player(player) for player in players],
+                              separators=(",", ":")).encode("utf-8")
+            player_files[shard] = (f"players/{shard:02d}-{checksum(data):08x}.json", data) if players else None
+        self._queue_files(files, player_files)
+
+    def _queue_files(self, files, player_files):
+        """Record the new files in the manifest and queue them, with the manifest, for the writer thread."""
+        obsolete = []
+        for index, (name, data) in files.items():
+            if self.files[index] is not None and self.files[index][0] != name:
+                obsolete.append(self.files[index][0])
+            self.files[index] = (name, checksum(data))
+        for shard, entry in player_files.items():
+            if self.player_files[shard] is not None and (entry is None or self.player_files[shard][0] != entry[0]):
+                obsolete.append(self.player_files[shard][0])
+            self.player_files[shard] = None if entry is None else (entry[0], checksum(entry[1]))
+        if not files and not player_files:
+            return
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "players": self.player_files,
+            "tournaments": [
+                [name, crc, header.name, header.location, header.start_date.isoformat(),
+                 header.end_date.isoformat(), header.number_of_rounds, header.rounds_count]
+                for (name, crc), header in (
+                    (self.files[index], self.tournaments.header(index))
+                    for index in range(len(self.tournaments)) if self.files[index] is not None
+                )
+            ]
+        }
+        change = {
+            "files": dict(list(files.values()) + [entry for entry in player_files.values() if entry]),
+            "manifest": json.dumps(manifest, separators=(",", ":")).encode("utf-8"),
+            "obsolete": obsolete,
+            "pins": self.tournaments.pins()
+        }
+        self.writer.submit_batch(self._write_changes, change)
+
+    def _write_changes(self, changes):
+        """Write the files of consecutive changes, then the last manifest, then remove the replaced files."""
+        files, obsolete = {}, set()
+        for change in changes:
+            for name, data in change["files"].items():
+                files[name] = data
+                obsolete.discard(name)
+            for name in change["obsolete"]:
+                if files.pop(name, None) is None:
+                    obsolete.add(name)
+        for name, data in files.items():
+            self._write_file(name, data)
+        with atomic_write(os.path.join(self.directory, "manifest.json"), "wb") as file:
+            file.write(changes[-1]["manifest"])
+        for name in obsolete:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+        self._saved_pins.extend(change["pins"] for change in changes)
+
+    def _write_file(self, name, data):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with atomic_write(path, "wb") as file:
+            file.write(data)
+
+    def _release_saved(self):
+        while self._saved_pins:
+            self.tournaments.unpin(self._saved_pins.pop(0))
+
+
+def migrate_json_to_shards(players_path="data_players.json", tournaments_path="data_tournaments.json",
+                           directory="data"):
+    """
+    Copy the content of the JSON data files (and their pending journal) into a sharded data directory.
+    Args:
+        players_path (str): Path of the players JSON file.
+        tournaments_path (str): Path of the tournaments JSON file.
+        directory (str): The data directory to fill.
+    Returns:
+        tuple: The number of players and tournaments migrated.
+    """
+    source = JsonStorage(players_path, tournaments_path)
+    players, tournaments = source.load()
+    storage = ShardedStorage(directory)
+    storage.import_data(players, source.iter_tournaments())
+    storage.close()
+    return len(players), len(tournaments)
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else "data"
+    players_count, tournaments_count = migrate_json_to_shards(directory=directory)
+    print(f"{players_count} joueurs et {tournaments_count} tournois migrés vers {directory}")
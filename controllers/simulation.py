@@ -0,0 +1,121 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optional: only the simulator needs it
+    np = None
+
+from controllers.rating import expected_score
+
+# Maximum number of (simulation, player) cells processed at once, to bound memory.
+BATCH_CELLS = 2_000_000
+
+
+class SimulationResult:
+    """
+    A class to hold the outcome counts of a batch of simulated tournaments.
+    Counts are kept rather than probabilities, so results of independent batches can be merged.
+    Attributes:
+        simulations (int): The number of simulated tournaments.
+        wins (ndarray): For each player, the number of tournaments won.
+        podiums (ndarray): For each player, the number of top-3 finishes.
+        points (ndarray): For each player, the sum of the final scores.
+    Methods:
+        merge(other): Returns the result of both batches.
+        win_probability(): Returns the probability of winning for each player.
+        podium_probability(): Returns the probability of a top-3 finish for each player.
+        expected_score(): Returns the average final score of each player.
+    """
+
+    def __init__(self, simulations, wins, podiums, points):
+        self.simulations = simulations
+        self.wins = wins
+        self.podiums = podiums
+        self.points = points
+
+    def merge(self, other):
+        """Returns the result of both batches."""
+        return SimulationResult(self.simulations + other.simulations, self.wins + other.wins,
+                                self.podiums + other.podiums, self.points + other.points)
+
+    def win_probability(self):
+        """Returns the probability of winning the tournament for each player."""
+        return self.wins / self.simulations
+
+    def podium_probability(self):
+        """Returns the probability of a top-3 finish for each player."""
+        return self.podiums / self.simulations
+
+    def expected_score(self):
+        """Returns the average final score of each player."""
+        return self.points / self.simulations
+
+    def __repr__(self):
+        """Returns a string representation with the number of simulations and players."""
+        return f"SimulationResult ({self.simulations} simulations, {len(self.wins)} players)"
+
+
+def simulate_tournament(ratings, number_of_rounds, simulations=10000, draw_rate=0.1, seed=None):
+    """
+    Play many Swiss tournaments at once and count the outcomes of each player.
+    Every simulation is a row of a points matrix. Each round, the players of every row are
+    sorted by points (ties in random order), paired with their neighbour (1-2, 3-4, ...) and the
+    lowest player gets a bye when the field is odd. Results are drawn from the Elo expected score,
+    with draw_rate as the draw probability between equal players. Rematches are not avoided.
+
+    Args:
+        ratings (sequence): The rating of each player. Equal ratings give equal chances.
+        number_of_rounds (int): The number of rounds of each tournament.
+        simulations (int): The number of tournaments to simulate.
+        draw_rate (float): The probability of a draw between two equal players.
+        seed (int): Seed of the random generator, for reproducible results.
+
+    Returns:
+        SimulationResult: The outcome counts.
+
+    Raises:
+        RuntimeError: If numpy is not installed.
+    """
+    if np is None:
+        raise RuntimeError("Le simulateur nécessite numpy (pip install numpy)")
+    ratings = np.asarray(ratings, dtype=float)
+    count = len(ratings)
+    rng = np.random.default_rng(seed)
+    batch = max(1, min(simulations, BATCH_CELLS // max(count, 1)))
+
+    result = SimulationResult(0, np.zeros(count, dtype=np.int64), np.zeros(count, dtype=np.int64),
+                              np.zeros(count))
+    done = 0
+    while done < simulations:
+        size = min(batch, simulations - done)
+        result = result.merge(_simulate_batch(ratings, number_of_rounds, size, draw_rate, rng))
+        done += size
+    return result
+
+
+def _simulate_batch(ratings, number_of_rounds, size, draw_rate, rng):
+    """Simulate size tournaments at once with a (size, players) points matrix."""
+    count = len(ratings)
+    points = np.zeros((size, count))
+    rows = np.arange(size)[:, None]
+    for _ in range(number_of_rounds):
+        order = _rank(points, rng)
+        if count % 2 == 1:
+            points[rows[:, 0], order[:, -1]] += 1.0  # Bye: a free win
+            order = order[:, :-1]
+        white, black = order[:, 0::2], order[:, 1::2]
+        expected = expected_score(ratings[white], ratings[black])
+        draw = np.minimum(draw_rate, 2 * np.minimum(expected, 1 - expected))
+        sample = rng.random(expected.shape)
+        score = np.where(sample < expected - draw / 2, 1.0, np.where(sample < expected + draw / 2, 0.5, 0.0))
+        points[rows, white] += score
+        points[rows, black] += 1.0 - score
+
+    order = _rank(points, rng)
+    wins = np.bincount(order[:, 0], minlength=count)
+    podiums = np.bincount(order[:, :3].ravel(), minlength=count)
+    return SimulationResult(size, wins, podiums, points.sum(axis=0))
+
+
+def _rank(points, rng):
+    """Return, for each row, the player indices sorted by points (best first), ties in random order."""
+    # Points are multiples of 0.5, so a noise below 1 on the doubled points only breaks ties
+    return np.argsort(rng.random(points.shape) - 2 * points, axis=1)
@@ -0,0 +1,394 @@
+import os
+import sqlite3
+import sys
+from datetime import date, datetime
+
+from models.player import Player
+from models.player_registry import PlayerRegistry
+from models.tournament import Tournament
+from models.round import Round
+from models.match import Match
+from controllers.storage import Storage, JsonStorage
+from controllers.binary_snapshot import file_stamp
+from controllers.lazy_tournaments import LazyTournamentList, TournamentHeader
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    national_id TEXT PRIMARY KEY,
+    last_name TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    birth_date TEXT NOT NULL,
+    total_points REAL NOT NULL DEFAULT 0,
+    tournament_points REAL NOT NULL DEFAULT 0,
+    rating REAL NOT NULL DEFAULT 1500,
+    rating_deviation REAL
+);
+CREATE INDEX IF NOT EXISTS idx_players_name ON players (last_name, first_name);
+
+CREATE TABLE IF NOT EXISTS tournaments (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    location TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    number_of_rounds INTEGER NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tournaments_name ON tournaments (name);
+
+CREATE TABLE IF NOT EXISTS tournament_players (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    national_id TEXT NOT NULL REFERENCES players (national_id),
+    tournament_points REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (tournament_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_tournament_players_player ON tournament_players (national_id);
+
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    tournament_id INTEGER NOT NULL REFERENCES tournaments (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    start_datetime TEXT NOT NULL,
+    end_datetime TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_rounds_tournament ON rounds (tournament_id, position);
+
+CREATE TABLE IF NOT EXISTS matches (
+    round_id INTEGER NOT NULL REFERENCES rounds (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    player1_id TEXT REFERENCES players (national_id),
+    score1 REAL NOT NULL,
+    player2_id TEXT REFERENCES players (national_id),
+    score2 REAL NOT NULL,
+    PRIMARY KEY (round_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_matches_player1 ON matches (player1_id);
+CREATE INDEX IF NOT EXISTS idx_matches_player2 ON matches (player2_id);
+"""
+
+# Columns added to the players table after its first version, created on older databases.
+PLAYER_COLUMNS_UPGRADE = [
+    ("rating", "REAL NOT NULL DEFAULT 1500"),
+    ("rating_deviation", "REAL"),
+]
+
+PLAYER_COLUMNS = ("last_name, first_name, birth_date, national_id, total_points, tournament_points, "
+                  "rating, rating_deviation")
+
+
+class SqliteStorage(Storage):
+    """
+    Storage backend based on a normalized sqlite3 database.
+    Players, tournaments, rosters, rounds and matches live in their own tables, so every
+    mutation is a single-record insert or update instead of a rewrite of the whole archive.
+    Tournaments are identified by their position in the controller's list. Only their headers
+    are read at startup; a tournament is loaded with its rounds and matches when it is opened.
+    Methods:
+        __init__(path): Open (and create if needed) the database.
+        load(): Loads and returns the players and tournaments lists.
+        save(): Writes the players and the tournaments changed in memory.
+        find_player(national_id): Indexed lookup of one player.
+        find_tournaments(name): Indexed lookup of the tournaments with the given name.
+        import_data(players, tournaments): Replaces the database content with the given data.
+        stamp(): Returns the size and modification time of the database file.
+    """
+
+    def __init__(self, path="data_tournois.db"):
+        super().__init__()
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        self._upgrade_schema()
+
+    def load(self):
+        """
+        Load the players and tournaments from the database.
+        Returns:
+            tuple: The list of Player objects and the list of Tournament objects.
+        """
+        rows = self.connection.execute(
+            f"SELECT {PLAYER_COLUMNS} FROM players ORDER BY rowid"
+        ).fetchall()
+        self.registry = PlayerRegistry([self._row_to_player(row) for row in rows])
+        self.players = self.registry.players
+        headers = [
+            TournamentHeader(name, location, date.fromisoformat(start_date), date.fromisoformat(end_date),
+                             number_of_rounds, rounds_count)
+            for name, location, start_date, end_date, number_of_rounds, rounds_count in self.connection.execute(
+                "SELECT t.name, t.location, t.start_date, t.end_date, t.number_of_rounds, "
+                "(SELECT COUNT(*) FROM rounds r WHERE r.tournament_id = t.id) "
+                "FROM tournaments t ORDER BY t.id"
+            )
+        ]
+        self.tournaments = LazyTournamentList(headers, lambda index, header: self._load_tournament(index))
+        return self.players, self.tournaments
+
+    def find_player(self, national_id):
+        """
+        Find a player by national ID.
+        Args:
+            national_id (str): The national ID of the player.
+        Returns:
+            Player or None: The player, or None if it does not exist.
+        """
+        row = self.connection.execute(
+            f"SELECT {PLAYER_COLUMNS} FROM players WHERE national_id = ?", (national_id,)
+        ).fetchone()
+        return self._row_to_player(row) if row else None
+
+    def find_tournaments(self, name):
+        """
+        Find the tournaments with the given name.
+        Args:
+            name (str): The name of the tournament.
+        Returns:
+            list: The matching Tournament objects.
+        """
+        ids = self.connection.execute(
+            "SELECT id FROM tournaments WHERE name = ? ORDER BY id", (name,)
+        ).fetchall()
+        return [self._load_tournament(tournament_id) for (tournament_id,) in ids]
+
+    def save(self):
+        """
+        Write the in-memory data in one transaction: every player is upserted, and only the tournaments
+        changed since they were loaded or written (see Tournament.dirty) are rewritten. Tournaments that
+        were never loaded are left as they are in the database.
+        """
+        with self.connection:
+            for player in self.players:
+                self._upsert_player(player)
+            for index in range(len(self.tournaments)):
+                tournament = self.tournaments.loaded(index)
+                if tournament is not None and tournament.dirty:
+                    self.connection.execute("DELETE FROM tournaments WHERE id = ?", (index,))
+                    self._insert_tournament(index, tournament)
+
+    def import_data(self, players, tournaments):
+        """
+        Replace the content of the database with the given players and tournaments.
+        Args:
+            players (list): A list of Player objects.
+            tournaments (list): A list of Tournament objects.
+        """
+        tournaments = list(tournaments)  # Read lazy lists before their rows are deleted
+        with self.connection:
+            self.connection.execute("DELETE FROM matches")
+            self.connection.execute("DELETE FROM rounds")
+            self.connection.execute("DELETE FROM tournament_players")
+            self.connection.execute("DELETE FROM tournaments")
+            self.connection.execute("DELETE FROM players")
+            for player in players:
+                self._upsert_player(player)
+            for index, tournament in enumerate(tournaments):
+                self._insert_tournament(index, tournament)
+
+    def player_added(self, player):
+        """Insert a newly added player."""
+        with self.connection:
+            self._upsert_player(player)
+
+    def players_added(self, players):
+        """Insert many new players in one transaction."""
+        with self.connection:
+            for player in players:
+                self._upsert_player(player)
+
+    def tournament_added(self, index, tournament):
+        """Insert a newly added tournament with its roster and rounds."""
+        with self.connection:
+            self._insert_tournament(index, tournament)
+
+    def round_added(self, tournament_index, round):
+        """Insert a round added to a tournament."""
+        position = self.connection.execute(
+            "SELECT COUNT(*) FROM rounds WHERE tournament_id = ?", (tournament_index,)
+        ).fetchone()[0]
+        with self.connection:
+            self._insert_round(tournament_index, position, round)
+
+    def tournament_updated(self, index, tournament):
+        """Replace the roster and rounds of a tournament."""
+        with self.connection:
+            self.connection.execute("DELETE FROM tournaments WHERE id = ?", (index,))
+            self._insert_tournament(index, tournament)
+
+    def players_updated(self, players):
+        """Update the points and ratings of the given players."""
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE players SET total_points = ?, tournament_points = ?, rating = ?, rating_deviation = ? "
+                "WHERE national_id = ?",
+                [(player.total_points, player.tournament_points, player.rating, player.rating_deviation,
+                  player.national_id) for player in players]
+            )
+
+    def tournaments_updated(self, tournaments, players):
+        """Replace the given tournaments and update the points of their players in one transaction."""
+        with self.connection:
+            for index, tournament in tournaments.items():
+                self.connection.execute("DELETE FROM tournaments WHERE id = ?", (index,))
+                self._insert_tournament(index, tournament)
+            self.connection.executemany(
+                "UPDATE players SET total_points = ?, tournament_points = ?, rating = ?, rating_deviation = ? "
+                "WHERE national_id = ?",
+                [(player.total_points, player.tournament_points, player.rating, player.rating_deviation,
+                  player.national_id) for player in players]
+            )
+
+    def stamp(self):
+        """
+        Return the backend, size and modification time of the database file, which every committed change writes.
+        Returns:
+            list: The stamp.
+        """
+        return ["sqlite", os.path.abspath(self.path), *file_stamp(self.path)]
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def _upgrade_schema(self):
+        """Add the columns missing from a database created by an older version."""
+        existing = {row[1] for row in self.connection.execute("PRAGMA table_info(players)")}
+        with self.connection:
+            for column, definition in PLAYER_COLUMNS_UPGRADE:
+                if column not in existing:
+                    self.connection.execute(f"ALTER TABLE players ADD COLUMN {column} {definition}")
+
+    def _row_to_player(self, row):
+        last_name, first_name, birth_date, national_id, total_points, tournament_points, rating, deviation = row
+        return Player(last_name, first_name, date.fromisoformat(birth_date), national_id,
+                      total_points=total_points, tournament_points=tournament_points,
+                      rating=rating, rating_deviation=deviation)
+
+    def _upsert_player(self, player):
+        self.connection.execute(
+            f"INSERT INTO players ({PLAYER_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (national_id) DO UPDATE SET last_name = excluded.last_name, "
+            "first_name = excluded.first_name, birth_date = excluded.birth_date, "
+            "total_points = excluded.total_points, tournament_points = excluded.tournament_points, "
+            "rating = excluded.rating, rating_deviation = excluded.rating_deviation",
+            (player.last_name, player.first_name, player.birth_date.isoformat(), player.national_id,
+             player.total_points, player.tournament_points, player.rating, player.rating_deviation)
+        )
+
+    def _ensure_player(self, player):
+        """Make sure a player referenced by a roster or a match exists in the players table."""
+        self.connection.execute(
+            "INSERT OR IGNORE INTO players "
+            "(national_id, last_name, first_name, birth_date, total_points, rating, rating_deviation) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (player.national_id, player.last_name, player.first_name, player.birth_date.isoformat(),
+             player.total_points, player.rating, player.rating_deviation)
+        )
+
+    def _insert_tournament(self, index, tournament):
+        self.connection.execute(
+            "INSERT INTO tournaments (id, name, location, start_date, end_date, number_of_rounds, description) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (index, tournament.name, tournament.location, tournament.start_date.isoformat(),
+             tournament.end_date.isoformat(), tournament.number_of_rounds, tournament.description)
+        )
+        for player in tournament.players:
+            self._ensure_player(player)
+        self.connection.executemany(
+            "INSERT INTO tournament_players (tournament_id, position, national_id, tournament_points) "
+            "VALUES (?, ?, ?, ?)",
+            [(index, position, player.national_id, tournament.player_points.get(player.national_id, 0))
+             for position, player in enumerate(tournament.players)]
+        )
+        for position, round in enumerate(tournament.rounds):
+            self._insert_round(index, position, round)
+        tournament.mark_saved()
+
+    def _insert_round(self, tournament_id, position, round):
+        cursor = self.connection.execute(
+            "INSERT INTO rounds (tournament_id, position, name, start_datetime, end_datetime) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (tournament_id, position, round.name, round.start_datetime.isoformat(),
+             round.end_datetime.isoformat() if round.end_datetime else None)
+        )
+        for match in round.matches:
+            for player in (match.player1, match.player2):
+                if player is not None:
+                    self._ensure_player(player)
+        self.connection.executemany(
+            "INSERT INTO matches (round_id, position, player1_id, score1, player2_id, score2) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(cursor.lastrowid, match_position,
+              match.player1.national_id if match.player1 else None, match.score1,
+              match.player2.national_id if match.player2 else None, match.score2)
+             for match_position, match in enumerate(round.matches)]
+        )
+
+    def _load_tournament(self, tournament_id):
+        row = self.connection.execute(
+            "SELECT name, location, start_date, end_date, number_of_rounds, description "
+            "FROM tournaments WHERE id = ?", (tournament_id,)
+        ).fetchone()
+        name, location, start_date, end_date, number_of_rounds, description = row
+        tournament = Tournament(name, location, date.fromisoformat(start_date), date.fromisoformat(end_date),
+                                number_of_rounds, description)
+        for national_id, tournament_points in self.connection.execute(
+            "SELECT national_id, tournament_points FROM tournament_players "
+            "WHERE tournament_id = ? ORDER BY position", (tournament_id,)
+        ).fetchall():
+            tournament.players.append(self._registered_player(national_id))
+            tournament.player_points[national_id] = tournament_points
+        for round_id, name, start_datetime, end_datetime in self.connection.execute(
+            "SELECT id, name, start_datetime, end_datetime FROM rounds "
+            "WHERE tournament_id = ? ORDER BY position", (tournament_id,)
+        ).fetchall():
+            round = Round(name)
+            round.start_datetime = datetime.fromisoformat(start_datetime)
+            round.end_datetime = datetime.fromisoformat(end_datetime) if end_datetime else None
+            round.matches = [
+                Match(self._registered_player(player1_id), score1,
+                      self._registered_player(player2_id), score2)
+                for player1_id, score1, player2_id, score2 in self.connection.execute(
+                    "SELECT player1_id, score1, player2_id, score2 FROM matches "
+                    "WHERE round_id = ? ORDER BY position", (round_id,)
+                )
+            ]
+            tournament.rounds.append(round)
+        tournament.mark_saved()
+        return tournament
+
+    def _registered_player(self, national_id):
+        """Return the canonical Player object of a national ID referenced by a roster or a match."""
+        if national_id is None:
+            return None
+        player = self.registry.get(national_id)
+        if player is None:
+            player = self.find_player(national_id)
+            self.registry.add(player)
+        return player
+
+
+def migrate_json_to_sqlite(players_path="data_players.json", tournaments_path="data_tournaments.json",
+                           db_path="data_tournois.db"):
+    """
+    Copy the content of the JSON data files (and their pending journal) into a SQLite database.
+    Args:
+        players_path (str): Path of the players JSON file.
+        tournaments_path (str): Path of the tournaments JSON file.
+        db_path (str): Path of the SQLite database to fill.
+    Returns:
+        tuple: The number of players and tournaments migrated.
+    """
+    players, tournaments = JsonStorage(players_path, tournaments_path).load()
+    storage = SqliteStorage(db_path)
+    storage.import_data(players, tournaments)
+    storage.close()
+    return len(players), len(tournaments)
+
+
+if __name__ == "__main__":
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "data_tournois.db"
+    players_count, tournaments_count = migrate_json_to_sqlite(db_path=db_path)
+    print(f"{players_count} joueurs et {tournaments_count} tournois migrés vers {db_path}")
@@ -0,0 +1,860 @@
+import json
+import os
+import re
+import threading
+import weakref
+from datetime import date, datetime
+from functools import partial
+
+from models.player import DEFAULT_RATING, Player
+from models.tournament import Tournament
+from models.round import Round
+from models.match import Match
+from models.player_registry import PlayerRegistry
+from controllers.journal import Journal
+from controllers.json_stream import iter_array_items
+from controllers.lazy_tournaments import LazyTournamentList, TournamentHeader
+from controllers.binary_snapshot import BinarySnapshot, file_stamp, write_snapshot
+from controllers.write_behind import WriteBehind, atomic_write
+
+# Number of journal records after which the journal is folded into the JSON snapshots.
+JOURNAL_COMPACTION_THRESHOLD = 200
+
+# Key of the number of the last journal record folded into a snapshot file, at the start of the file.
+JOURNAL_SEQ = re.compile(rb'^\{\s*(?:"version":\s*\d+,\s*)?"journal_seq":\s*(\d+)')
+
+# Journal operations replayed on the players file; the others are replayed on the tournaments file.
+PLAYER_OPS = ("add_player", "add_players", "update_players")
+
+# Version of the tournaments file format written by encode_tournament.
+# Version 1 (no "version" key) embeds full player records in rosters and matches.
+TOURNAMENTS_FORMAT_VERSION = 2
+
+
+def dict_to_tournament(data, registry=None):
+    """
+    Converts a dictionary representation of a tournament into a Tournament object.
+    Players of the roster and of the matches are interned through the registry, so each
+    national ID maps to a single Player object shared by every tournament and match.
+
+    Args:
+        data (dict): A dictionary containing tournament data with the following keys:
+        - name (str): The name of the tournament.
+        - location (str): The location where the tournament is held.
+        - start_date (str): The start date of the tournament in ISO format (YYYY-MM-DD).
+        - end_date (str): The end date of the tournament in ISO format (YYYY-MM-DD).
+        - number_of_rounds (int): The number of rounds in the tournament.
+        - description (str): A description of the tournament.
+        - rounds (list): A list of dictionaries, each representing a round.
+        - players (list): A list of dictionaries, each representing a player.
+        registry (PlayerRegistry): The registry used to intern players. A private one is used if None.
+
+    Returns:
+        Tournament: An instance of the Tournament class populated with the provided data.
+    """
+    if registry is None:
+        registry = PlayerRegistry()
+    tournament = Tournament(
+        name=data["name"],
+        location=data["location"],
+        start_date=datetime.fromisoformat(data["start_date"]).date(),
+        end_date=datetime.fromisoformat(data["end_date"]).date(),
+        number_of_rounds=data["number_of_rounds"],
+        description=data["description"]
+    )
+    tournament.rounds = [dict_to_round(r, registry) for r in data["rounds"]]
+    tournament.players = [registry.intern(p) for p in data["players"]]
+    tournament.player_points = {p["national_id"]: p.get("tournament_points", 0) for p in data["players"]}
+    return tournament
+
+
+def dict_to_round(data, registry=None):
+    """
+    Turn a dictionary into a Round object.
+
+    Args:
+        data (dict): A dictionary with round details like:
+        - "name" (str): The round's name.
+        - "start_datetime" (str): When the round starts (in ISO format).
+        - "end_datetime" (str or None): When the round ends (in ISO format) or None if it hasn't ended.
+        - "matches" (list): A list of dictionaries for each match.
+        registry (PlayerRegistry): The registry used to intern players. A private one is used if None.
+
+    Returns:
+        Round: A Round object filled with the provided data.
+
+    Note:
+        The `start_datetime` and `end_datetime` are converted from ISO format strings
+        to `datetime` objects using `datetime.fromisoformat`. This makes sure the datetime
+        values are correctly parsed and can be used for datetime operations in the Round object.
+    """
+    if registry is None:
+        registry = PlayerRegistry()
+    round = Round(name=data["name"])
+    round.start_datetime = datetime.fromisoformat(data["start_datetime"])
+    round.end_datetime = (
+        datetime.fromisoformat(data["end_datetime"])
+        if data["end_datetime"]
+        else None
+    )
+    round.matches = [
+        Match(
+            player1=registry.intern(m["player1"]) if m["player1"] else None,
+            score1=m["score1"],
+            player2=registry.intern(m["player2"]) if m["player2"] else None,
+            score2=m["score2"]
+        ) for m in data["matches"]
+    ]
+    return round
+
+
+def encode_tournament(tournament, rounds=None):
+    """
+    Converts a Tournament object into its normalized (version 2) dictionary representation.
+    Players are stored once in the players file: the roster is a list of national IDs and
+    each match is a [player1_id, score1, player2_id, score2] list.
+
+    Args:
+        tournament (Tournament): The tournament to encode.
+        rounds (list): The rounds already encoded with encode_round; they are encoded here if None.
+
+    Returns:
+        dict: The normalized representation of the tournament.
+    """
+    return {
+        "name": tournament.name,
+        "location": tournament.location,
+        "start_date": tournament.start_date.isoformat(),
+        "end_date": tournament.end_date.isoformat(),
+        "number_of_rounds": tournament.number_of_rounds,
+        "description": tournament.description,
+        "rounds": rounds if rounds is not None else [encode_round(round) for round in tournament.rounds],
+        "players": [player.national_id for player in tournament.players],
+        "player_points": {
+            player.national_id: tournament.player_points.get(player.national_id, 0)
+            for player in tournament.players
+        }
+    }
+
+
+def decode_tournament(data, registry):
+    """
+    Converts a tournament dictionary into a Tournament object, whatever its format version.
+    Normalized (version 2) records are recognized by their "player_points" key; older
+    records are handed over to dict_to_tournament.
+
+    Args:
+        data (dict): A tournament dictionary.
+        registry (PlayerRegistry): The registry holding the players referenced by national ID.
+
+    Returns:
+        Tournament: The decoded tournament.
+
+    Raises:
+        ValueError: If a normalized record references a player missing from the registry.
+    """
+    if "player_points" not in data:
+        return dict_to_tournament(data, registry)
+
+    tournament = Tournament(
+        name=data["name"],
+        location=data["location"],
+        start_date=date.fromisoformat(data["start_date"]),
+        end_date=date.fromisoformat(data["end_date"]),
+        number_of_rounds=data["number_of_rounds"],
+        description=data["description"]
+    )
+    tournament.rounds = [decode_round(r, registry) for r in data["rounds"]]
+    tournament.players = [_resolve_player(registry, national_id) for national_id in data["players"]]
+    tournament.player_points = dict(data["player_points"])
+    return tournament
+
+
+def encode_round(round):
+    """
+    Converts a Round object into its normalized (version 2) dictionary representation,
+    where each match is a [player1_id, score1, player2_id, score2] list.
+
+    Args:
+        round (Round): The round to encode.
+
+    Returns:
+        dict: The normalized representation of the round.
+    """
+    return {
+        "name": round.name,
+        "start_datetime": round.start_datetime.isoformat(),
+        "end_datetime": round.end_datetime.isoformat() if round.end_datetime else None,
+        "matches": [
+            [match.player1.national_id if match.player1 else None, match.score1,
+             match.player2.national_id if match.player2 else None, match.score2]
+            for match in round.matches
+        ]
+    }
+
+
+def decode_round(data, registry):
+    """
+    Converts a round dictionary into a Round object, whatever its format version.
+    Matches stored as dictionaries (version 1) are handed over to dict_to_round.
+
+    Args:
+        data (dict): A round dictionary.
+        registry (PlayerRegistry): The registry holding the players referenced by national ID.
+
+    Returns:
+        Round: The decoded round.
+    """
+    if any(isinstance(m, dict) for m in data["matches"]):
+        return dict_to_round(data, registry)
+    round = Round(name=data["name"])
+    round.start_datetime = datetime.fromisoformat(data["start_datetime"])
+    round.end_datetime = datetime.fromisoformat(data["end_datetime"]) if data["end_datetime"] else None
+    round.matches = [
+        Match(_resolve_player(registry, player1_id), score1, _resolve_player(registry, player2_id), score2)
+        for player1_id, score1, player2_id, score2 in data["matches"]
+    ]
+    return round
+
+
+def _resolve_player(registry, national_id):
+    """Return the registered player referenced by a normalized record (None stands for a bye)."""
+    if national_id is None:
+        return None
+    player = registry.get(national_id)
+    if player is None:
+        raise ValueError(f"Unknown player {national_id}")
+    return player
+
+
+def read_journal_seq(path):
+    """
+    Return the number of the last journal record folded into a JSON snapshot file, written at its start.
+    Args:
+        path (str): The path of the players or tournaments file.
+    Returns:
+        int: The record number, 0 if the file is missing or was written before records were numbered.
+    """
+    try:
+        with open(path, "rb") as file:
+            head = file.read(128)
+    except FileNotFoundError:
+        return 0
+    match = JOURNAL_SEQ.search(head)
+    return int(match.group(1)) if match else 0
+
+
+class Storage:
+    """
+    Base class of the persistence backends used by the Controller.
+    A backend loads the players and tournaments lists once and keeps a reference to them,
+    then is notified of every mutation so it can persist only what changed.
+    Attributes:
+        registry (PlayerRegistry): The registry owning the players list, used to intern players on load.
+    Methods:
+        load(): Loads and returns the players and tournaments lists.
+        save(): Writes a full snapshot of the players and tournaments.
+        player_added(player): Persists a newly added player.
+        players_added(players): Persists many new players at once, e.g. after a bulk import.
+        tournament_added(index, tournament): Persists a newly added tournament.
+        round_added(tournament_index, round): Persists a round added to a tournament.
+        tournament_updated(index, tournament): Persists a tournament whose rounds or scores changed.
+        tournaments_updated(tournaments, players): Persists several tournaments and players at once.
+        players_updated(players): Persists the points of players whose results changed.
+        iter_tournaments(): Yields every tournament one at a time.
+        stamp(): Returns a value that changes whenever the stored tournaments change.
+        flush(): Waits until the pending changes are written.
+        close(): Flushes pending changes before the application quits.
+    """
+
+    def __init__(self):
+        self.registry = PlayerRegistry()
+        self.players = self.registry.players
+        self.tournaments = []
+
+    def load(self):
+        """
+        Load the players and tournaments.
+        Returns:
+            tuple: The list of Player objects and the list of Tournament objects.
+        """
+        raise NotImplementedError
+
+    def save(self):
+        """Write a full snapshot of the players and tournaments."""
+        raise NotImplementedError
+
+    def player_added(self, player):
+        """Persist a newly added player."""
+        self.save()
+
+    def players_added(self, players):
+        """
+        Persist many newly added players with a single save, e.g. after a bulk import.
+        Args:
+            players (list): The new Player objects.
+        """
+        self.save()
+
+    def tournament_added(self, index, tournament):
+        """Persist a newly added tournament."""
+        self.save()
+
+    def round_added(self, tournament_index, round):
+        """Persist a round added to a tournament."""
+        self.save()
+
+    def tournament_updated(self, index, tournament):
+        """Persist a tournament whose rounds or scores changed."""
+        self.save()
+
+    def players_updated(self, players):
+        """Persist the points of players whose results changed."""
+        self.save()
+
+    def tournaments_updated(self, tournaments, players):
+        """
+        Persist several tournaments and the points of their players with a single save.
+        Args:
+            tournaments (dict): The updated Tournament objects, by index.
+            players (list): The players whose points changed.
+        """
+        self.save()
+
+    def iter_tournaments(self):
+        """
+        Yield every tournament one at a time, for exports and statistics over the whole archive.
+        Yields:
+            Tournament: The tournaments, in order.
+        """
+        yield from self.tournaments
+
+    def stamp(self):
+        """
+        Return a value that changes whenever the stored data changes, e.g. the size and modification time
+        of its files, to tell when data derived from the tournaments (the match archive) is out of date.
+        Returns:
+            list: The stamp, JSON serializable; None if the backend cannot tell, so derived data is always rebuilt.
+        """
+        return None
+
+    def flush(self):
+        """Wait until the pending changes are written."""
+
+    def close(self):
+        """Flush pending changes before the application quits."""
+
+
+class JsonStorage(Storage):
+    """
+    Storage backend based on the data_players.json and data_tournaments.json snapshot files.
+    Tournaments are written in the normalized format (see encode_tournament); files in the
+    previous format, with embedded player records, are still read.
+    Mutations are appended to a journal and periodically folded into the snapshots,
+    so the cost of a change does not depend on the size of the archive. Each snapshot file starts
+    with the number of the last journal record it holds, and replay_journal() skips the records a
+    snapshot already holds: a crash between the replacement of the snapshots and the removal of
+    the journal never applies a record twice.
+    The tournaments file holds one tournament record per line, and a header index
+    (data_tournaments.index.json) gives the name, dates and byte range of each record,
+    so tournaments are only decoded when they are opened.
+    A binary snapshot (data_snapshot.bin, see binary_snapshot.py) is written next to the JSON files
+    when a compaction happens after JOURNAL_COMPACTION_THRESHOLD changes since the last one, or when
+    save_snapshot() is called. While it matches the JSON files, startup reads it instead of them.
+    Closing the backend writes neither it nor the JSON files: quitting only costs the journal records of the session.
+    Files are written in the background by a WriteBehind thread: the hooks encode the change on the
+    calling thread and return, and the journal records of a burst of changes are appended with a
+    single write. Snapshot files are replaced atomically, so a crash never leaves a truncated file.
+    Only what changed since it was last written is encoded again: the JSON texts of the rounds and
+    players are cached with the version of the object they come from, and tournaments that are not
+    dirty (see Tournament.mark_saved) are copied from the current tournaments file.
+    Attributes:
+        writer (WriteBehind): The thread writing the files.
+        lock (threading.RLock): Held while the tournaments file is replaced and while a record is read from it.
+        unfolded (int): The number of journal records not yet folded into the JSON snapshots.
+        unsnapshotted (int): The number of changes since the binary snapshot was written.
+    Methods:
+        __init__(players_path, tournaments_path, journal_path, index_path, snapshot_path):
+            Initialize the backend file paths.
+        load_players(): Loads player data from the JSON snapshot.
+        load_tournaments(): Loads the tournament headers, or every tournament if the index is missing.
+        load_tournament(index, header): Decodes one tournament from its byte range.
+        iter_tournaments(): Streams every tournament from the file, one at a time.
+        stamp(): Returns the size and modification time of the tournaments file and of the journal.
+        encode_record(tournament): Encodes the record of a tournament, reusing the JSON text of its unchanged rounds.
+        encode_round_text(round): Returns the JSON text of a round, cached until it changes.
+        encode_player(player): Returns the JSON text of a player in the players file, cached until it changes.
+        capture(): Encodes the changed data to be written by save_state().
+        save_state(state): Writes captured data to the JSON snapshots and empties the journal.
+        save_players(players): Saves player records to the JSON snapshot.
+        save_tournaments(count, records): Saves the tournaments data to the JSON snapshot.
+        save(): Folds the current data into the JSON snapshots in the background.
+        record(op, **payload): Queues a mutation for the journal, compacting it when it grows too large.
+        compact(): Folds the journal into the JSON snapshot files, and writes the binary snapshot when due.
+        flush(): Waits until the queued writes are on disk.
+        replay_journal(): Applies the journal records on top of the loaded snapshots.
+        save_snapshot(): Writes the binary snapshot if it does not match the JSON files.
+    """
+
+    def __init__(self, players_path="data_players.json", tournaments_path="data_tournaments.json",
+                 journal_path="data_journal.jsonl", index_path="data_tournaments.index.json",
+                 snapshot_path="data_snapshot.bin"):
+        super().__init__()
+        self.players_path = players_path
+        self.tournaments_path = tournaments_path
+        self.index_path = index_path
+        self.snapshot_path = snapshot_path
+        self.journal = Journal(journal_path)
+        self.snapshot = None
+        self.snapshot_stamps = None
+        self.snapshot_stale = set()  # Indices of the tournaments rewritten since the snapshot was read
+        self.writer = WriteBehind()
+        self.lock = threading.RLock()
+        self.unfolded = 0
+        self.unsnapshotted = 0
+        self.folded_seqs = (0, 0)  # Last journal record held by the players and tournaments files
+        self._saved_pins = []  # Pins of the saved states, released by the interface thread
+        self._encoded_rounds = weakref.WeakKeyDictionary()  # Round -> (version, JSON text)
+        self._encoded_players = {}  # National ID -> (player, version, JSON text)
+
+    def load(self):
+        """
+        Load the binary snapshot, or the JSON snapshots if it is out of date, and replay the journal on top.
+        Returns:
+            tuple: The list of Player objects and the list of Tournament objects.
+        """
+        stamps = self.json_stamps()
+        self.folded_seqs = (read_journal_seq(self.players_path), read_journal_seq(self.tournaments_path))
+        self.journal.last_seq = max(self.journal.last_seq, *self.folded_seqs)
+        self.snapshot = BinarySnapshot.read(self.snapshot_path, stamps)
+        if self.snapshot is not None:
+            self.snapshot_stamps = stamps
+            self.registry = PlayerRegistry(self.snapshot.players)
+            self.players = self.registry.players
+            self.tournaments = LazyTournamentList(self.snapshot.headers(), self.load_tournament)
+        else:
+            self.registry = PlayerRegistry(self.load_players())
+            self.players = self.registry.players
+            self.tournaments = self.load_tournaments()
+        self.replay_journal()
+        self.unfolded = self.journal.size
+        return self.players, self.tournaments
+
+    def load_players(self):
+        """
+        Load player data from a JSON file and return a list of Player objects.
+        Returns an empty list if the file is not found or contains invalid JSON.
+        """
+        try:
+            with open(self.players_path, "r") as file:
+                data = json.load(file)
+                return [
+                    Player(
+                        last_name=p["last_name"],
+                        first_name=p["first_name"],
+                        birth_date=datetime.strptime(
+                            p["birth_date"], "%Y-%m-%d"
+                        ).date(),
+                        national_id=p["national_id"],
+                        total_points=p.get("total_points", 0),
+                        rating=p.get("rating", DEFAULT_RATING),
+                        rating_deviation=p.get("rating_deviation")
+                    ) for p in data.get("players_data", [])
+                ]
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+    def load_tournaments(self):
+        """
+        Load tournaments from a JSON file.
+        When the header index matches the file, only the headers are loaded and each tournament is
+        decoded when it is first accessed. Otherwise the whole file is parsed.
+
+        Returns:
+            LazyTournamentList: The tournaments, empty if the file is not found or invalid.
+        """
+        headers = self.load_index()
+        if headers is not None:
+            return LazyTournamentList(headers, self.load_tournament)
+        try:
+            with open(self.tournaments_path, "r") as file:
+                data = json.load(file)
+                tournaments = [
+                    decode_tournament(t, self.registry)
+                    for t in data.get("tournaments_data", [])
+                ]
+        except (FileNotFoundError, json.JSONDecodeError):
+            tournaments = []
+        collection = LazyTournamentList.from_tournaments(tournaments)
+        collection.loader = self.load_tournament
+        return collection
+
+    def load_index(self):
+        """
+        Load the tournament headers from the index file.
+
+        Returns:
+            list: The TournamentHeader objects, or None if the index is missing or out of date.
+        """
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            stat = os.stat(self.tournaments_path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if (data.get("version") != TOURNAMENTS_FORMAT_VERSION or data.get("snapshot_size") != stat.st_size
+                or data.get("snapshot_mtime_ns") != stat.st_mtime_ns):
+            return None
+        return [
+            TournamentHeader(name, location, date.fromisoformat(start_date), date.fromisoformat(end_date),
+                             number_of_rounds, rounds_count, offset, length)
+            for name, location, start_date, end_date, number_of_rounds, rounds_count, offset, length
+            in data["headers"]
+        ]
+
+    def json_stamps(self):
+        """Return the file_stamp() of the players and tournaments JSON files."""
+        return file_stamp(self.players_path), file_stamp(self.tournaments_path)
+
+    def load_tournament(self, index, header):
+        """
+        Decode one tournament from the binary snapshot, or from its byte range in the tournaments file.
+        Args:
+            index (int): The index of the tournament.
+            header (TournamentHeader): The header holding the byte range of the record.
+        Returns:
+            Tournament: The decoded tournament.
+        """
+        if self.snapshot is not None and index < len(self.snapshot) and index not in self.snapshot_stale:
+            tournament = self.snapshot.tournament(index)
+        else:
+            with self.lock:  # The writer may be replacing the file and its headers
+                record = self.read_record(self.tournaments.headers[index])
+            tournament = decode_tournament(json.loads(record), self.registry)
+        tournament.mark_saved()  # Its record in the tournaments file is up to date
+        return tournament
+
+    def iter_tournaments(self):
+        """
+        Yield every tournament one at a time, streaming the tournaments file instead of loading it.
+        Tournaments modified in memory are yielded in their current state, and tournaments of a
+        binary snapshot are read from it.
+        Yields:
+            Tournament: The tournaments, in order.
+        """
+        self.flush()
+        if self.snapshot is not None:
+            for index, header in enumerate(self.tournaments.headers):
+                yield self.tournaments.loaded(index) or self.load_tournament(index, header)
+            return
+        if os.path.exists(self.tournaments_path):
+            stored = iter_array_items(self.tournaments_path, "tournaments_data")
+        else:
+            stored = iter(())
+        for index in range(len(self.tournaments)):
+            data = next(stored, None)
+            tournament = self.tournaments.loaded(index)
+            if tournament is None:
+                tournament = decode_tournament(data, self.registry) if data is not None else self.tournaments[index]
+            yield tournament
+
+    def stamp(self):
+        """
+        Return the backend, size and modification time of the tournaments file and of the journal, once
+        the queued writes are on disk: a change is either folded into the tournaments file or journaled.
+        Returns:
+            list: The stamp.
+        """
+        self.flush()
+        return ["json", os.path.abspath(self.tournaments_path),
+                *file_stamp(self.tournaments_path), *file_stamp(self.journal.path)]
+
+    def read_record(self, header):
+        """Return the raw JSON bytes of a tournament record of the current tournaments file."""
+        with open(self.tournaments_path, "rb") as file:
+            file.seek(header.offset)
+            return file.read(header.length)
+
+    def encode_record(self, tournament):
+        """
+        Encode the record of a tournament in the tournaments file, reusing the JSON text of its unchanged rounds.
+        Args:
+            tournament (Tournament): The tournament to encode.
+        Returns:
+            bytes: The compact JSON record (see encode_tournament).
+        """
+        record = json.dumps(encode_tournament(tournament, []), separators=(",", ":"))
+        rounds = ",".join(self.encode_round_text(round) for round in tournament.rounds)
+        # Quotes are escaped inside JSON strings, so only the "rounds" key can match
+        return record.replace('"rounds":[]', '"rounds":[' + rounds + "]", 1).encode("ascii")
+
+    def encode_round_text(self, round):
+        """
+        Return the compact JSON text of a round (see encode_round), cached until the round or its matches change.
+        Args:
+            round (Round): The round to encode.
+        Returns:
+            str: The JSON text of the round.
+        """
+        version = round.version
+        cached = self._encoded_rounds.get(round)
+        if cached is None or cached[0] != version:
+            text = json.dumps(encode_round(round), separators=(",", ":"))
+            cached = self._encoded_rounds[round] = (version, text)
+        return cached[1]
+
+    def encode_player(self, player):
+        """
+        Return the JSON text of a player as written in the players file, cached until the player changes.
+        Args:
+            player (Player): The player to encode.
+        Returns:
+            str: The indented JSON object of the player.
+        """
+        cached = self._encoded_players.get(player.national_id)
+        if cached is None or cached[0] is not player or cached[1] != player.version:
+            text = json.dumps(player.to_dict(), indent=4).replace("\n", "\n        ")
+            cached = self._encoded_players[player.national_id] = (player, player.version, "        " + text)
+        return cached[2]
+
+    def capture(self):
+        """
+        Encode the changed players and tournaments, to be written by save_state().
+        Encoding happens on the calling thread, so the writer thread never reads objects the
+        interface may be changing. Tournaments that are not dirty are copied from the current
+        file when the state is written, so the cost of a save depends on what changed rather
+        than on the size of the archive.
+
+        Returns:
+            dict: The number of tournaments, the (header, record) of each changed tournament by index,
+                the JSON texts of the players and the pins released once the state is written.
+        """
+        records = {}
+        for index in range(len(self.tournaments)):
+            tournament = self.tournaments.loaded(index)
+            if tournament is not None and (tournament.dirty or self.tournaments.headers[index].offset is None):
+                self.snapshot_stale.add(index)
+                record = self.encode_record(tournament)
+                records[index] = (TournamentHeader.from_tournament(tournament), record)
+                tournament.mark_saved()
+        return {
+            "count": len(self.tournaments),
+            "records": records,
+            "players": [self.encode_player(player) for player in self.players],
+            "pins": self.tournaments.pins()
+        }
+
+    def save_state(self, state):
+        """
+        Write a state returned by capture() to the JSON snapshots, then empty the journal,
+        whose records up to the capture are now part of the snapshots. The snapshots record the
+        number of the last of these records, in case the journal outlives them.
+        Args:
+            state (dict): The captured state.
+        """
+        seq = self.journal.last_seq  # The writer thread appended every record queued before the capture
+        self.save_tournaments(state["count"], state["records"], seq)
+        self.save_players(state["players"], seq)
+        self.journal.clear()
+        self._saved_pins.append(state["pins"])
+
+    def save_players(self, players, journal_seq=0):
+        """
+        Save players' data to a JSON file, with the same layout as json.dump(..., indent=4).
+        Args:
+            players (list): The JSON texts of the players (see encode_player).
+            journal_seq (int): The number of the last journal record the players hold.
+        """
+        with atomic_write(self.players_path) as file:
+            if players:
+                file.write('{\n    "journal_seq": %d,\n    "players_data": [\n' % journal_seq
+                           + ",\n".join(players) + "\n    ]\n}")
+            else:
+                json.dump({"journal_seq": journal_seq, "players_data": []}, file, indent=4)
+
+    def save_tournaments(self, count, records, journal_seq=0):
+        """
+        Save the tournaments data to a JSON file, one tournament record per line,
+        then write the header index. Tournaments without an encoded record are copied
+        from the previous file without being decoded.
+        Args:
+            count (int): The number of tournaments to write.
+            records (dict): The (header, encoded record) of the tournaments in memory, by index.
+            journal_seq (int): The number of the last journal record the tournaments hold.
+        """
+        temp_path = self.tournaments_path + ".tmp"
+        headers = []
+        with open(temp_path, "wb") as file:
+            file.write(b'{"version":%d,"journal_seq":%d,"tournaments_data":[\n'
+                       % (TOURNAMENTS_FORMAT_VERSION, journal_seq))
+            for index in range(count):
+                if index in records:
+                    stored, record = records[index]
+                else:
+                    stored = self.tournaments.headers[index]
+                    record = self.read_record(stored)  # Only this thread replaces the file
+                if index:
+                    file.write(b",\n")
+                headers.append(TournamentHeader(stored.name, stored.location, stored.start_date, stored.end_date,
+                                                stored.number_of_rounds, stored.rounds_count,
+                                                file.tell(), len(record)))
+                file.write(record)
+            file.write(b"\n]}\n")
+            file.flush()
+            os.fsync(file.fileno())
+        with self.lock:
+            os.replace(temp_path, self.tournaments_path)
+            # Tournaments added since the capture are kept, they are still pinned
+            self.tournaments.headers[:count] = headers
+        self.save_index(headers)
+
+    def save_index(self, headers):
+        """Write the header index of the current tournaments file."""
+        stat = os.stat(self.tournaments_path)
+        with atomic_write(self.index_path, encoding="utf-8") as file:
+            json.dump({
+                "version": TOURNAMENTS_FORMAT_VERSION,
+                "snapshot_size": stat.st_size,
+                "snapshot_mtime_ns": stat.st_mtime_ns,
+                "headers": [
+                    [h.name, h.location, h.start_date.isoformat(), h.end_date.isoformat(),
+                     h.number_of_rounds, h.rounds_count, h.offset, h.length]
+                    for h in headers
+                ]
+            }, file, separators=(",", ":"))
+
+    def save(self):
+        """Fold the current data into the JSON files in the background, with the journal records it covers."""
+        self.release_saved()
+        state = self.capture()
+        self.unfolded = 0
+        self.writer.submit(partial(self.save_state, state))
+
+    def release_saved(self):
+        """Unpin the tournaments written by the writer thread since the last call."""
+        while self._saved_pins:
+            self.tournaments.unpin(self._saved_pins.pop(0))
+
+    def record(self, op, **payload):
+        """
+        Queue a mutation for the journal instead of rewriting the JSON files.
+        The records queued during a burst of changes are appended with one write by the writer thread.
+        The journal is folded into the snapshots once it reaches JOURNAL_COMPACTION_THRESHOLD records.
+        Args:
+            op (str): The name of the mutation.
+            **payload: The data needed to replay the mutation.
+        """
+        self.release_saved()
+        self.writer.submit_batch(self.journal.extend, dict(payload, op=op))
+        self.unfolded += 1
+        self.unsnapshotted += 1
+        if self.unfolded >= JOURNAL_COMPACTION_THRESHOLD:
+            self.compact()
+
+    def compact(self):
+        """
+        Fold the journal into the JSON snapshot files and empty it. Once JOURNAL_COMPACTION_THRESHOLD
+        changes were made since the binary snapshot was written, it is written again, so its cost is
+        spread over many changes instead of being paid each time the application quits.
+        """
+        self.save()
+        if self.unsnapshotted >= JOURNAL_COMPACTION_THRESHOLD:
+            self.save_snapshot()
+
+    def flush(self):
+        """Wait until the queued writes are on disk."""
+        self.writer.flush()
+        self.release_saved()
+
+    def replay_journal(self):
+        """
+        Apply the journal records on top of the snapshots loaded from the JSON files.
+        Records the snapshot of their file already holds (see read_journal_seq) are skipped.
+        """
+        players_seq, tournaments_seq = self.folded_seqs
+        for entry in self.journal.replay():
+            op = entry["op"]
+            if "seq" in entry and entry["seq"] <= (players_seq if op in PLAYER_OPS else tournaments_seq):
+                continue
+            if op == "add_player":
+                self.registry.intern(entry["player"])
+            elif op == "add_players":
+                for player in entry["players"]:
+                    self.registry.intern(player)
+            elif op == "add_tournament":
+                self.tournaments.append(decode_tournament(entry["tournament"], self.registry))
+            elif op == "add_round":
+                tournament = self.tournaments[entry["tournament_index"]]
+                tournament.add_round(decode_round(entry["round"], self.registry))
+                self.tournaments.pin(entry["tournament_index"])
+            elif op == "replace_tournament":
+                tournament = decode_tournament(entry["tournament"], self.registry)
+                self.tournaments[entry["tournament_index"]] = tournament
+            elif op == "update_players":
+                for national_id, total_points in entry["total_points"].items():
+                    player = self.registry.get(national_id)
+                    if player:
+                        player.total_points = total_points
+                for national_id, (rating, deviation) in entry.get("ratings", {}).items():
+                    player = self.registry.get(national_id)
+                    if player:
+                        player.rating, player.rating_deviation = rating, deviation
+
+    def player_added(self, player):
+        """Journal a newly added player."""
+        self.record("add_player", player=player.to_dict())
+
+    def players_added(self, players):
+        """Journal many newly added players as a single record, e.g. after a bulk import."""
+        self.record("add_players", players=[player.to_dict() for player in players])
+
+    def tournament_added(self, index, tournament):
+        """Journal a newly added tournament."""
+        self.record("add_tournament", tournament=encode_tournament(tournament))
+
+    def round_added(self, tournament_index, round):
+        """Journal a round added to a tournament."""
+        self.tournaments.pin(tournament_index)
+        self.record("add_round", tournament_index=tournament_index, round=encode_round(round))
+
+    def tournament_updated(self, index, tournament):
+        """Journal the new state of a tournament."""
+        self.tournaments.pin(index)
+        self.record("replace_tournament", tournament_index=index, tournament=encode_tournament(tournament))
+
+    def players_updated(self, players):
+        """Journal the new total points and ratings of the given players."""
+        self.record("update_players", total_points={p.national_id: p.total_points for p in players},
+                    ratings={p.national_id: [p.rating, p.rating_deviation] for p in players})
+
+    def tournaments_updated(self, tournaments, players):
+        """Fold the updated tournaments and the journal into the snapshots with a single save."""
+        for index in tournaments:
+            self.tournaments.pin(index)
+        self.unsnapshotted += len(tournaments)
+        self.compact()
+
+    def save_snapshot(self):
+        """
+        Write the binary snapshot of the players and tournaments, unless the current one matches the JSON files.
+        Tournaments are read through iter_tournaments(), from the current snapshot when possible, so the cost
+        depends on the size of the archive: it is called by compact() once enough changes accumulated, or on request.
+        """
+        if any(header.offset is None for header in self.tournaments.headers):
+            self.save()  # The snapshot refers to the JSON records of the tournaments
+        self.flush()
+        stamps = self.json_stamps()
+        if self.snapshot_stamps == stamps and os.path.exists(self.snapshot_path):
+            return
+        write_snapshot(self.snapshot_path, self.players, self.iter_tournaments(), self.tournaments.headers, stamps)
+        self.snapshot_stamps = stamps
+        self.unsnapshotted = 0
+
+    def close(self):
+        """
+        Wait for the writer before quitting. The journal is left as it is: it is folded into the
+        snapshots by record() once it reaches JOURNAL_COMPACTION_THRESHOLD records, so a short
+        session, e.g. one command of cli.py, only appends its records instead of rewriting the JSON files.
+        """
+        self.writer.close()
+        self.release_saved()
@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds without new writes after which the pending writes are performed.
+WRITE_DELAY = 0.5
+
+# Longest time a write can be postponed by a continuous burst of new writes.
+MAX_WRITE_DELAY = 5.0
+
+
+@contextmanager
+def atomic_write(path, mode="w", **kwargs):
+    """
+    Open a temporary file next to path and move it over path once it is completely written,
+    so a crash never leaves a truncated file behind: the file holds either its previous
+    content or the new one.
+
+    Args:
+        path (str): The path of the file to write.
+        mode (str): "w" or "wb".
+        **kwargs: Passed to open() (e.g. encoding).
+
+    Yields:
+        file: The temporary file to write.
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, mode, **kwargs) as file:
+        yield file
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+class WriteBehind:
+    """
+    A background thread performing the writes of a storage backend after the interface moved on.
+    Writes are queued and performed in order once no new write was queued for `delay` seconds,
+    so a burst of mutations (e.g. adding several players in a row) costs a single disk access.
+    Items queued with submit_batch() are grouped with the items of the same batch queued just
+    before them, and written with one call.
+    Attributes:
+        delay (float): Seconds without new writes after which the queue is written.
+        max_delay (float): Longest time the queue can wait during a continuous burst of writes.
+        error (Exception or None): The last error raised by a write, raised again by flush().
+    Methods:
+        submit(task): Queues a function to call on the writer thread.
+        submit_batch(write, item): Queues an item to write with the items of the batch queued before it.
+        flush(): Performs the queued writes now and waits for them.
+        close(): Flushes the queue and stops the thread.
+    """
+
+    def __init__(self, delay=WRITE_DELAY, max_delay=MAX_WRITE_DELAY):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.error = None
+        self._queue = []  # (function, items) pairs; items is None for a task called without arguments
+        self._condition = threading.Condition()
+        self._first_submit = self._last_submit = 0.0
+        self._busy = False
+        self._flushing = False
+        self._closing = False
+        self._thread = None
+
+    def submit(self, task):
+        """
+        Queue a function to call on the writer thread, after the writes queued before it.
+        Args:
+            task (callable): The function, called without arguments.
+        """
+        with self._condition:
+            self._queue.append((task, None))
+            self._wake()
+
+    def submit_batch(self, write, item):
+        """
+        Queue an item to write. Consecutive items queued for the same function are written with a single call.
+        Args:
+            write (callable): The function called with the list of items.
+            item: The item to write.
+        """
+        with self._condition:
+            if self._queue and self._queue[-1][0] == write and self._queue[-1][1] is not None:
+                self._queue[-1][1].append(item)
+            else:
+                self._queue.append((write, [item]))
+            self._wake()
+
+    def flush(self):
+        """
+        Perform the queued writes now and wait until they are on disk.
+        Raises:
+            Exception: The error raised by a write since the last flush, if any.
+        """
+        with self._condition:
+            self._flushing = True
+            self._condition.notify_all()
+            while self._queue or self._busy:
+                self._condition.wait()
+            self._flushing = False
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def close(self):
+        """Flush the queued writes and stop the writer thread."""
+        try:
+            self.flush()
+        finally:
+            with self._condition:
+                self._closing = True
+                self._condition.notify_all()
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+            self._closing = False
+
+    def _wake(self):
+        now = time.monotonic()
+        if len(self._queue) == 1 and not self._busy:
+            self._first_submit = now
+        self._last_submit = now
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+        self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closing:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                # Debounce: wait until the burst of writes is over, or the queue waited long enough
+                while not (self._flushing or self._closing):
+                    deadline = min(self._last_submit + self.delay, self._first_submit + self.max_delay)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                entries, self._queue = self._queue, []
+                self._busy = True
+            for function, items in entries:
+                try:
+                    if items is None:
+                        function()
+                    else:
+                        function(items)
+                except Exception as error:  # Kept for the next flush(): the thread must keep serving writes
+                    self.error = error
+            with self._condition:
+                self._busy = False
+                self._condition.notify_all()
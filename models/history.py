@@ -0,0 +1,107 @@
+from typing import Dict, List, Set
+
+from .round import Round
+
+
+class PairingHistory:
+    """
+    A class to index what happened in the rounds of a tournament, for pairing and tiebreaks.
+    The index is updated incrementally with each round, so every question is a dictionary
+    or set lookup instead of a scan of the rounds and matches.
+    Attributes:
+        played (Set[frozenset]): The pairs of national IDs that have already met.
+        colours (Dict[str, str]): The colour sequence of each player ("W" or "B" per game).
+        floats (Dict[str, str]): The float sequence of each player, one character per round:
+            "D" (paired with a lower score), "U" (paired with a higher score), "-" otherwise.
+        byes (Set[str]): The national IDs of the players who had a bye.
+        scores (Dict[str, float]): The points of each player after the recorded rounds.
+    Methods:
+        from_rounds(rounds): Builds the history of a list of rounds.
+        record_round(round): Adds the matches of a round to the history.
+        has_played(a, b): Tells whether two players have already met.
+        colour_sequence(national_id): Returns the colours played by a player.
+        had_bye(national_id): Tells whether a player already had a bye.
+    """
+
+    def __init__(self):
+        self.played: Set[frozenset] = set()
+        self.colours: Dict[str, str] = {}
+        self.floats: Dict[str, str] = {}
+        self.byes: Set[str] = set()
+        self.scores: Dict[str, float] = {}
+        self.rounds_count = 0
+
+    @classmethod
+    def from_rounds(cls, rounds: List[Round]):
+        """
+        Builds the history of a list of rounds.
+
+        Args:
+            rounds (List[Round]): The rounds, in the order they were played.
+
+        Returns:
+            PairingHistory: The history.
+        """
+        history = cls()
+        for round in rounds:
+            history.record_round(round)
+        return history
+
+    def record_round(self, round: Round):
+        """
+        Adds the matches of a round to the history.
+        The player with the bye is recorded as the first player of a match without second player.
+
+        Args:
+            round (Round): The round to record.
+        """
+        self.rounds_count += 1
+        for match in round.matches:
+            if match.player1 is None:
+                continue
+            first = match.player1.national_id
+            if match.player2 is None:
+                self.byes.add(first)
+                self._add_float(first, "D")
+                self.scores[first] = self.scores.get(first, 0) + match.score1
+                continue
+            second = match.player2.national_id
+            self.played.add(frozenset((first, second)))
+            self.colours[first] = self.colours.get(first, "") + "W"
+            self.colours[second] = self.colours.get(second, "") + "B"
+            first_score, second_score = self.scores.get(first, 0), self.scores.get(second, 0)
+            if first_score > second_score:
+                self._add_float(first, "D")
+                self._add_float(second, "U")
+            elif first_score < second_score:
+                self._add_float(first, "U")
+                self._add_float(second, "D")
+            else:
+                self._add_float(first, "-")
+                self._add_float(second, "-")
+            self.scores[first] = first_score + match.score1
+            self.scores[second] = second_score + match.score2
+
+    def has_played(self, a: str, b: str) -> bool:
+        """Tells whether the players with the given national IDs have already met."""
+        return frozenset((a, b)) in self.played
+
+    def colour_sequence(self, national_id: str) -> str:
+        """Returns the colours played by a player, e.g. "WBW"."""
+        return self.colours.get(national_id, "")
+
+    def float_sequence(self, national_id: str) -> str:
+        """Returns the floats of a player, e.g. "-DU", padded for the rounds it did not play."""
+        return self.floats.get(national_id, "").ljust(self.rounds_count, "-")
+
+    def had_bye(self, national_id: str) -> bool:
+        """Tells whether a player already had a bye."""
+        return national_id in self.byes
+
+    def _add_float(self, national_id, direction):
+        sequence = self.floats.get(national_id, "")
+        self.floats[national_id] = sequence.ljust(self.rounds_count - 1, "-") + direction
+
+    def __repr__(self):
+        """Returns a string representation of the history with its number of rounds and games."""
+        return f"PairingHistory ({self.rounds_count} rounds, {len(self.played)} pairs)"
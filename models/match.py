@@ -14,6 +14,8 @@ class Match:
         __repr__(): Returns a string representation of the match.
     """
 
+    __slots__ = ("player1", "score1", "player2", "score2")
+
     def __init__(self, player1: Player, score1: float,
                  player2: Player, score2: float):
         self.player1 = player1
@@ -0,0 +1,189 @@
+from array import array
+from typing import Iterable, Iterator, List, Optional
+
+from .match import Match
+from .player import Player
+
+# Index stored in the player columns for a missing player (the opponent of a bye).
+NO_PLAYER = -1
+
+
+class MatchTable:
+    """
+    A class to store the matches of a round column by column.
+    Each distinct player of the round is stored once in the players list; the matches are four
+    parallel buffers (indices of the two players, and their scores), so a match costs 16 bytes
+    of columns instead of a Match object and its attributes.
+    Match objects are only created when a match is accessed, as MatchView objects that read and
+    write the columns, so code iterating over round.matches keeps working unchanged.
+    Attributes:
+        players (List[Player]): The distinct players of the round.
+        player1 (array): Index in players of the first player of each match.
+        player2 (array): Index in players of the second player of each match, NO_PLAYER for a bye.
+        score1 (array): Score of the first player of each match.
+        score2 (array): Score of the second player of each match.
+        version (int): Incremented by every change of a match, so the storage only re-encodes changed rounds.
+    Methods:
+        from_matches(matches): Builds a table from Match objects.
+        append(match): Adds a match at the end of the table.
+        extend(matches): Adds several matches at the end of the table.
+        player_index(player): Returns the index of a player in players, adding it if needed.
+        player(index): Returns the player stored at an index.
+        score(value): Returns a stored score as entered.
+        as_arrays(): Returns the columns as NumPy arrays sharing the buffers.
+    """
+
+    __slots__ = ("players", "player1", "player2", "score1", "score2", "version", "_positions")
+
+    def __init__(self):
+        self.players: List[Player] = []
+        self.player1 = array("i")
+        self.player2 = array("i")
+        # Usual scores (multiples of 0.5) are exact in single precision
+        self.score1 = array("f")
+        self.score2 = array("f")
+        self.version = 0
+        self._positions = None
+
+    @classmethod
+    def from_matches(cls, matches: Iterable[Match]):
+        """
+        Builds a table from Match objects (or any objects with player1, score1, player2 and score2).
+
+        Args:
+            matches (Iterable[Match]): The matches, in order.
+
+        Returns:
+            MatchTable: The table.
+        """
+        table = cls()
+        table.extend(matches)
+        table._positions = None  # Only needed while matches are added
+        return table
+
+    def append(self, match: Match):
+        """Adds a match at the end of the table."""
+        self.player1.append(self.player_index(match.player1))
+        self.score1.append(match.score1)
+        self.player2.append(self.player_index(match.player2))
+        self.score2.append(match.score2)
+        self.version += 1
+
+    def extend(self, matches: Iterable[Match]):
+        """Adds several matches at the end of the table."""
+        for match in matches:
+            self.append(match)
+
+    def player_index(self, player: Optional[Player]) -> int:
+        """Returns the index of a player in players, adding it if needed (NO_PLAYER for None)."""
+        if player is None:
+            return NO_PLAYER
+        if self._positions is None:
+            self._positions = {id(known): index for index, known in enumerate(self.players)}
+        index = self._positions.get(id(player))
+        if index is None:
+            index = self._positions[id(player)] = len(self.players)
+            self.players.append(player)
+        return index
+
+    def player(self, index: int) -> Optional[Player]:
+        """Returns the player stored at an index of the players list (None for NO_PLAYER)."""
+        return None if index == NO_PLAYER else self.players[index]
+
+    def as_arrays(self):
+        """
+        Returns the columns as NumPy arrays sharing the buffers of the table.
+
+        Returns:
+            tuple: The player1, score1, player2 and score2 arrays.
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+        import numpy as np  # Optional dependency, imported on use to keep startup fast
+        return (np.frombuffer(self.player1, dtype=np.int32), np.frombuffer(self.score1, dtype=np.float32),
+                np.frombuffer(self.player2, dtype=np.int32), np.frombuffer(self.score2, dtype=np.float32))
+
+    def score(self, value: float) -> float:
+        """Returns a stored score, as an int when it is a whole number (as entered)."""
+        return int(value) if value.is_integer() else value
+
+    def _position(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("match index out of range")
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [MatchView(self, i) for i in range(*index.indices(len(self)))]
+        return MatchView(self, self._position(index))
+
+    def __setitem__(self, index, match: Match):
+        index = self._position(index)
+        self.player1[index] = self.player_index(match.player1)
+        self.score1[index] = match.score1
+        self.player2[index] = self.player_index(match.player2)
+        self.score2[index] = match.score2
+        self.version += 1
+
+    def __iter__(self) -> Iterator[Match]:
+        for index in range(len(self.player1)):
+            yield MatchView(self, index)
+
+    def __len__(self) -> int:
+        return len(self.player1)
+
+    def __repr__(self):
+        """Returns a string representation of the table with its number of matches and players."""
+        return f"MatchTable ({len(self)} matches, {len(self.players)} players)"
+
+
+class MatchView(Match):
+    """
+    A Match reading and writing one row of a MatchTable.
+    Views are created on access; changing their attributes changes the table.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: MatchTable, index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def player1(self) -> Player:
+        return self._table.player(self._table.player1[self._index])
+
+    @player1.setter
+    def player1(self, player: Player):
+        self._table.player1[self._index] = self._table.player_index(player)
+        self._table.version += 1
+
+    @property
+    def score1(self) -> float:
+        return self._table.score(self._table.score1[self._index])
+
+    @score1.setter
+    def score1(self, score: float):
+        self._table.score1[self._index] = score
+        self._table.version += 1
+
+    @property
+    def player2(self) -> Optional[Player]:
+        return self._table.player(self._table.player2[self._index])
+
+    @player2.setter
+    def player2(self, player: Optional[Player]):
+        self._table.player2[self._index] = self._table.player_index(player)
+        self._table.version += 1
+
+    @property
+    def score2(self) -> float:
+        return self._table.score(self._table.score2[self._index])
+
+    @score2.setter
+    def score2(self, score: float):
+        self._table.score2[self._index] = score
+        self._table.version += 1
@@ -1,9 +1,21 @@
+from collections import deque
 from datetime import date, datetime
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence
+
+# Rating of a new player.
+DEFAULT_RATING = 1500
 
 
 class Player:
+    __slots__ = ("last_name", "first_name", "birth_date", "national_id", "total_points", "tournament_points",
+                 "rating", "rating_deviation", "version")
+
     def __init__(self, last_name: str, first_name: str,
-                 birth_date: date, national_id: str, total_points: int = 0, tournament_points: int = 0):
+                 birth_date: date, national_id: str, total_points: int = 0, tournament_points: int = 0,
+                 rating: float = DEFAULT_RATING, rating_deviation: Optional[float] = None):
+        # Incremented by every attribute change, so the storage only re-encodes changed players
+        object.__setattr__(self, "version", 0)
         self.last_name = last_name
         self.first_name = first_name
         if isinstance(birth_date, str):
@@ -13,6 +25,30 @@ class Player:
         self.national_id = national_id
         self.total_points = total_points
         self.tournament_points = tournament_points
+        self.rating = rating
+        self.rating_deviation = rating_deviation  # Glicko rating deviation, None for a plain Elo rating
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "version", self.version + 1)
+
+    @classmethod
+    def from_columns(cls, count: int, columns: Dict[str, Sequence]) -> List["Player"]:
+        """
+        Rebuild stored players at once, from one sequence of values per attribute.
+        The slots are filled column by column through their descriptors, without __setattr__,
+        so restoring a player is not counted as a change: every player starts at version 0.
+        Args:
+            count (int): The number of players.
+            columns (dict): The values of every attribute but version, by attribute name.
+        Returns:
+            List[Player]: The players.
+        """
+        players = list(map(object.__new__, repeat(cls, count)))
+        for name in cls.__slots__:
+            values = repeat(0, count) if name == "version" else columns[name]
+            deque(map(getattr(cls, name).__set__, players, values), maxlen=0)
+        return players
 
     def to_dict(self):
         """Convert player info to a dictionary."""
@@ -22,7 +58,9 @@ class Player:
             "birth_date": self.birth_date.isoformat(),
             "national_id": self.national_id,
             "total_points": self.total_points,
-            "tournament_points": self.tournament_points
+            "tournament_points": self.tournament_points,
+            "rating": self.rating,
+            "rating_deviation": self.rating_deviation
         }
 
     def __repr__(self):
@@ -0,0 +1,136 @@
+from typing import Dict, Iterator, List, Optional
+
+from .player import DEFAULT_RATING, Player
+from .sorted_index import SortedIndex
+
+
+class PlayerRegistry:
+    """
+    A class to own the list of known players and index it.
+    Players are indexed by national ID (hash lookup) and by name, so finding a player
+    does not scan the whole player database. The name indexes are built on the first search.
+    The sorted indexes used by the reports are built on first use too, then kept up to date by add().
+    Attributes:
+        players (List[Player]): The registered players, in registration order.
+    Methods:
+        add(player): Registers a player.
+        get(national_id): Returns the player with the given national ID, or None.
+        intern(data): Returns the canonical player for a serialized player, registering it if unknown.
+        find_by_last_name(last_name): Returns the players with the given last name.
+        find_by_name(first_name, last_name): Returns the players with the given first and last name.
+        sorted_by_name(): Returns the players sorted by last name, then first name.
+        sorted_by_points(): Returns the players sorted by decreasing total points, then by name.
+    """
+
+    def __init__(self, players: Optional[List[Player]] = None):
+        self.players: List[Player] = players if players is not None else []
+        # The first registration of a national ID wins, as with a linear scan
+        self._by_id: Dict[str, Player] = {player.national_id: player for player in reversed(self.players)}
+        self._by_last_name: Optional[Dict[str, List[Player]]] = None
+        self._by_name: Optional[Dict[tuple, List[Player]]] = None
+        self._sorted_by_name: Optional[SortedIndex] = None
+        self._sorted_by_points: Optional[SortedIndex] = None
+
+    def add(self, player: Player):
+        """
+        Registers a player.
+
+        Args:
+            player (Player): The player to register.
+
+        Raises:
+            ValueError: If a player with the same national ID is already registered.
+        """
+        if player.national_id in self._by_id:
+            raise ValueError(f"Player {player.national_id} is already registered")
+        self.players.append(player)
+        self._by_id[player.national_id] = player
+        if self._by_name is not None:
+            self._index_name(player)
+        if self._sorted_by_name is not None:
+            self._sorted_by_name.add(player)
+        if self._sorted_by_points is not None:
+            self._sorted_by_points.add(player)
+
+    def get(self, national_id: str) -> Optional[Player]:
+        """Returns the player with the given national ID, or None if it is not registered."""
+        return self._by_id.get(national_id)
+
+    def intern(self, data: dict) -> Player:
+        """
+        Returns the canonical Player object for a serialized player.
+        Loading code uses this so that rosters and matches share the registered object
+        instead of building a copy per occurrence. Unknown players are registered.
+
+        Args:
+            data (dict): A dictionary as produced by Player.to_dict().
+
+        Returns:
+            Player: The registered player with the same national ID.
+        """
+        player = self._by_id.get(data["national_id"])
+        if player is None:
+            player = Player(
+                last_name=data["last_name"],
+                first_name=data["first_name"],
+                birth_date=data["birth_date"],
+                national_id=data["national_id"],
+                total_points=data.get("total_points", 0),
+                rating=data.get("rating", DEFAULT_RATING),
+                rating_deviation=data.get("rating_deviation")
+            )
+            self.add(player)
+        return player
+
+    def find_by_last_name(self, last_name: str) -> List[Player]:
+        """Returns the players with the given last name (case insensitive)."""
+        self._build_name_indexes()
+        return list(self._by_last_name.get(last_name.lower(), []))
+
+    def find_by_name(self, first_name: str, last_name: str) -> List[Player]:
+        """Returns the players with the given first and last name (case insensitive)."""
+        self._build_name_indexes()
+        return list(self._by_name.get((first_name.lower(), last_name.lower()), []))
+
+    def sorted_by_name(self) -> SortedIndex:
+        """Returns the index of the players sorted by last name, then first name."""
+        if self._sorted_by_name is None:
+            self._sorted_by_name = SortedIndex(lambda player: (player.last_name, player.first_name), self.players,
+                                               version=lambda player: player.version)
+        else:
+            self._sorted_by_name.refresh()
+        return self._sorted_by_name
+
+    def sorted_by_points(self) -> SortedIndex:
+        """Returns the index of the players sorted by decreasing total points, then by name."""
+        if self._sorted_by_points is None:
+            self._sorted_by_points = SortedIndex(
+                lambda player: (-player.total_points, player.last_name, player.first_name), self.players,
+                version=lambda player: player.version
+            )
+        else:
+            self._sorted_by_points.refresh()
+        return self._sorted_by_points
+
+    def _build_name_indexes(self):
+        if self._by_name is None:
+            self._by_last_name, self._by_name = {}, {}
+            for player in self.players:
+                self._index_name(player)
+
+    def _index_name(self, player: Player):
+        self._by_last_name.setdefault(player.last_name.lower(), []).append(player)
+        self._by_name.setdefault((player.first_name.lower(), player.last_name.lower()), []).append(player)
+
+    def __contains__(self, national_id: str) -> bool:
+        return national_id in self._by_id
+
+    def __iter__(self) -> Iterator[Player]:
+        return iter(self.players)
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __repr__(self):
+        """Returns a string representation of the registry with its number of players."""
+        return f"PlayerRegistry ({len(self.players)} players)"
@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import List
 
 from .match import Match
+from .match_table import MatchTable
 
 
 class Round:
@@ -15,8 +16,12 @@ class Round:
         The start date and time of the round.
     end_datetime : datetime or None
         The end date and time of the round, initially set to None.
-    matches : List[Match]
-        A list of matches in the round.
+    matches : MatchTable
+        The matches of the round, stored column by column. Assigning a list of matches
+        converts it; iterating or indexing returns Match objects.
+    version : int
+        Incremented by every change of the round or of its matches, so the storage only
+        re-encodes changed rounds.
     Methods:
     --------
     end_round():
@@ -29,11 +34,34 @@ class Round:
         Returns a string representation of the round object.
     """
 
+    __slots__ = ("name", "start_datetime", "end_datetime", "_matches", "_version", "__weakref__")
+
     def __init__(self, name: str):
+        self._version = 0
+        self._matches = MatchTable()
         self.name = name
         self.start_datetime = datetime.now()
         self.end_datetime = None
-        self.matches: List[Match] = []
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith("_"):
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        """The number of changes of the round and its matches."""
+        return self._version + self._matches.version
+
+    @property
+    def matches(self) -> MatchTable:
+        """The matches of the round."""
+        return self._matches
+
+    @matches.setter
+    def matches(self, matches: List[Match]):
+        self._version += self._matches.version  # Keeps the version increasing with the new table
+        self._matches = matches if isinstance(matches, MatchTable) else MatchTable.from_matches(matches)
 
     def end_round(self):
         """ Marks the end of the round by setting the end time to the current datetime. """
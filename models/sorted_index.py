@@ -0,0 +1,87 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+class SortedIndex:
+    """
+    A class to keep items sorted by a key as they are added, so ordered listings do not sort
+    the whole collection on every call.
+    Keys and items are kept in two parallel sorted lists: adding an item is a binary search and
+    an insertion, and a page of a listing is a slice. Items with equal keys stay in insertion order.
+    When a version function is given, items whose version changed since they were indexed
+    (e.g. players whose points changed) are moved to their new place by refresh().
+    Items must be hashable, and are indexed once each.
+    Attributes:
+        key (Callable): Returns the sort key of an item.
+        version (Callable): Returns the version of an item (see Player.version), or None.
+    Methods:
+        add(item): Inserts an item at its place, unless it is already indexed.
+        update(item): Moves an item whose key changed to its new place.
+        refresh(): Moves the items whose version changed since they were indexed.
+        page(start, size): Returns the items of a page.
+    """
+
+    def __init__(self, key: Callable[[Any], Any], items: Iterable = (),
+                 version: Optional[Callable[[Any], int]] = None):
+        self.key = key
+        self.version = version
+        items = list(dict.fromkeys(items))
+        keys = [key(item) for item in items]
+        order = sorted(range(len(items)), key=keys.__getitem__)  # Stable: keeps insertion order
+        self._keys: List = [keys[position] for position in order]
+        self._items: List = [items[position] for position in order]
+        self._indexed: Dict[Any, Any] = dict(zip(items, keys))  # item -> key when indexed
+        self._versions: Dict[Any, int] = dict(zip(items, map(version, items))) if version else {}
+
+    def add(self, item):
+        """Inserts an item at its place in the index, unless it is already indexed."""
+        if item in self._indexed:
+            return
+        key = self.key(item)
+        position = bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._items.insert(position, item)
+        self._indexed[item] = key
+        if self.version:
+            self._versions[item] = self.version(item)
+
+    def update(self, item):
+        """Moves an item whose key changed to its new place in the index."""
+        old_key, key = self._indexed[item], self.key(item)
+        if key != old_key:
+            position = bisect_left(self._keys, old_key)
+            while self._items[position] is not item:
+                position += 1
+            del self._keys[position]
+            del self._items[position]
+            position = bisect_right(self._keys, key)
+            self._keys.insert(position, key)
+            self._items.insert(position, item)
+            self._indexed[item] = key
+        if self.version:
+            self._versions[item] = self.version(item)
+
+    def refresh(self):
+        """Moves the items whose version changed since they were indexed to their new place."""
+        if self.version is None:
+            return
+        version = self.version
+        changed = [item for item, indexed_version in self._versions.items() if version(item) != indexed_version]
+        for item in changed:
+            self.update(item)
+
+    def page(self, start: int, size: int) -> List:
+        """Returns the items from position start (0-based), at most size of them."""
+        return self._items[start:start + size]
+
+    def __iter__(self) -> Iterator:
+        items = self._items
+        for position in range(len(items)):
+            yield items[position]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self):
+        """Returns a string representation of the index with its number of items."""
+        return f"SortedIndex ({len(self._items)} items)"
@@ -0,0 +1,179 @@
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .player import Player
+
+# set_scores() rebuilds the buckets in bulk when at least 1/BULK_UPDATE_RATIO of the players move.
+BULK_UPDATE_RATIO = 8
+
+
+class Standings:
+    """
+    A class to keep the players of a tournament ranked while results come in.
+    Players are bucketed by score; each bucket is kept sorted by tiebreaks, so updating the
+    k players whose results changed costs O(k log n) instead of a full sort of the roster.
+    Attributes:
+        tiebreaks (Callable): Returns the tiebreak values of a player (higher is better), or None.
+    Methods:
+        from_tournament(tournament, tiebreaks): Builds the standings of a tournament from its recorded points.
+        set_score(player, score): Moves a player to the bucket of its new score.
+        set_scores(changes): Moves several players to the buckets of their new scores.
+        refresh(player): Re-sorts a player whose tiebreak values changed.
+        player(national_id): Returns the player with a national ID, or None.
+        score_of(player): Returns the score of a player.
+        rank(player): Returns the 1-based rank of a player.
+        top(n): Returns the n best ranked players.
+        score_groups(): Yields (score, players) for each score, from the highest.
+        players(): Returns the players in seeding order.
+    """
+
+    def __init__(self, players: List[Player], scores: Optional[Dict[str, float]] = None,
+                 tiebreaks: Optional[Callable[[Player], Tuple]] = None):
+        """
+        Args:
+            players (List[Player]): The players, in seeding order (used as the last tiebreak).
+            scores (Dict[str, float]): The score of each national ID; players' tournament_points if None.
+            tiebreaks (Callable): Returns a tuple of tiebreak values for a player, higher is better.
+        """
+        self.tiebreaks = tiebreaks
+        self._players: Dict[str, Player] = {}
+        self._seeds: Dict[str, int] = {}
+        self._scores: Dict[str, float] = {}
+        self._entries: Dict[str, tuple] = {}
+        self._buckets: Dict[float, List[tuple]] = {}
+        self._keys: List[float] = []  # Negated scores, ascending
+        for player in players:
+            if player.national_id in self._players:
+                continue
+            self._players[player.national_id] = player
+            self._seeds[player.national_id] = len(self._seeds)
+            score = scores.get(player.national_id, 0) if scores is not None else player.tournament_points
+            entry = self._entry(player.national_id)
+            self._buckets.setdefault(score, []).append(entry)
+            self._scores[player.national_id] = score
+            self._entries[player.national_id] = entry
+        # Built in bulk: each bucket is sorted once rather than filled by sorted insertions
+        for bucket in self._buckets.values():
+            bucket.sort()
+        self._keys = sorted(-score for score in self._buckets)
+
+    @classmethod
+    def from_tournament(cls, tournament, tiebreaks=None):
+        """Builds the standings of a tournament from the points recorded in player_points."""
+        return cls(tournament.players, tournament.player_points, tiebreaks)
+
+    def set_score(self, player: Player, score: float):
+        """
+        Moves a player to the bucket of its new score.
+
+        Args:
+            player (Player): The player whose score changed.
+            score (float): The new score.
+        """
+        self._remove(player.national_id)
+        self._insert(player.national_id, score)
+
+    def set_scores(self, changes: Iterable[Tuple[Player, float]]):
+        """
+        Moves several players to the buckets of their new scores, e.g. the players of a round.
+        A few players are moved one at a time, in O(k log n). When many players move, the buckets
+        they leave and join are rebuilt with one sort each instead of k sorted insertions.
+
+        Args:
+            changes (Iterable[Tuple[Player, float]]): The players whose score or tiebreaks changed, with their score.
+        """
+        changes = {player.national_id: (player, score) for player, score in changes}
+        if len(changes) * BULK_UPDATE_RATIO < len(self._players):
+            for player, score in changes.values():
+                self.set_score(player, score)
+            return
+        touched = {self._scores[national_id] for national_id in changes}
+        for score in touched:
+            self._buckets[score] = [entry for entry in self._buckets[score] if entry[-1] not in changes]
+        for national_id, (_, score) in changes.items():
+            entry = self._entry(national_id)
+            self._buckets.setdefault(score, []).append(entry)
+            self._scores[national_id] = score
+            self._entries[national_id] = entry
+            touched.add(score)
+        for score in touched:
+            if self._buckets[score]:
+                self._buckets[score].sort()
+            else:
+                del self._buckets[score]
+        self._keys = sorted(-score for score in self._buckets)
+
+    def refresh(self, player: Player):
+        """Re-sorts a player inside its bucket after its tiebreak values changed."""
+        self.set_score(player, self._scores[player.national_id])
+
+    def player(self, national_id: str) -> Optional[Player]:
+        """Returns the player with a national ID, or None if it is not in the standings."""
+        return self._players.get(national_id)
+
+    def score_of(self, player: Player) -> float:
+        """Returns the score of a player."""
+        return self._scores[player.national_id]
+
+    def rank(self, player: Player) -> int:
+        """Returns the 1-based rank of a player."""
+        national_id = player.national_id
+        score = self._scores[national_id]
+        above = 0
+        for key in self._keys:
+            if key == -score:
+                break
+            above += len(self._buckets[-key])
+        return above + bisect_left(self._buckets[score], self._entries[national_id]) + 1
+
+    def top(self, n: int) -> List[Player]:
+        """Returns the n best ranked players."""
+        result = []
+        for _, players in self.score_groups():
+            result.extend(players[:n - len(result)])
+            if len(result) >= n:
+                break
+        return result
+
+    def players(self) -> List[Player]:
+        """Returns the players in seeding order."""
+        return list(self._players.values())
+
+    def score_groups(self) -> Iterator[Tuple[float, List[Player]]]:
+        """Yields (score, players) for each score, from the highest, players in rank order."""
+        for key in self._keys:
+            yield -key, [self._players[entry[-1]] for entry in self._buckets[-key]]
+
+    def _entry(self, national_id):
+        tiebreaks = self.tiebreaks(self._players[national_id]) if self.tiebreaks else ()
+        return tuple(-value for value in tiebreaks) + (self._seeds[national_id], national_id)
+
+    def _insert(self, national_id, score):
+        entry = self._entry(national_id)
+        bucket = self._buckets.get(score)
+        if bucket is None:
+            bucket = self._buckets[score] = []
+            insort(self._keys, -score)
+        insort(bucket, entry)
+        self._scores[national_id] = score
+        self._entries[national_id] = entry
+
+    def _remove(self, national_id):
+        score = self._scores.pop(national_id)
+        entry = self._entries.pop(national_id)
+        bucket = self._buckets[score]
+        del bucket[bisect_left(bucket, entry)]
+        if not bucket:
+            del self._buckets[score]
+            del self._keys[bisect_left(self._keys, -score)]
+
+    def __iter__(self) -> Iterator[Player]:
+        for _, players in self.score_groups():
+            yield from players
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __repr__(self):
+        """Returns a string representation of the standings with the number of players and score groups."""
+        return f"Standings ({len(self._players)} players, {len(self._keys)} score groups)"
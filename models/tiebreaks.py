@@ -0,0 +1,148 @@
+from typing import Dict, List, Set, Tuple
+
+from .player import Player
+from .round import Round
+
+
+class Tiebreaks:
+    """
+    A class to keep the tiebreak values of the players of a tournament up to date as rounds are added.
+    Each player keeps the list of its opponents, so when the score of a player changes, only its
+    opponents' sums are adjusted: recording a round costs O(games played so far) instead of
+    recomputing every sum from the rounds and matches.
+    The progressive score is not stored per player: it is derived from the score and the round
+    numbers of the points when it is read, so a round only changes the values of its players and
+    of their past opponents, and the standings only move those (see changed).
+    Byes count for the score and the progressive score, but not as an opponent.
+    Attributes:
+        scores (Dict[str, float]): The points of each player after the recorded rounds.
+        buchholz (Dict[str, float]): The sum of the scores of each player's opponents.
+        sonneborn_berger (Dict[str, float]): The sum, over each player's games, of the points
+            scored against an opponent multiplied by the score of that opponent.
+        rounds (int): The number of recorded rounds.
+        changed (Set[str]): The national IDs whose score, Buchholz or Sonneborn-Berger changed with the
+            last recorded round: the players of the round and the past opponents of those who scored.
+    Methods:
+        from_rounds(rounds): Builds the tiebreaks of a list of rounds.
+        record_round(round): Adds the results of a round to the tiebreaks.
+        progressive(national_id): Returns the sum of a player's scores after every round.
+        values(national_id): Returns the (buchholz, sonneborn_berger, progressive) values of a player.
+        key(player): Returns the Buchholz and Sonneborn-Berger of a player, to keep Standings up to date.
+        ranking_key(player): Returns every tiebreak value of a player, for a final ranking.
+    """
+
+    NAMES = ("Buchholz", "Sonneborn-Berger", "Progressif")
+
+    def __init__(self):
+        self.scores: Dict[str, float] = {}
+        self.buchholz: Dict[str, float] = {}
+        self.sonneborn_berger: Dict[str, float] = {}
+        self.rounds = 0
+        self.changed: Set[str] = set()
+        # For each player, the (opponent, points scored by the opponent against the player) of its games
+        self._games: Dict[str, List[Tuple[str, float]]] = {}
+        # For each player, the sum of its points of each round multiplied by the round number
+        self._weighted: Dict[str, float] = {}
+
+    @classmethod
+    def from_rounds(cls, rounds: List[Round]):
+        """
+        Builds the tiebreaks of a list of rounds.
+
+        Args:
+            rounds (List[Round]): The rounds, in the order they were played.
+
+        Returns:
+            Tiebreaks: The tiebreaks.
+        """
+        tiebreaks = cls()
+        for round in rounds:
+            tiebreaks.record_round(round)
+        return tiebreaks
+
+    def record_round(self, round: Round):
+        """
+        Adds the results of a round to the tiebreaks.
+
+        Args:
+            round (Round): The round to record.
+        """
+        deltas: Dict[str, float] = {}
+        games = []
+        for match in round.matches:
+            if match.player1 is None:
+                continue
+            first = match.player1.national_id
+            deltas[first] = deltas.get(first, 0) + match.score1
+            if match.player2 is None:
+                continue
+            second = match.player2.national_id
+            deltas[second] = deltas.get(second, 0) + match.score2
+            games.append((first, match.score1, second, match.score2))
+
+        self.rounds += 1
+        changed = set(deltas)
+        # The new points of a player raise the sums of the opponents it already met
+        for national_id, delta in deltas.items():
+            self._add_player(national_id)
+            if not delta:
+                continue
+            for opponent, opponent_points in self._games[national_id]:
+                self.buchholz[opponent] += delta
+                self.sonneborn_berger[opponent] += opponent_points * delta
+                changed.add(opponent)
+            self.scores[national_id] += delta
+            self._weighted[national_id] += self.rounds * delta
+
+        # The new games add the current score of the new opponents
+        for first, first_points, second, second_points in games:
+            self._games[first].append((second, second_points))
+            self._games[second].append((first, first_points))
+            self.buchholz[first] += self.scores[second]
+            self.buchholz[second] += self.scores[first]
+            self.sonneborn_berger[first] += first_points * self.scores[second]
+            self.sonneborn_berger[second] += second_points * self.scores[first]
+        self.changed = changed
+
+    def progressive(self, national_id: str) -> float:
+        """
+        Returns the sum of a player's scores after every round, 0 if unknown.
+        Points scored in round i count once for each round from i to the last one, so the sum is
+        (rounds + 1) * score - sum(i * points of round i).
+        """
+        if national_id not in self.scores:
+            return 0
+        return (self.rounds + 1) * self.scores[national_id] - self._weighted[national_id]
+
+    def values(self, national_id: str) -> Tuple[float, float, float]:
+        """Returns the (buchholz, sonneborn_berger, progressive) values of a player, zeros if unknown."""
+        if national_id not in self.scores:
+            return 0, 0, 0
+        return self.buchholz[national_id], self.sonneborn_berger[national_id], self.progressive(national_id)
+
+    def key(self, player: Player) -> Tuple[float, float]:
+        """
+        Returns the Buchholz and Sonneborn-Berger of a player (higher is better), for Standings kept up to
+        date round by round: they only change for the players listed in changed. The progressive score
+        changes for every player who has points, so it is left to ranking_key().
+        """
+        national_id = player.national_id
+        if national_id not in self.scores:
+            return 0, 0
+        return self.buchholz[national_id], self.sonneborn_berger[national_id]
+
+    def ranking_key(self, player: Player) -> Tuple[float, float, float]:
+        """Returns every tiebreak value of a player (higher is better), for Standings built once to rank them."""
+        return self.values(player.national_id)
+
+    def _add_player(self, national_id):
+        if national_id not in self.scores:
+            self.scores[national_id] = 0
+            self.buchholz[national_id] = 0
+            self.sonneborn_berger[national_id] = 0
+            self._weighted[national_id] = 0
+            self._games[national_id] = []
+
+    def __repr__(self):
+        """Returns a string representation of the tiebreaks with their number of players."""
+        return f"Tiebreaks ({len(self.scores)} players)"
@@ -1,8 +1,10 @@
 from datetime import date
-from typing import List
+from typing import Dict, List
 
 from .round import Round
 from .player import Player
+from .history import PairingHistory
+from .tiebreaks import Tiebreaks
 
 
 class Tournament:
@@ -17,19 +19,60 @@ class Tournament:
         description (str): A brief description of the tournament.
         rounds (List[Round]): A list to store the rounds of the tournament.
         players (List[Player]): A list to store the players participating in the tournament.
+        player_points (Dict[str, float]): The points scored in this tournament, by national ID.
+            Player objects are shared between tournaments, so their tournament_points only
+            reflect the tournament being played.
+        history (PairingHistory): The played pairs, colours, floats and byes of the rounds. It is built
+            from the rounds on first access, then updated by add_round().
+        tiebreaks (Tiebreaks): The Buchholz, Sonneborn-Berger and progressive scores of the players,
+            built and kept up to date in the same way.
+        version (int): Incremented by every change of the tournament, of its rounds or of their matches.
+        dirty (bool): Whether the tournament changed since mark_saved() was called.
     """
+    __slots__ = ("name", "location", "start_date", "end_date", "number_of_rounds", "description",
+                 "_rounds", "_history", "_tiebreaks", "players", "player_points", "_version", "_saved_version",
+                 "__weakref__")
+
     def __init__(
         self, name: str, location: str, start_date: date, end_date: date,
         number_of_rounds: int = 4, description: str = ""
     ):
+        self._version = 0
+        self._saved_version = None
         self.name = name
         self.location = location
         self.start_date = start_date
         self.end_date = end_date
         self.number_of_rounds = number_of_rounds
         self.description = description
-        self.rounds: List[Round] = []
+        self._rounds: List[Round] = []
+        self._history = None
+        self._tiebreaks = None
         self.players: List[Player] = []
+        self.player_points: Dict[str, float] = {}
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if not name.startswith("_"):
+            self._version += 1
+
+    @property
+    def version(self) -> int:
+        """The number of changes of the tournament, its rounds and their matches."""
+        return self._version + sum(round.version for round in self._rounds)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the tournament changed since the last call to mark_saved()."""
+        return self.version != self._saved_version
+
+    def mark_saved(self):
+        """
+        Records that the stored form of the tournament is up to date.
+        Changes made to the players list or the player_points dict in place are not tracked:
+        use add_player() or assign a new value.
+        """
+        self._saved_version = self.version
 
     def add_player(self, player: Player):
         """
@@ -39,6 +82,47 @@ class Tournament:
             player (Player): The player to add.
         """
         self.players.append(player)
+        self.player_points.setdefault(player.national_id, 0)
+        self._version += 1
+
+    def sync_player_points(self):
+        """Records the current tournament_points of the players as the points of this tournament."""
+        self.player_points = {player.national_id: player.tournament_points for player in self.players}
+
+    @property
+    def rounds(self) -> List[Round]:
+        """The rounds of the tournament. Assigning a new list resets the history and the tiebreaks."""
+        return self._rounds
+
+    @rounds.setter
+    def rounds(self, rounds: List[Round]):
+        # Keeps the version increasing, even when the new rounds have fewer changes (e.g. no rounds)
+        self._version += sum(round.version for round in self._rounds) + 1
+        self._rounds = rounds
+        self._history = None
+        self._tiebreaks = None
+
+    @property
+    def history(self) -> PairingHistory:
+        """The pairing history of the tournament, built once then kept up to date by add_round()."""
+        if self._history is None:
+            self._history = PairingHistory.from_rounds(self._rounds)
+        return self._history
+
+    @property
+    def tiebreaks(self) -> Tiebreaks:
+        """The tiebreaks of the players, built once then kept up to date by add_round()."""
+        if self._tiebreaks is None:
+            self._tiebreaks = Tiebreaks.from_rounds(self._rounds)
+        return self._tiebreaks
+
+    def invalidate_history(self):
+        """
+        Drops the pairing history and the tiebreaks so that they are rebuilt,
+        e.g. after results of a round were changed.
+        """
+        self._history = None
+        self._tiebreaks = None
 
     def add_round(self, round: Round):
         """
@@ -47,7 +131,12 @@ class Tournament:
         Args:
             round (Round): The round to add to the tournament.
         """
-        self.rounds.append(round)
+        self._rounds.append(round)
+        self._version += 1
+        if self._history is not None:
+            self._history.record_round(round)
+        if self._tiebreaks is not None:
+            self._tiebreaks.record_round(round)
 
     def to_dict(self):
         """
@@ -71,7 +160,10 @@ class Tournament:
             "number_of_rounds": self.number_of_rounds,
             "description": self.description,
             "rounds": [round.to_dict() for round in self.rounds],
-            "players": [player.to_dict() for player in self.players]
+            "players": [
+                dict(player.to_dict(), tournament_points=self.player_points.get(player.national_id, 0))
+                for player in self.players
+            ]
         }
 
     def __repr__(self):
@@ -0,0 +1,76 @@
+import io
+import os
+from datetime import date
+
+import pytest
+
+from controller import Controller
+from controllers.storage import JsonStorage
+from models.match import Match
+from view import MenuView, TerminalWriter
+
+
+def player_rows(count, prefix="FR"):
+    """Return the rows of count players to import, with distinct ratings."""
+    return [
+        {"last_name": f"Nom{number}", "first_name": f"Prenom{number}", "birth_date": "1990-01-01",
+         "national_id": f"{prefix}{number:05d}", "rating": 2000 - 10 * number}
+        for number in range(count)
+    ]
+
+
+def json_paths(directory):
+    """Return the paths of the files of a JsonStorage in a directory."""
+    return [os.path.join(directory, name) for name in (
+        "data_players.json", "data_tournaments.json", "data_journal.jsonl", "data_tournaments.index.json",
+        "data_snapshot.bin"
+    )]
+
+
+def build_archive(controller, answers):
+    """
+    Fill a controller with 3 players and a tournament of two rounds: a completed one (a win and a bye)
+    and an empty one.
+    """
+    controller.add_player("Dupont", "Jean", date(1990, 1, 1), "FR1")
+    controller.add_player("Durand", "Marie", date(1985, 5, 4), "FR2")
+    controller.add_player("Martin", "Paul", date(2001, 12, 31), "FR3")
+    answers(["Paris", "2024-07-01", "2024-07-07", "3", "Open d'été", "FR1", "FR2", "FR3", "done", ""])
+    controller.add_tournament("Open")
+    controller.add_round_to_tournament(0, "Tour 1")
+    tournament = controller.tournaments_data[0]
+    first, second, third = tournament.players
+    tournament.rounds[0].add_match(Match(first, 1, second, 0))
+    tournament.rounds[0].add_match(Match(third, 1, None, 0))
+    tournament.rounds[0].end_round()
+    controller.storage.tournament_updated(0, tournament)
+    controller.add_round_to_tournament(0, "Tour 2")
+
+
+def archive_state(controller):
+    """Return the players and tournaments of a controller as plain values, to compare two loads."""
+    players = sorted(controller.players_data, key=lambda player: player.national_id)  # In any stored order
+    return ([player.to_dict() for player in players],
+            [tournament.to_dict() for tournament in controller.tournaments_data])
+
+
+@pytest.fixture
+def view():
+    """A MenuView writing to memory; its output is view.writer.stream.getvalue()."""
+    return MenuView(TerminalWriter(io.StringIO()))
+
+
+@pytest.fixture
+def answers(monkeypatch):
+    """Return a function queueing the answers of the next input() calls."""
+    queue = []
+    monkeypatch.setattr("builtins.input", lambda prompt="": queue.pop(0))
+    return queue.extend
+
+
+@pytest.fixture
+def json_controller(tmp_path, view):
+    """Return a function opening a Controller on a JsonStorage in a temporary directory."""
+    def open_controller():
+        return Controller(view, JsonStorage(*json_paths(tmp_path)))
+    return open_controller
@@ -0,0 +1,123 @@
+import os
+from datetime import date
+
+import pytest
+
+from controller import Controller
+from controllers import archive as archive_module
+from controllers.archive import MatchArchive, build_archive
+from controllers.reports import player_games_report
+from controllers.sqlite_storage import SqliteStorage
+from models.match import Match
+from models.player import Player
+from models.round import Round
+from models.tournament import Tournament
+
+from conftest import player_rows
+
+
+@pytest.fixture(params=["numpy", "python"])
+def scan_path(request, monkeypatch):
+    """Run a test with the NumPy scans of the archive (when installed), then with memoryviews."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(archive_module, "np", None)
+    return request.param
+
+
+def make_tournament(name, year, number_of_rounds, rounds):
+    """Return a tournament with the given rounds, each a list of (player1, score1, player2, score2)."""
+    tournament = Tournament(name, "Paris", date(year, 1, 1), date(year, 1, 2), number_of_rounds)
+    for number, matches in enumerate(rounds, 1):
+        round = Round(f"Tour {number}")
+        round.matches = [Match(*match) for match in matches]
+        tournament.add_round(round)
+    return tournament
+
+
+def play_tournament(controller, name, ids):
+    """Create a one-round tournament with the given players and enter its results."""
+    index = controller.create_tournament(name, "Paris", date(2024, 1, 1), date(2024, 1, 1), 1, "", ids)
+    controller.pair_round(index)
+    assert controller.enter_results(index, ["1-0", "0-1"]) is not None
+    return index
+
+
+def test_archive_follows_the_sqlite_storage(tmp_path, monkeypatch, view):
+    monkeypatch.chdir(tmp_path)  # The archive is written in the current directory
+    controller = Controller(view, SqliteStorage(str(tmp_path / "data.db")))
+    controller.import_players(player_rows(4))
+    ids = [row["national_id"] for row in player_rows(4)]
+    controller.create_tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2), 3, "", ids)  # Not completed
+    play_tournament(controller, "Blitz", ids)
+
+    archive = controller.open_archive()
+    assert [game[0] for game in archive.games_of(ids[0])] == [1]
+    archive.close()
+
+    play_tournament(controller, "Rapide", ids)
+    report = player_games_report(controller.player_registry.get(ids[0]), controller.open_archive,
+                                 controller.tournaments_data, controller.player_registry)
+    assert [row[0] for row in report.rows()] == ["Blitz", "Rapide"]
+    controller.close()
+
+
+def test_archive_of_a_snapshot_holds_only_the_players_of_its_games(tmp_path, monkeypatch, json_controller):
+    monkeypatch.chdir(tmp_path)  # The archive is written in the current directory
+    controller = json_controller()
+    controller.import_players(player_rows(10))
+    ids = [row["national_id"] for row in player_rows(10)]
+    play_tournament(controller, "Blitz", ids[2:6])
+    controller.close()
+    controller = json_controller()
+    controller.storage.save_snapshot()
+    controller.close()
+
+    controller = json_controller()
+    assert controller.storage.snapshot is not None
+    assert len(controller.tournaments_data[0].rounds[0].matches.players) == 10  # The whole registry
+    archive = controller.open_archive()
+    try:
+        assert sorted(archive.players) == ids[2:6]
+        assert [game[2] for game in archive.games_of(ids[2])] == [ids[4]]
+    finally:
+        archive.close()
+        controller.close()
+
+
+def test_interrupted_build_leaves_no_manifest(tmp_path, monkeypatch):
+    a, b = (Player(f"Nom{number}", "Prenom", date(1990, 1, 1), f"FR{number}") for number in range(2))
+    tournaments = [make_tournament("Rapide", 2024, 1, [[(a, 1, b, 0)]])]
+    build_archive(tournaments, ["test"], str(tmp_path)).close()
+
+    def crash(source, destination):
+        raise OSError("crash")
+
+    monkeypatch.setattr(archive_module.os, "replace", crash)
+    with pytest.raises(OSError):
+        build_archive(tournaments * 2, ["other"], str(tmp_path))
+    monkeypatch.undo()
+    assert not os.path.exists(tmp_path / "manifest.json")  # Rebuilt rather than read against other columns
+    with pytest.raises(FileNotFoundError):
+        MatchArchive(str(tmp_path))
+
+
+def test_games_of_and_score_distribution(tmp_path, scan_path):
+    a, b, c = (Player(f"Nom{number}", "Prenom", date(1990, 1, 1), f"FR{number}") for number in range(3))
+    tournaments = [
+        make_tournament("Open", 2023, 2, [[(a, 1, b, 0), (c, 1, None, 0)], [(c, 0.5, a, 0.5), (b, 1, None, 0)]]),
+        make_tournament("Blitz", 2024, 2, [[(b, 1, a, 0)]]),  # Not completed: left out
+        make_tournament("Rapide", 2024, 1, [[(b, 0.5, c, 0.5), (a, 1, None, 0)]]),
+    ]
+    archive = build_archive(tournaments, ["test"], str(tmp_path))
+    try:
+        assert [entry[0] for entry in archive.tournaments] == [0, 2]
+        assert archive.rows == 9  # Two rows per game, one per bye
+        assert archive.games_of("FR0") == [(0, 1, "FR1", 1.0), (0, 2, "FR2", 0.5), (2, 1, None, 1.0)]
+        assert archive.games_of("FR9") == []
+        assert archive.score_distribution() == {0.0: 1, 0.5: 4, 1.0: 4}
+        assert archive.score_distribution(2024) == {0.5: 2, 1.0: 1}
+        assert not archive.is_stale(["test"]) and archive.is_stale(["other"]) and archive.is_stale(None)
+    finally:
+        archive.close()
@@ -0,0 +1,97 @@
+import os
+from datetime import date
+
+from controller import Controller
+from controllers.binary_snapshot import file_stamp
+from controllers.storage import JOURNAL_COMPACTION_THRESHOLD, JsonStorage
+
+from conftest import archive_state, build_archive, json_paths, player_rows
+
+
+def open_controller(directory, view):
+    return Controller(view, JsonStorage(*json_paths(directory)))
+
+
+def test_round_trip(tmp_path, view, answers):
+    controller = open_controller(tmp_path, view)
+    build_archive(controller, answers)
+    expected = archive_state(controller)
+    controller.storage.save_snapshot()
+    controller.handle_choice_7()
+
+    controller = open_controller(tmp_path, view)
+    assert controller.storage.snapshot is not None
+    assert archive_state(controller) == expected
+
+
+def test_restored_players_start_unchanged(tmp_path, view, answers):
+    controller = open_controller(tmp_path, view)
+    build_archive(controller, answers)
+    controller.storage.save_snapshot()
+    controller.handle_choice_7()
+
+    controller = open_controller(tmp_path, view)
+    assert controller.storage.snapshot is not None
+    assert [player.version for player in controller.players_data] == [0, 0, 0]  # Restoring is not a change
+    player = controller.player_registry.get("FR2")
+    assert (player.last_name, player.birth_date, player.total_points, player.rating_deviation) == (
+        "Durand", date(1985, 5, 4), 0, None)
+    player.rating = 1600
+    assert player.version == 1
+
+
+def test_journal_replayed_on_the_snapshot(tmp_path, view, answers):
+    controller = open_controller(tmp_path, view)
+    build_archive(controller, answers)
+    controller.storage.save_snapshot()
+    controller.handle_choice_7()
+
+    controller = open_controller(tmp_path, view)
+    assert controller.storage.snapshot is not None
+    controller.add_player("Petit", "Louis", date(1999, 9, 9), "FR4")
+    controller.add_round_to_tournament(0, "Tour 3")
+    expected = archive_state(controller)
+    controller.storage.flush()
+
+    reloaded = open_controller(tmp_path, view)
+    assert reloaded.storage.snapshot is not None
+    assert archive_state(reloaded) == expected
+
+
+def test_out_of_date_snapshot_ignored(tmp_path, view, answers):
+    controller = open_controller(tmp_path, view)
+    build_archive(controller, answers)
+    expected = archive_state(controller)
+    controller.storage.save_snapshot()
+    controller.handle_choice_7()
+
+    players_path = json_paths(tmp_path)[0]
+    with open(players_path, "a") as file:
+        file.write("\n")  # Changed after the snapshot was written
+    assert os.path.exists(json_paths(tmp_path)[4])
+
+    controller = open_controller(tmp_path, view)
+    assert controller.storage.snapshot is None
+    assert archive_state(controller) == expected
+
+
+def test_closing_writes_no_snapshot(tmp_path, view, answers):
+    controller = open_controller(tmp_path, view)
+    build_archive(controller, answers)
+    controller.handle_choice_7()
+    assert not os.path.exists(json_paths(tmp_path)[4])
+
+    stamps = [file_stamp(path) for path in json_paths(tmp_path)]
+    open_controller(tmp_path, view).handle_choice_7()  # Nothing changed during the session
+    assert [file_stamp(path) for path in json_paths(tmp_path)] == stamps
+
+
+def test_snapshot_written_once_enough_changes_are_folded(tmp_path, view):
+    controller = open_controller(tmp_path, view)
+    for row in player_rows(JOURNAL_COMPACTION_THRESHOLD):
+        controller.add_player(row["last_name"], row["first_name"], row["birth_date"], row["national_id"])
+    controller.storage.flush()
+    assert os.path.exists(json_paths(tmp_path)[4])
+    controller.handle_choice_7()
+
+    assert len(open_controller(tmp_path, view).storage.snapshot.players) == JOURNAL_COMPACTION_THRESHOLD
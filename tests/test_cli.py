@@ -0,0 +1,106 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+import cli
+
+from conftest import player_rows
+
+IDS = [row["national_id"] for row in player_rows(4)]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """A working directory holding a players file, where the command line keeps its data files."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "players.json").write_text(json.dumps(player_rows(4)), encoding="utf-8")
+    return tmp_path
+
+
+def create_open(rounds=3):
+    return cli.main(["create-tournament", "Open", "--location", "Paris", "--start", "2024-07-01",
+                     "--end", "2024-07-02", "--rounds", str(rounds), "--players", *IDS])
+
+
+def test_a_tournament_from_the_command_line(workdir, capsys):
+    (workdir / "results.txt").write_text("# Tour 1\n1 1-0\n2 1/2-1/2\n", encoding="utf-8")
+    assert cli.main(["import-players", "players.json"]) == 0
+    assert create_open() == 0
+    assert cli.main(["pair-round", "Open"]) == 0
+    assert cli.main(["enter-results", "1", "results.txt"]) == 0
+    assert cli.main(["export-standings", "Open", "classement.csv"]) == 0
+    output = capsys.readouterr().out
+    assert "4 joueurs ajoutés, 0 rejetés." in output
+    assert "Tournoi 1 créé : Open" in output
+    assert "Résultats du tour Tour 1 enregistrés." in output
+    assert len((workdir / "classement.csv").read_text(encoding="utf-8").splitlines()) == 5
+
+
+def test_commands_only_append_to_the_journal(workdir):
+    assert cli.main(["import-players", "players.json"]) == 0
+    assert create_open() == 0
+    assert cli.main(["pair-round", "Open"]) == 0
+    assert not (workdir / "data_players.json").exists()  # Closing the storage did not fold the journal
+    with open(workdir / "data_journal.jsonl", encoding="utf-8") as file:
+        assert [json.loads(line)["op"] for line in file] == ["add_players", "add_tournament", "add_round"]
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["pair-round", "Inconnu"], "Tournoi introuvable : Inconnu"),
+    (["pair-round", "2"], "Tournoi introuvable : 2"),
+    (["enter-results", "Open", "results.txt"], "Aucun tour n'attend de résultats."),
+    (["enter-results", "Open", "absent.txt"], "Lecture impossible"),
+    (["export-standings", "Inconnu", "classement.csv"], "Tournoi introuvable : Inconnu"),
+    (["import-players", "absent.json"], "Import impossible"),
+])
+def test_failures_exit_with_status_1(workdir, capsys, argv, message):
+    (workdir / "results.txt").write_text("1-0\n1-0\n", encoding="utf-8")
+    assert cli.main(["import-players", "players.json"]) == 0
+    assert create_open() == 0
+    capsys.readouterr()
+    assert cli.main(argv) == 1
+    assert message in capsys.readouterr().out
+
+
+def test_unknown_players_exit_with_status_1(workdir, capsys):
+    assert create_open() == 1
+    assert "Joueurs non trouvés" in capsys.readouterr().out
+
+
+def test_invalid_results_are_not_recorded(workdir, capsys):
+    (workdir / "results.txt").write_text("1-0\n2 gagné\n", encoding="utf-8")
+    assert cli.main(["import-players", "players.json"]) == 0
+    assert create_open() == 0
+    assert cli.main(["pair-round", "Open"]) == 0
+    assert cli.main(["enter-results", "Open", "results.txt"]) == 1
+    assert "Ligne 2 : résultat invalide '2 gagné'" in capsys.readouterr().out
+    assert cli.main(["pair-round", "Open"]) == 1  # The round still waits for its results
+    assert "Le tour Tour 1 attend ses résultats." in capsys.readouterr().out
+
+
+def test_played_tournament_cannot_be_paired(workdir, capsys, monkeypatch):
+    assert cli.main(["import-players", "players.json"]) == 0
+    assert create_open(rounds=1) == 0
+    assert cli.main(["pair-round", "Open"]) == 0
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1-0\n"))
+    assert cli.main(["enter-results", "Open", "-"]) == 1
+    assert "Résultats manquants pour les échiquiers 2." in capsys.readouterr().out
+    monkeypatch.setattr(sys, "stdin", io.StringIO("1-0\n0-1\n"))
+    assert cli.main(["enter-results", "Open", "-"]) == 0
+    assert cli.main(["pair-round", "Open"]) == 1
+    assert "Tous les tours du tournoi ont été joués." in capsys.readouterr().out
+
+
+def test_invalid_arguments_exit_with_status_2(workdir):
+    with pytest.raises(SystemExit) as error:
+        cli.main(["create-tournament", "Open", "--location", "Paris", "--start", "01/07/2024", "--end", "2024-07-02"])
+    assert error.value.code == 2
+
+
+def test_exit_status_of_the_script(workdir):
+    script = [sys.executable, str(cli.__file__)]
+    assert subprocess.run(script + ["import-players", "players.json"], capture_output=True).returncode == 0
+    assert subprocess.run(script + ["pair-round", "Open"], capture_output=True).returncode == 1
@@ -0,0 +1,51 @@
+from datetime import date
+
+import pytest
+
+from controllers.executor import run_tournaments, simulate_parallel
+from models.player import Player
+from models.player_registry import PlayerRegistry
+from models.tournament import Tournament
+
+
+def make_tournaments():
+    """Return a registry of 8 players and two tournaments sharing half of them."""
+    registry = PlayerRegistry([Player(f"Nom{number}", "Prenom", date(1990, 1, 1), f"FR{number}",
+                                      rating=1400 + 50 * number) for number in range(8)])
+    tournaments = []
+    for name, players in (("Open", registry.players[:6]), ("Blitz", registry.players[2:])):
+        tournament = Tournament(name, "Paris", date(2024, 1, 1), date(2024, 1, 2), 3)
+        for player in players:
+            tournament.add_player(player)
+        tournaments.append(tournament)
+    return registry, tournaments
+
+
+def outcome(registry, played):
+    """Return the games of the played tournaments and the points and ratings of the players."""
+    games = [[(match.player1.national_id, match.score1, match.player2.national_id if match.player2 else None,
+               match.score2) for round in tournament.rounds for match in round.matches] for tournament in played]
+    return games, [(player.total_points, round(player.rating, 6)) for player in registry]
+
+
+def test_parallel_runs_merge_like_a_sequential_run():
+    registry, tournaments = make_tournaments()
+    sequential = outcome(registry, run_tournaments(tournaments, registry, max_workers=1, seed=5))
+    registry, tournaments = make_tournaments()
+    played = run_tournaments(tournaments, registry, max_workers=2, seed=5)
+    assert outcome(registry, played) == sequential
+
+    assert all(len(tournament.rounds) == 3 for tournament in played)
+    assert all(player is registry.get(player.national_id) for tournament in played for player in tournament.players)
+    # Players of both tournaments add up the points of both
+    for player in registry.players[2:6]:
+        assert player.total_points == sum(tournament.player_points[player.national_id] for tournament in played)
+
+
+def test_parallel_simulation_is_reproducible():
+    np = pytest.importorskip("numpy")
+    ratings = [2000, 1800, 1600, 1400, 1200]
+    first = simulate_parallel(ratings, 4, simulations=3001, seed=9, max_workers=3)
+    second = simulate_parallel(ratings, 4, simulations=3001, seed=9, max_workers=3)
+    assert first.simulations == 3001 and first.wins.sum() == 3001
+    assert np.array_equal(first.wins, second.wins) and np.array_equal(first.points, second.points)
@@ -0,0 +1,35 @@
+from datetime import date
+
+from models.match import Match
+from models.player import Player
+from models.round import Round
+from models.tournament import Tournament
+
+
+def make_round(name, matches):
+    round = Round(name)
+    round.matches = [Match(*match) for match in matches]
+    return round
+
+
+def test_history_follows_added_and_reassigned_rounds():
+    a, b, c = (Player(f"Nom{number}", "Prenom", date(1990, 1, 1), f"FR{number}") for number in range(3))
+    tournament = Tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2), 3)
+    history = tournament.history  # Built before the first round, then updated by add_round()
+
+    tournament.add_round(make_round("Tour 1", [(a, 1, b, 0), (c, 1, None, 0)]))
+    tournament.add_round(make_round("Tour 2", [(c, 0.5, a, 0.5), (b, 1, None, 0)]))
+    assert tournament.history is history
+    assert history.has_played("FR0", "FR1") and history.has_played("FR2", "FR0")
+    assert not history.has_played("FR1", "FR2")
+    assert [history.colour_sequence(national_id) for national_id in ("FR0", "FR1", "FR2")] == ["WB", "B", "W"]
+    assert history.had_bye("FR2") and history.had_bye("FR1") and not history.had_bye("FR0")
+    # FR2 (1 point) met FR0 (1 point) in round 2: no float; FR1 floated down with its bye
+    assert [history.float_sequence(national_id) for national_id in ("FR0", "FR1", "FR2")] == ["--", "-D", "D-"]
+    assert history.scores == {"FR0": 1.5, "FR1": 1, "FR2": 1.5}
+
+    tournament.rounds = tournament.rounds[:1]  # Reassigning the rounds rebuilds the history
+    rebuilt = tournament.history
+    assert rebuilt is not history
+    assert not rebuilt.has_played("FR2", "FR0") and not rebuilt.had_bye("FR1")
+    assert rebuilt.rounds_count == 1 and rebuilt.scores == {"FR0": 1, "FR1": 0, "FR2": 1}
@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+import sys
+from datetime import date
+
+import controllers.storage as storage_module
+from controller import Controller
+from controllers.journal import Journal
+from controllers.storage import JsonStorage
+from view import MenuView
+
+from conftest import archive_state, build_archive, json_paths, player_rows
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pairs one more round, then dies while the journal is folded: after the tournaments file was
+# replaced, before the players file and the removal of the journal.
+CRASH_DURING_COMPACTION = """
+import io, os, sys
+from controller import Controller
+from controllers.storage import JsonStorage
+from view import MenuView, TerminalWriter
+
+controller = Controller(MenuView(TerminalWriter(io.StringIO())), JsonStorage(*sys.argv[1:]))
+controller.pair_round(0, "Extra")
+controller.storage.save_players = lambda *args: os._exit(0)
+controller.storage.compact()
+controller.close()
+os._exit(1)
+"""
+
+
+def test_truncated_last_record_is_ignored(tmp_path):
+    journal = Journal(str(tmp_path / "journal.jsonl"))
+    journal.append("add_player", {"player": {"national_id": "FR1"}})
+    with open(journal.path, "a", encoding="utf-8") as file:
+        file.write('{"op": "add_pla')  # Interrupted write
+    assert [record["op"] for record in journal.replay()] == ["add_player"]
+    assert Journal(journal.path).size == 1
+    journal.clear()
+    assert list(journal.replay()) == [] and journal.size == 0
+
+
+def test_mutations_are_appended_and_replayed(tmp_path, answers):
+    controller = Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))
+    build_archive(controller, answers)
+    controller.storage.flush()
+    assert not (tmp_path / "data_players.json").exists()  # Nothing was rewritten
+    with open(tmp_path / "data_journal.jsonl", encoding="utf-8") as file:
+        assert [json.loads(line)["op"] for line in file] == [
+            "add_player", "add_player", "add_player", "add_tournament", "add_round", "replace_tournament", "add_round"
+        ]
+    assert archive_state(Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))) == archive_state(controller)
+
+
+def test_journal_is_folded_into_the_json_files(tmp_path, answers, monkeypatch):
+    monkeypatch.setattr(storage_module, "JOURNAL_COMPACTION_THRESHOLD", 3)
+    controller = Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))
+    build_archive(controller, answers)
+    controller.storage.flush()
+    assert controller.storage.unfolded == 1  # Folded at the third and sixth records
+    with open(tmp_path / "data_players.json", encoding="utf-8") as file:
+        assert len(json.load(file)["players_data"]) == 3
+
+    controller.handle_choice_7()
+    assert len(list(controller.storage.journal.replay())) == 1  # Closing does not fold the journal
+    assert archive_state(Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))) == archive_state(controller)
+
+
+def test_records_are_numbered_across_clears(tmp_path):
+    journal = Journal(str(tmp_path / "journal.jsonl"))
+    journal.extend([{"op": "add_player"}, {"op": "add_player"}])
+    journal.clear()
+    journal.extend([{"op": "add_player"}])
+    assert [record["seq"] for record in journal.replay()] == [3]
+    assert Journal(journal.path).last_seq == 3
+
+
+def test_crash_during_compaction_does_not_replay_folded_records(tmp_path, json_controller):
+    controller = json_controller()
+    controller.import_players(player_rows(4))
+    index = controller.create_tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2), 3, "",
+                                         [row["national_id"] for row in player_rows(4)])
+    controller.pair_round(index)
+    controller.enter_results(index, ["1-0", "0-1"])
+    controller.close()
+
+    paths = json_paths(tmp_path)
+    process = subprocess.run([sys.executable, "-c", CRASH_DURING_COMPACTION, *paths], cwd=ROOT,
+                             env=dict(os.environ, PYTHONPATH=ROOT))
+    assert process.returncode == 0
+    assert os.path.exists(paths[2])  # The journal outlived the new tournaments file
+
+    tournament = json_controller().tournaments_data[0]
+    assert [round.name for round in tournament.rounds] == ["Tour 1", "Extra"]
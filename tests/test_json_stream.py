@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from controller import Controller
+from controllers.json_stream import iter_array_items
+from controllers.storage import JsonStorage
+from view import MenuView
+
+from conftest import build_archive, json_paths
+
+DOCUMENT = {
+    "version": 2,
+    "skipped": {"items": [1, 2, {"nested": "]"}]},
+    "items": [
+        12345, -0.5, 'a "quoted" ] string', None, True, [],
+        {"name": "Open d'été", "rounds": [[1, 0.5, "FR1"], [2, 1e3, None]]},
+        67890
+    ],
+    "after": "ignored"
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+def test_items_split_across_chunks(tmp_path, chunk_size):
+    path = tmp_path / "document.json"
+    path.write_text(json.dumps(DOCUMENT, indent=4))
+    assert list(iter_array_items(str(path), "items", chunk_size)) == DOCUMENT["items"]
+    path.write_text(json.dumps(DOCUMENT["items"], separators=(",", ":")))
+    assert list(iter_array_items(str(path), None, chunk_size)) == DOCUMENT["items"]
+
+
+def test_missing_key_and_invalid_documents(tmp_path):
+    path = tmp_path / "document.json"
+    path.write_text(json.dumps(DOCUMENT))
+    assert list(iter_array_items(str(path), "unknown", 4)) == []
+
+    path.write_text('{"items": [1, 2')
+    with pytest.raises(ValueError):
+        list(iter_array_items(str(path), "items", 4))
+    path.write_text('[1, 2]')
+    with pytest.raises(ValueError):
+        list(iter_array_items(str(path), "items"))
+
+
+def test_iter_tournaments_streams_the_stored_ones(tmp_path, answers):
+    controller = Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))
+    build_archive(controller, answers)
+    controller.handle_choice_7()
+
+    controller = Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))
+    controller.tournaments_data[0].description = "Modifié"  # Opened: yielded in its current state
+    answers(["Lyon", "2024-03-01", "2024-03-01", "2", "", "FR1", "done", ""])
+    controller.add_tournament("Blitz")  # Only in the journal
+    tournaments = list(controller.iter_tournaments())
+    assert [tournament.name for tournament in tournaments] == ["Open", "Blitz"]
+    assert tournaments[0].description == "Modifié"
+    assert [len(tournament.rounds) for tournament in tournaments] == [2, 0]
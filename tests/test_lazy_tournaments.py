@@ -0,0 +1,70 @@
+import gc
+from datetime import date
+
+from controller import Controller
+from controllers.lazy_tournaments import LazyTournamentList, TournamentHeader
+from controllers.storage import JsonStorage
+from models.round import Round
+from models.tournament import Tournament
+from view import MenuView
+
+from conftest import build_archive, json_paths
+
+
+def lazy_list(count, cache_size=2):
+    """Return a LazyTournamentList of count tournaments and the list of the indices loaded, in order."""
+    loads = []
+
+    def loader(index, header):
+        loads.append(index)
+        return Tournament(header.name, header.location, header.start_date, header.end_date, header.number_of_rounds)
+
+    headers = [TournamentHeader(f"Tournoi {index}", "Paris", date(2024, 1, index + 1), date(2024, 1, index + 1), 3, 0)
+               for index in range(count)]
+    return LazyTournamentList(headers, loader, cache_size), loads
+
+
+def test_least_recently_used_tournaments_are_evicted():
+    tournaments, loads = lazy_list(4)
+    assert tournaments.header(3).name == "Tournoi 3" and loads == []  # Headers do not load anything
+    for index in (0, 1, 0, 2):
+        tournaments[index]
+    gc.collect()
+    assert loads == [0, 1, 2]
+    assert tournaments.loaded(1) is None  # Least recently used, and referenced by nothing else
+    assert tournaments.loaded(0) is not None and tournaments.loaded(2) is not None
+
+    first = tournaments[0]
+    tournaments[3], tournaments[1]  # Evict 2, then 0 from the cache
+    gc.collect()
+    assert tournaments.loaded(2) is None
+    assert tournaments[0] is first  # Still referenced: the same object, not loaded again
+    assert loads == [0, 1, 2, 3, 1]
+
+
+def test_pinned_tournaments_stay_in_memory_until_saved():
+    tournaments, loads = lazy_list(4)
+    tournaments[0].add_round(Round("Tour 1"))
+    tournaments.pin(0)
+    assert tournaments.header(0).rounds_count == 1  # Up to date with the tournament in memory
+    for index in (1, 2, 3):  # Evict 0 from the cache
+        tournaments[index]
+    gc.collect()
+    assert tournaments.loaded(0) is not None
+
+    tournaments.unpin_all()
+    gc.collect()
+    assert tournaments.loaded(0) is None
+    assert tournaments[0].rounds == [] and loads == [0, 1, 2, 3, 0]  # Reloaded from the storage
+
+
+def test_tournaments_are_decoded_when_opened(tmp_path, answers):
+    controller = Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))
+    build_archive(controller, answers)
+    controller.storage.compact()
+    controller.handle_choice_7()
+
+    tournaments = Controller(MenuView(), JsonStorage(*json_paths(tmp_path))).tournaments_data
+    assert tournaments.loaded(0) is None
+    assert tournaments.header(0).name == "Open" and tournaments.header(0).rounds_count == 2
+    assert [round.name for round in tournaments[0].rounds] == ["Tour 1", "Tour 2"]
@@ -0,0 +1,49 @@
+from datetime import date
+
+from controllers.storage import dict_to_round
+from models.match import Match
+from models.match_table import NO_PLAYER, MatchTable
+from models.player import Player
+from models.player_registry import PlayerRegistry
+from models.round import Round
+
+
+def make_players(count):
+    return [Player(f"Nom{number}", "Prenom", date(1990, 1, 1), f"FR{number}") for number in range(count)]
+
+
+def test_views_read_and_write_the_columns():
+    a, b, c = make_players(3)
+    table = MatchTable.from_matches([Match(a, 1, b, 0), Match(b, 0.5, c, 0.5), Match(c, 1, None, 0)])
+    assert len(table) == 3 and table.players == [a, b, c]  # Each player is stored once
+    assert list(table.player2) == [1, 2, NO_PLAYER]
+
+    first, _, bye = table
+    assert (first.player1, first.score1, first.player2, first.score2) == (a, 1, b, 0)
+    assert isinstance(first.score1, int) and table[1].score2 == 0.5  # Scores read back as entered
+    assert bye.player2 is None and table[-1].player1 is c
+    assert [match.player1 for match in table[1:]] == [b, c]
+
+    version = table.version
+    first.score1, first.score2 = 0, 1
+    table[2] = Match(a, 1, None, 0)
+    assert table.version == version + 3
+    assert (list(table.score1), list(table.score2)) == ([0, 0.5, 1], [1, 0.5, 0])
+    assert table[2].player1 is a and len(table.players) == 3
+
+
+def test_round_trip_through_to_dict():
+    players = make_players(5)
+    round = Round("Tour 1")
+    round.matches = [Match(players[0], 1, players[1], 0), Match(players[2], 0.5, players[3], 0.5),
+                     Match(players[4], 1, None, 0)]
+    version = round.version
+    round.matches[0].score2 = 0.5
+    assert round.version == version + 1  # A change of a match changes the version of its round
+    assert round.to_dict()["matches"][0]["score2"] == 0.5
+
+    registry = PlayerRegistry(players)
+    decoded = dict_to_round(round.to_dict(), registry)
+    assert isinstance(decoded.matches, MatchTable)
+    assert decoded.to_dict() == round.to_dict()
+    assert [match.player1 for match in decoded.matches] == [players[0], players[2], players[4]]
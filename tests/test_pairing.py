@@ -0,0 +1,129 @@
+import random
+from datetime import date
+
+import pytest
+
+from controllers.matchmaking import Matchmaking
+from controllers.pairing import MAX_COLOUR_DIFFERENCE, SwissPairing
+from models.player import Player
+from models.standings import Standings
+from models.tournament import Tournament
+
+
+class RecordingPairing(SwissPairing):
+    """A SwissPairing recording, for each round, the standings it was given and a fresh build of them."""
+
+    def __init__(self):
+        self.rankings = []
+
+    def pair(self, players, tournament=None, standings=None):
+        self.rankings.append((list(standings), list(self.standings(players))))
+        return super().pair(players, tournament, standings)
+
+
+def make_tournament(count, rounds):
+    tournament = Tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2), rounds)
+    for number in range(count):
+        tournament.add_player(Player(f"Nom{number}", f"Prenom{number}", date(1990, 1, 1), f"FR{number:05d}",
+                                     rating=1500 + (number * 37) % 400))
+    return tournament
+
+
+@pytest.mark.parametrize("count, rounds", [(8, 3), (21, 5), (64, 6)])
+def test_swiss_tournament_has_no_rematch_and_no_repeated_bye(view, count, rounds):
+    random.seed(count)
+    tournament = make_tournament(count, rounds)
+    Matchmaking(view).run_tournament(tournament)
+
+    pairs, byes = set(), []
+    for round in tournament.rounds:
+        seen = set()
+        for match in round.matches:
+            if match.player2 is None:
+                byes.append(match.player1.national_id)
+                seen.add(match.player1.national_id)
+                continue
+            pair = frozenset((match.player1.national_id, match.player2.national_id))
+            assert pair not in pairs
+            pairs.add(pair)
+            seen.update(pair)
+        assert len(seen) == count  # Every player is paired exactly once
+    assert len(byes) == len(set(byes)) == (rounds if count % 2 else 0)
+
+
+@pytest.mark.parametrize("count, rounds", [(64, 6), (101, 9), (501, 9)])
+def test_colours_stay_balanced_across_rounds(view, count, rounds):
+    random.seed(count)
+    tournament = make_tournament(count, rounds)
+    Matchmaking(view).run_tournament(tournament)
+
+    colours = {}
+    for round in tournament.rounds:
+        for match in round.matches:
+            if match.player2 is not None:
+                colours[match.player1.national_id] = colours.get(match.player1.national_id, "") + "W"
+                colours[match.player2.national_id] = colours.get(match.player2.national_id, "") + "B"
+        for sequence in colours.values():
+            assert abs(sequence.count("W") - sequence.count("B")) <= MAX_COLOUR_DIFFERENCE, sequence
+            assert "WWW" not in sequence and "BBB" not in sequence, sequence
+
+
+def test_pairing_standings_are_kept_up_to_date(view):
+    random.seed(3)
+    tournament = make_tournament(31, 5)
+    pairing = RecordingPairing()
+    Matchmaking(view, pairing).run_tournament(tournament)
+    assert len(pairing.rankings) == 5
+    for kept, rebuilt in pairing.rankings:
+        assert kept == rebuilt
+
+
+def test_final_roster_is_ranked_by_points(view):
+    random.seed(1)
+    tournament = make_tournament(21, 5)
+    Matchmaking(view).run_tournament(tournament)
+    points = [player.tournament_points for player in tournament.players]
+    assert points == sorted(points, reverse=True)
+
+
+def test_standings_follow_score_changes():
+    random.seed(5)
+    players = make_tournament(50, 1).players
+    scores = {player.national_id: random.choice([0, 0.5, 1, 1.5, 2]) for player in players}
+    standings = Standings(players, scores)
+    for player in random.sample(players, 20):
+        scores[player.national_id] += random.choice([0, 0.5, 1])
+        standings.set_score(player, scores[player.national_id])
+
+    expected = sorted(players, key=lambda player: (-scores[player.national_id], players.index(player)))
+    assert list(standings) == expected
+    assert standings.top(3) == expected[:3]
+    assert [standings.rank(player) for player in expected] == list(range(1, 51))
+    assert [score for score, _ in standings.score_groups()] == sorted(set(scores.values()), reverse=True)
+
+
+def test_standings_built_in_bulk_match_insertions():
+    random.seed(5)
+    players = make_tournament(50, 1).players
+    scores = {player.national_id: random.choice([0, 0.5, 1, 1.5, 2]) for player in players}
+    bulk = Standings(players, scores, tiebreaks=lambda player: (player.rating,))
+    inserted = Standings(players, {}, tiebreaks=lambda player: (player.rating,))
+    for player in players:
+        inserted.set_score(player, scores[player.national_id])
+    assert list(bulk) == list(inserted)
+    assert [score for score, _ in bulk.score_groups()] == [2, 1.5, 1, 0.5, 0]
+
+
+@pytest.mark.parametrize("moved", [3, 40])  # One at a time, then in bulk
+def test_set_scores_matches_a_fresh_build(moved):
+    random.seed(moved)
+    players = make_tournament(50, 1).players
+    scores = {player.national_id: random.choice([0, 1, 2]) for player in players}
+    standings = Standings(players, scores, tiebreaks=lambda player: (player.rating,))
+    changes = []
+    for player in random.sample(players, moved):
+        player.rating += random.choice([-30, 30])
+        scores[player.national_id] += random.choice([0, 0.5, 1])
+        changes.append((player, scores[player.national_id]))
+    standings.set_scores(changes)
+    assert list(standings) == list(Standings(players, scores, tiebreaks=lambda player: (player.rating,)))
@@ -0,0 +1,97 @@
+import csv
+import json
+from datetime import date
+
+import pytest
+
+from controller import Controller
+from controllers.player_import import IMPORT_BATCH_SIZE, iter_player_rows, register_players
+from controllers.sqlite_storage import SqliteStorage
+from models.player import DEFAULT_RATING, Player
+from models.player_registry import PlayerRegistry
+from conftest import player_rows
+
+
+def test_invalid_and_duplicate_rows_are_rejected(tmp_path):
+    registry = PlayerRegistry([Player("Dupont", "Jean", date(1980, 5, 4), "FR00002")])
+    rows = player_rows(4)
+    rows[1]["first_name"] = " "
+    rows[3]["birth_date"] = "31/02/1990"
+    rows += [
+        dict(player_rows(1)[0], last_name="Doublon"),
+        dict(player_rows(5)[4], birth_date="01/01/2999"),
+        dict(player_rows(6)[5], rating="fort"),
+        dict(player_rows(7)[6], birth_date="15/03/1991", rating=""),
+        "pas un joueur",
+    ]
+    result = register_players(rows, registry, batch_size=3)  # Duplicates span two batches
+
+    assert [player.national_id for player in result.added] == ["FR00000", "FR00006"]
+    assert result.added[1].birth_date == date(1991, 3, 15)
+    assert result.added[1].rating == DEFAULT_RATING
+    assert registry.get("FR00006") is result.added[1]
+    assert result.rejects == [
+        (2, "FR00001", "champ first_name manquant"),
+        (3, "FR00002", "identifiant déjà enregistré"),
+        (4, "FR00003", "date de naissance invalide : 31/02/1990"),
+        (5, "FR00000", "identifiant en double dans le fichier"),
+        (6, "FR00004", "date de naissance future : 01/01/2999"),
+        (7, "FR00005", "classement invalide : fort"),
+        (9, "", "ligne invalide"),
+    ]
+
+    path = tmp_path / "rejets.csv"
+    result.write_rejects(str(path))
+    with open(path, newline="", encoding="utf-8") as file:
+        lines = list(csv.reader(file))
+    assert lines[0] == ["enregistrement", "identifiant", "motif"]
+    assert lines[1:] == [[str(number), national_id, reason] for number, national_id, reason in result.rejects]
+
+
+def test_rows_are_read_from_csv_and_json_files(tmp_path):
+    csv_path = tmp_path / "joueurs.csv"
+    csv_path.write_text(
+        "last_name;first_name;birth_date;national_id\nDupont;Jean;04/05/1980;FR1\nDurand;;1990-01-01;FR2\n",
+        encoding="utf-8",
+    )
+    json_path = tmp_path / "joueurs.json"
+    json_path.write_text(
+        '{"players_data": [{"last_name": "Martin", "first_name": "Marie", "birth_date": "1985-02-03",'
+        ' "national_id": "FR3", "rating": 1850}]}',
+        encoding="utf-8",
+    )
+    registry = PlayerRegistry()
+
+    from_csv = register_players(iter_player_rows(str(csv_path)), registry)
+    from_json = register_players(iter_player_rows(str(json_path)), registry)
+
+    assert [player.national_id for player in from_csv.added] == ["FR1"]
+    assert from_csv.rejects == [(2, "FR2", "champ first_name manquant")]
+    assert [(player.national_id, player.rating) for player in from_json.added] == [("FR3", 1850)]
+    assert len(registry) == 2
+
+
+def test_error_partway_through_the_rows_registers_nothing():
+    registry = PlayerRegistry([Player("Dupont", "Jean", date(1980, 5, 4), "FR10000")])
+
+    def rows():
+        yield from player_rows(5)
+        raise ValueError("fichier tronqué")
+
+    with pytest.raises(ValueError):
+        register_players(rows(), registry, batch_size=2)  # Two batches were validated before the error
+    assert [player.national_id for player in registry] == ["FR10000"]
+    assert "FR00000" not in registry
+
+
+def test_failed_import_is_not_saved_later(tmp_path, view):
+    path = tmp_path / "joueurs.json"
+    rows = player_rows(IMPORT_BATCH_SIZE + 1)  # The first batch is validated before the error
+    path.write_text(json.dumps(rows)[:-1] + ', {"last_name": ', encoding="utf-8")  # Truncated
+    controller = Controller(view, SqliteStorage(str(tmp_path / "data.db")))
+    with pytest.raises(ValueError):
+        controller.import_players(iter_player_rows(str(path)))
+    controller.refresh_json_files()  # A full save of everything in memory
+    controller.close()
+
+    assert Controller(view, SqliteStorage(str(tmp_path / "data.db"))).players_data == []
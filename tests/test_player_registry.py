@@ -0,0 +1,89 @@
+from datetime import date
+
+import pytest
+
+from controller import Controller
+from controllers.storage import JsonStorage, dict_to_tournament
+from models.player import Player
+from models.player_registry import PlayerRegistry
+from view import MenuView
+
+from conftest import build_archive, json_paths
+
+
+def make_player(national_id, last_name="Nom", first_name="Prenom"):
+    return Player(last_name, first_name, date(1990, 1, 1), national_id)
+
+
+def test_lookups_by_national_id_and_name():
+    dupont, durand = make_player("FR1", "Dupont", "Jean"), make_player("FR2", "Durand", "Jean")
+    registry = PlayerRegistry([dupont, durand])
+    martin = make_player("FR3", "Dupont", "Marie")
+    registry.add(martin)
+
+    assert registry.get("FR2") is durand
+    assert registry.get("FR9") is None
+    assert "FR3" in registry and "FR9" not in registry
+    assert registry.find_by_last_name("DUPONT") == [dupont, martin]
+    assert registry.find_by_name("jean", "dupont") == [dupont]
+    assert registry.players == [dupont, durand, martin]
+
+
+def test_duplicate_national_ids():
+    first, second = make_player("FR1", "Premier"), make_player("FR1", "Second")
+    registry = PlayerRegistry([first, second])
+    assert registry.get("FR1") is first  # The first registration wins, as with a linear scan
+    with pytest.raises(ValueError):
+        registry.add(make_player("FR1"))
+    assert len(registry) == 2
+
+
+def test_controller_refuses_a_known_national_id(tmp_path):
+    controller = Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))
+    controller.add_player("Dupont", "Jean", date(1990, 1, 1), "FR1")
+    controller.add_player("Durand", "Marie", date(1985, 5, 4), "FR1")
+    assert [player.last_name for player in controller.players_data] == ["Dupont"]
+    assert controller.player_registry.get("FR1") is controller.players_data[0]
+
+
+def test_intern_shares_one_player_per_national_id():
+    dupont = make_player("FR1", "Dupont")
+    registry = PlayerRegistry([dupont])
+    assert registry.intern(make_player("FR1", "Autre").to_dict()) is dupont  # The registered player wins
+
+    data = make_player("FR2", "Durand").to_dict()
+    durand = registry.intern(data)
+    assert registry.get("FR2") is durand and durand.last_name == "Durand"
+    assert registry.intern(dict(data)) is durand
+
+
+def test_loaded_tournaments_share_the_registered_players():
+    players = [make_player(f"FR{number}", f"Nom{number}") for number in range(3)]
+    record = {
+        "name": "Open", "location": "Paris", "start_date": "2024-01-01", "end_date": "2024-01-02",
+        "number_of_rounds": 3, "description": "",
+        "players": [player.to_dict() for player in players],
+        "rounds": [{"name": "Tour 1", "start_datetime": "2024-01-01T10:00:00", "end_datetime": None, "matches": [
+            {"player1": players[0].to_dict(), "score1": 1, "player2": players[1].to_dict(), "score2": 0},
+            {"player1": players[2].to_dict(), "score1": 1, "player2": None, "score2": 0},
+        ]}]
+    }
+    registry = PlayerRegistry()
+    first, second = dict_to_tournament(record, registry), dict_to_tournament(record, registry)
+
+    assert len(registry) == 3
+    for tournament in (first, second):
+        assert all(player is registry.get(player.national_id) for player in tournament.players)
+        match = tournament.rounds[0].matches[0]
+        assert match.player1 is first.players[0] and match.player2 is first.players[1]
+
+
+def test_reloaded_tournaments_share_the_registered_players(tmp_path, answers):
+    controller = Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))
+    build_archive(controller, answers)
+    controller.storage.flush()
+    controller = Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))
+    tournament = controller.tournaments_data[0]
+    registry = controller.player_registry
+    assert all(player is registry.get(player.national_id) for player in tournament.players)
+    assert all(match.player1 is registry.get(match.player1.national_id) for match in tournament.rounds[0].matches)
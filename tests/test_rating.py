@@ -0,0 +1,69 @@
+from datetime import date
+
+import pytest
+
+from controllers import rating
+from controllers.rating import K_FACTOR, update_round_ratings
+from models.match import Match
+from models.player import Player
+from models.round import Round
+
+
+@pytest.fixture(params=["numpy", "python"])
+def rating_path(request, monkeypatch):
+    """Run a test with the NumPy path of the rating updates (when installed), then without NumPy."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(rating, "np", None)
+    return request.param
+
+
+def make_players(count, deviation=None):
+    return [Player(f"Nom{n}", f"Prenom{n}", date(1990, 1, 1), f"FR{n:05d}", rating=1500 + 50 * n,
+                   rating_deviation=deviation) for n in range(count)]
+
+
+def play(matches):
+    round = Round("Tour 1")
+    round.matches = matches
+    update_round_ratings(round)
+
+
+def test_elo_updates_of_a_round(rating_path):
+    weak, strong, equal, other, bye = make_players(5)
+    equal.rating = other.rating
+    play([Match(weak, 1, strong, 0), Match(equal, 0.5, other, 0.5), Match(bye, 1, None, 0)])
+    assert weak.rating - 1500 == pytest.approx(1550 - strong.rating)  # What one wins, the other loses
+    assert weak.rating - 1500 == pytest.approx(K_FACTOR * (1 - rating.expected_score(1500, 1550)))
+    assert equal.rating == other.rating == 1650  # A draw between equal ratings changes nothing
+    assert bye.rating == 1700  # Byes are not rated
+
+
+@pytest.mark.parametrize("deviation", [None, 200.0])  # Elo, then Glicko
+def test_player_listed_twice_gets_both_updates(rating_path, deviation):
+    twice, first, second = make_players(3, deviation)
+    alone = make_players(3, deviation)
+    play([Match(twice, 1, first, 0), Match(twice, 1, second, 0)])
+    play([Match(alone[0], 1, alone[1], 0)])
+    gain_first = alone[0].rating - 1500
+    single = make_players(3, deviation)
+    play([Match(single[0], 1, single[2], 0)])
+    gain_second = single[0].rating - 1500
+    assert twice.rating == pytest.approx(1500 + gain_first + gain_second)
+    if deviation is not None:
+        assert twice.rating_deviation < alone[0].rating_deviation
+
+
+def test_numpy_and_python_paths_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    results = []
+    for numpy in (rating.np, None):
+        monkeypatch.setattr(rating, "np", numpy)
+        players = make_players(6, 150.0) + make_players(6)
+        play([Match(players[i], [1, 0.5, 0][i % 3], players[i + 6], [0, 0.5, 1][i % 3]) for i in range(6)])
+        results.append([(player.rating, player.rating_deviation) for player in players])
+    for (rating_numpy, deviation_numpy), (rating_python, deviation_python) in zip(*results):
+        assert rating_numpy == pytest.approx(rating_python)
+        assert deviation_numpy == pytest.approx(deviation_python)
+    assert all(deviation < 150 for _, deviation in results[0][:6])  # Glicko deviations shrink with games
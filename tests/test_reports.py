@@ -0,0 +1,62 @@
+import csv
+from datetime import date
+
+from controllers.reports import format_score, standings_report
+from models.player import Player
+from models.sorted_index import SortedIndex
+from models.tournament import Tournament
+
+
+def test_scores_are_formatted_the_same_way():
+    assert [format_score(value) for value in (2, 2.0, 2.5, 0, 0.1 + 0.2)] == ["2", "2", "2.5", "0", "0.3"]
+
+
+def test_standings_report_formats_int_and_float_points_alike(tmp_path):
+    tournament = Tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2))
+    for number in range(3):
+        tournament.add_player(Player(f"Nom{number}", f"Prenom{number}", date(1990, 1, 1), f"FR{number}"))
+    tournament.player_points = {"FR0": 2, "FR1": 2.0, "FR2": 1.5}
+    report = standings_report(tournament)
+
+    lines = list(report.lines())
+    assert [line.split(" : ")[1] for line in lines] == ["2, 0, 0, 0", "2, 0, 0, 0", "1.5, 0, 0, 0"]
+    report.write_csv(str(tmp_path / "classement.csv"))
+    with open(tmp_path / "classement.csv", encoding="utf-8") as file:
+        assert [row[3] for row in csv.reader(file)] == ["points", "2", "2", "1.5"]
+
+
+def test_sorted_index_pages_follow_additions_and_changes():
+    players = [Player(name, "Prenom", date(1990, 1, 1), f"FR{number}", total_points=points)
+               for number, (name, points) in enumerate([("Martin", 3), ("Bernard", 1), ("Dubois", 3)])]
+    index = SortedIndex(lambda player: (-player.total_points, player.last_name), players,
+                        version=lambda player: player.version)
+    assert [player.last_name for player in index.page(0, 2)] == ["Dubois", "Martin"]
+
+    later = Player("Durand", "Prenom", date(1990, 1, 1), "FR3", total_points=3)
+    index.add(later)
+    index.add(later)  # Indexed once
+    players[1].total_points = 4
+    index.refresh()
+    assert len(index) == 4
+    assert [player.last_name for player in index.page(0, 2)] == ["Bernard", "Dubois"]
+    assert [player.last_name for player in index.page(2, 2)] == ["Durand", "Martin"]
+    assert index.page(4, 2) == []
+
+
+def test_pager_only_builds_the_pages_displayed(view):
+    consumed = []
+
+    def lines():
+        for number in range(1000):
+            consumed.append(number)
+            yield f"ligne {number}"
+
+    answers = iter(["", "q"])
+    view.prompt = lambda message: next(answers)
+    source = lines()
+    assert view.page("Rapport", source, page_size=20) is False
+    assert len(consumed) == 41  # Two pages, and the first line of the third to know there is one
+    assert next(source, None) is None  # The generator was closed when the user left
+    view.flush()
+    output = view.writer.stream.getvalue()
+    assert "ligne 39" in output and "ligne 40" not in output
@@ -0,0 +1,119 @@
+from datetime import date
+
+import pytest
+
+from controllers.results import ResultEntry, match_results, parse_results
+from models.match import Match
+from models.player import Player
+from models.round import Round
+
+from conftest import player_rows
+
+
+@pytest.fixture
+def round():
+    """A round of 5 players: boards 1 and 2 are games, board 3 is a bye."""
+    players = [Player(f"Nom{number}", f"Prenom{number}", date(1990, 1, 1), f"FR{number:05d}") for number in range(5)]
+    round = Round("Tour 1")
+    round.matches = [Match(players[0], 0, players[1], 0), Match(players[2], 0, players[3], 0),
+                     Match(players[4], 1, None, 0)]
+    return round
+
+
+def test_parse_results_forms():
+    entries, errors = parse_results(["1-0", "", "# Échiquier 2", "2 1/2-1/2", "FR00001, FR00000; -/+", "  \t"])
+    assert errors == []
+    assert [(entry.score1, entry.score2, entry.forfeit) for entry in entries] == [(1, 0, False), (0.5, 0.5, False),
+                                                                                  (0, 1, True)]
+    assert [(entry.board, entry.player_ids, entry.line) for entry in entries] == [
+        (None, None, 1), (2, None, 4), (None, ("FR00001", "FR00000"), 5)
+    ]
+
+
+@pytest.mark.parametrize("line, message", [
+    ("1 2-0", "Ligne 1 : résultat invalide '1 2-0'"),
+    ("1-0 0-1", "Ligne 1 : échiquier ou joueurs invalides '1-0 0-1'"),
+    ("gagné", "Ligne 1 : résultat invalide 'gagné'"),
+    ("un 1-0", "Ligne 1 : échiquier ou joueurs invalides 'un 1-0'"),
+    ("1 FR00000 FR00001 1-0", "Ligne 1 : échiquier ou joueurs invalides '1 FR00000 FR00001 1-0'"),
+])
+def test_parse_results_errors(line, message):
+    entries, errors = parse_results([line])
+    assert entries == []
+    assert errors == [message]
+
+
+def test_parse_results_collects_every_error():
+    entries, errors = parse_results(["1-0", "3-0", "=", "x y z w"])
+    assert len(entries) == 2
+    assert [error.split(" :")[0] for error in errors] == ["Ligne 2", "Ligne 4"]
+
+
+def test_match_results_in_board_order(round):
+    positions, errors = match_results(round, parse_results(["1-0", "="])[0])
+    assert errors == []
+    assert {position: (entry.score1, entry.score2) for position, entry in positions.items()} == {
+        0: (1, 0), 1: (0.5, 0.5)
+    }
+
+
+def test_match_results_swaps_reversed_players(round):
+    positions, errors = match_results(round, parse_results(["FR00001 FR00000 1-0", "FR00002 FR00003 -/+"])[0])
+    assert errors == []
+    assert (positions[0].score1, positions[0].score2, positions[0].player_ids) == (0, 1, ("FR00000", "FR00001"))
+    assert (positions[1].score1, positions[1].score2, positions[1].forfeit) == (0, 1, True)
+
+
+@pytest.mark.parametrize("lines, message", [
+    (["4 1-0", "1-0", "1-0"], "Ligne 1 : l'échiquier 4 n'existe pas."),
+    (["0 1-0", "1-0", "1-0"], "Ligne 1 : l'échiquier 0 n'existe pas."),
+    (["3 1-0", "1-0", "1-0"], "Ligne 1 : l'échiquier 3 est un exempt."),
+    (["FR00000 FR00002 1-0", "1-0", "1-0"], "Ligne 1 : FR00000 et FR00002 ne jouent pas ensemble."),
+    (["FR00004 FR00000 1-0", "1-0", "1-0"], "Ligne 1 : FR00004 et FR00000 ne jouent pas ensemble."),
+    (["1 1-0", "FR00001 FR00000 0-1"], "Ligne 2 : l'échiquier 1 a déjà un résultat."),
+    (["1-0", "1-0", "1-0"], "Ligne 3 : plus de résultats que de parties."),
+    (["2 1-0"], "Résultats manquants pour les échiquiers 1."),
+    ([], "Résultats manquants pour les échiquiers 1, 2."),
+])
+def test_match_results_errors(round, lines, message):
+    _, errors = match_results(round, parse_results(lines)[0])
+    assert errors == [message]
+
+
+def test_entries_without_line_numbers(round):
+    _, errors = match_results(round, [ResultEntry(1, 0, board=5)])
+    assert errors == ["Résultat : l'échiquier 5 n'existe pas."]
+
+
+def test_enter_results_rates_games_but_not_forfeits(json_controller):
+    controller = json_controller()
+    controller.import_players(player_rows(5))
+    ids = [row["national_id"] for row in player_rows(5)]
+    controller.create_tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2), 3, "", ids)
+    pending = controller.pair_round(0)
+    (white1, black1), (white2, black2) = [(match.player1, match.player2) for match in pending.matches][:2]
+    ratings = {player.national_id: player.rating for player in controller.players_data}
+
+    assert controller.enter_results(0, [f"{black1.national_id} {white1.national_id} 1-0", "2 -/+"]) is pending
+    tournament = controller.tournaments_data[0]
+    assert (pending.matches[0].score1, pending.matches[0].score2) == (0, 1)  # Black won: reversed in the file
+    assert tournament.player_points[black1.national_id] == 1
+    assert tournament.player_points[black2.national_id] == 1
+    assert white1.rating < ratings[white1.national_id] and black1.rating > ratings[black1.national_id]
+    assert (white2.rating, black2.rating) == (ratings[white2.national_id], ratings[black2.national_id])
+    controller.close()
+
+
+def test_enter_results_applies_nothing_on_errors(json_controller, view):
+    controller = json_controller()
+    controller.import_players(player_rows(4))
+    controller.create_tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2), 3, "",
+                                 [row["national_id"] for row in player_rows(4)])
+    pending = controller.pair_round(0)
+    assert controller.enter_results(0, ["1-0", "1-0", "1-0"]) is None
+    view.flush()
+    assert "plus de résultats que de parties" in view.writer.stream.getvalue()
+    assert [(match.score1, match.score2) for match in pending.matches] == [(0, 0), (0, 0)]
+    assert pending.end_datetime is None
+    assert controller.tournaments_data[0].player_points == {row["national_id"]: 0 for row in player_rows(4)}
+    controller.close()
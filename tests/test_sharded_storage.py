@@ -0,0 +1,92 @@
+import os
+from datetime import date
+
+import pytest
+
+from controller import Controller
+from controllers.sharded_storage import ShardedStorage
+
+from conftest import archive_state, build_archive, player_rows
+
+
+def test_round_trip(tmp_path, view, answers):
+    directory = str(tmp_path / "data")
+    controller = Controller(view, ShardedStorage(directory))
+    build_archive(controller, answers)
+    expected = archive_state(controller)
+    controller.storage.close()
+
+    controller = Controller(view, ShardedStorage(directory))
+    assert archive_state(controller) == expected
+    controller.storage.close()
+
+
+def test_round_trip_of_compressed_tournaments(tmp_path, view, answers):
+    directory = str(tmp_path / "data")
+    controller = Controller(view, ShardedStorage(directory))
+    build_archive(controller, answers)
+    controller.add_round_to_tournament(0, "Tour 3")  # All the planned rounds are played
+    controller.storage.close()
+
+    controller = Controller(view, ShardedStorage(directory))
+    assert controller.storage.compress_completed() == 1
+    expected = archive_state(controller)
+    controller.storage.close()
+
+    controller = Controller(view, ShardedStorage(directory))
+    assert controller.storage.files[0][0].endswith(".json.gz")
+    assert archive_state(controller) == expected
+    controller.storage.close()
+
+
+def test_corrupted_tournament_file(tmp_path, view, answers):
+    directory = str(tmp_path / "data")
+    controller = Controller(view, ShardedStorage(directory))
+    build_archive(controller, answers)
+    controller.storage.close()
+
+    storage = ShardedStorage(directory)
+    storage.load()
+    with open(os.path.join(directory, storage.files[0][0]), "ab") as file:
+        file.write(b" ")
+    with pytest.raises(ValueError):
+        storage.tournaments[0]
+    storage.close()
+
+
+def test_tournament_finished_in_the_session_is_compressed(tmp_path, view, answers):
+    directory = str(tmp_path / "data")
+    controller = Controller(view, ShardedStorage(directory))
+    build_archive(controller, answers)
+    controller.storage.close()
+
+    controller = Controller(view, ShardedStorage(directory))
+    controller.add_round_to_tournament(0, "Tour 3")  # The last round is played after the load
+    assert controller.storage.compress_completed() == 1
+    expected = archive_state(controller)
+    controller.storage.close()
+
+    controller = Controller(view, ShardedStorage(directory))
+    assert controller.storage.files[0][0].endswith(".json.gz")
+    assert archive_state(controller) == expected
+    controller.storage.close()
+
+
+def test_players_added_and_updated_are_written_to_their_shard(tmp_path, view):
+    directory = str(tmp_path / "data")
+    controller = Controller(view, ShardedStorage(directory))
+    controller.import_players(player_rows(40))
+    controller.close()
+
+    controller = Controller(view, ShardedStorage(directory))
+    controller.add_player("Nouveau", "Joueur", date(1995, 6, 1), "FR99999")
+    changed = controller.player_registry.get("FR00007")
+    changed.rating = 1234
+    controller.storage.players_updated([changed])
+    expected = sorted((player.national_id, player.rating) for player in controller.players_data)
+    controller.close()
+
+    reloaded = Controller(view, ShardedStorage(directory))
+    assert sorted((player.national_id, player.rating) for player in reloaded.players_data) == expected
+    assert len(expected) == 41
+    reloaded.close()
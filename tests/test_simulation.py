@@ -0,0 +1,30 @@
+import pytest
+
+from controllers.simulation import simulate_tournament
+
+np = pytest.importorskip("numpy")
+
+RATINGS = [2400, 2000, 1800, 1600, 1500, 1400, 1200]
+
+
+def test_same_seed_same_outcomes():
+    first = simulate_tournament(RATINGS, 5, simulations=2000, seed=42)
+    second = simulate_tournament(RATINGS, 5, simulations=2000, seed=42)
+    assert first.simulations == 2000
+    assert np.array_equal(first.wins, second.wins) and np.array_equal(first.podiums, second.podiums)
+    assert np.array_equal(first.points, second.points)
+    assert first.wins.sum() == 2000 and first.podiums.sum() == 3 * 2000
+    # Each round hands out one point per game and one for the bye
+    assert first.points.sum() == 2000 * 5 * (len(RATINGS) + 1) // 2
+    assert first.win_probability().argmax() == 0 and first.expected_score()[0] > first.expected_score()[-1]
+
+
+def test_batches_are_merged(monkeypatch):
+    monkeypatch.setattr("controllers.simulation.BATCH_CELLS", 7 * 300)  # 300 simulations per batch
+    result = simulate_tournament(RATINGS, 3, simulations=1000, seed=1)
+    assert result.simulations == 1000 and result.wins.sum() == 1000
+    assert result.points.sum() == 1000 * 3 * (len(RATINGS) + 1) // 2
+
+    merged = result.merge(simulate_tournament(RATINGS, 3, simulations=500, seed=2))
+    assert merged.simulations == 1500 and merged.podiums.sum() == 3 * 1500
+    assert np.allclose(merged.win_probability().sum(), 1)
@@ -0,0 +1,58 @@
+from datetime import date
+
+from controller import Controller
+from controllers.sqlite_storage import SqliteStorage, migrate_json_to_sqlite
+from controllers.storage import JsonStorage
+from view import MenuView
+
+from conftest import archive_state, build_archive, player_rows
+
+
+def test_round_trip(tmp_path, answers):
+    path = str(tmp_path / "data.db")
+    controller = Controller(MenuView(), SqliteStorage(path))
+    build_archive(controller, answers)
+    expected = archive_state(controller)
+    controller.storage.close()
+
+    controller = Controller(MenuView(), SqliteStorage(path))
+    assert archive_state(controller) == expected
+    assert controller.storage.find_player("FR2").first_name == "Marie"
+    assert [tournament.name for tournament in controller.storage.find_tournaments("Open")] == ["Open"]
+    controller.storage.close()
+
+
+def test_migration_keeps_the_pending_journal(tmp_path, answers, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # The migration reads the data files of the current directory
+    controller = Controller(MenuView(), JsonStorage())
+    build_archive(controller, answers)  # Everything is still in the journal
+    controller.storage.flush()
+    assert migrate_json_to_sqlite() == (3, 1)
+
+    migrated = Controller(MenuView(), SqliteStorage())
+    assert archive_state(migrated) == archive_state(controller)
+    migrated.storage.close()
+
+
+def test_save_keeps_tournaments_never_loaded(tmp_path, view):
+    path = str(tmp_path / "data.db")
+    controller = Controller(view, SqliteStorage(path))
+    controller.import_players(player_rows(4))
+    ids = [row["national_id"] for row in player_rows(4)]
+    for name in ("Open", "Blitz"):
+        controller.create_tournament(name, "Paris", date(2024, 1, 1), date(2024, 1, 2), 3, "", ids)
+    controller.pair_round(0)
+    controller.close()
+
+    controller = Controller(view, SqliteStorage(path))
+    tournament = controller.tournaments_data[1]  # Only the second tournament is loaded
+    tournament.description = "Parties rapides"
+    controller.refresh_json_files()
+    controller.close()
+
+    controller = Controller(view, SqliteStorage(path))
+    first, second = controller.tournaments_data
+    assert [round.name for round in first.rounds] == ["Tour 1"]
+    assert [player.national_id for player in first.players] == ids
+    assert second.description == "Parties rapides"
+    controller.close()
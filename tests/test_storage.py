@@ -0,0 +1,41 @@
+import json
+import os
+import shutil
+
+from controller import Controller
+from controllers.storage import TOURNAMENTS_FORMAT_VERSION, JsonStorage
+from view import MenuView
+
+from conftest import archive_state, json_paths, player_rows
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_version_1_files_are_read_and_rewritten_as_version_2(tmp_path):
+    for name in ("data_players.json", "data_tournaments.json"):  # The bundled files embed the players (version 1)
+        shutil.copy(os.path.join(ROOT, name), tmp_path / name)
+    controller = Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))
+    expected = archive_state(controller)
+    assert expected[1] and any(round.matches for tournament in controller.tournaments_data
+                               for round in tournament.rounds)
+    controller.refresh_json_files()
+    controller.storage.flush()
+
+    with open(tmp_path / "data_tournaments.json", encoding="utf-8") as file:
+        data = json.load(file)
+    assert data["version"] == TOURNAMENTS_FORMAT_VERSION
+    assert all(isinstance(national_id, str) for tournament in data["tournaments_data"]
+               for national_id in tournament["players"])
+    assert archive_state(Controller(MenuView(), JsonStorage(*json_paths(tmp_path)))) == expected
+
+
+def test_bulk_import_appends_one_journal_record(tmp_path, json_controller):
+    controller = json_controller()
+    controller.import_players(player_rows(50))
+    controller.storage.flush()
+    assert not (tmp_path / "data_players.json").exists()  # Not folded into the players file
+    assert len(list(controller.storage.journal.replay())) == 1
+
+    reloaded = json_controller()
+    assert [player.national_id for player in reloaded.players_data] == [row["national_id"] for row in player_rows(50)]
+    controller.close()
@@ -0,0 +1,104 @@
+import random
+from datetime import date
+
+import pytest
+
+from controllers.matchmaking import Matchmaking
+from models.match import Match
+from models.player import Player
+from models.round import Round
+from models.tiebreaks import Tiebreaks
+from models.tournament import Tournament
+
+# Results of the random games: wins, draws and forfeits, including double forfeits.
+RESULTS = [(1, 0), (0, 1), (0.5, 0.5), (1, 0), (0, 1), (0, 0)]
+
+
+def recompute(rounds):
+    """Return the (buchholz, sonneborn_berger, progressive) of every player, computed from the final scores."""
+    scores, games, progressive = {}, {}, {}
+    for round in rounds:
+        for match in round.matches:
+            first = match.player1.national_id
+            scores[first] = scores.get(first, 0) + match.score1
+            games.setdefault(first, [])
+            if match.player2 is not None:
+                second = match.player2.national_id
+                scores[second] = scores.get(second, 0) + match.score2
+                games[first].append((second, match.score1))
+                games.setdefault(second, []).append((first, match.score2))
+        for national_id, score in scores.items():
+            progressive[national_id] = progressive.get(national_id, 0) + score
+    return {
+        national_id: (sum(scores[opponent] for opponent, _ in played),
+                      sum(points * scores[opponent] for opponent, points in played),
+                      progressive[national_id])
+        for national_id, played in games.items()
+    }
+
+
+def make_round(players, number):
+    """Return a round pairing a random part of the players with random results, and a bye when their number is odd."""
+    present = random.sample(players, random.randint(len(players) // 2, len(players)))
+    round = Round(f"Tour {number}")
+    matches = []
+    for i in range(0, len(present) - 1, 2):
+        score1, score2 = random.choice(RESULTS)
+        matches.append(Match(present[i], score1, present[i + 1], score2))
+    if len(present) % 2:
+        matches.append(Match(present[-1], 1, None, 0))
+    round.matches = matches
+    return round
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_recorded_rounds_match_a_recomputation(seed):
+    random.seed(seed)
+    players = [Player(f"Nom{number}", f"Prenom{number}", date(1990, 1, 1), f"FR{number:05d}") for number in range(15)]
+    tournament = Tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2), 8)
+    tiebreaks = tournament.tiebreaks  # Built before the first round, then updated by add_round()
+    for number in range(1, 9):
+        before = {national_id: tiebreaks.values(national_id) for national_id in tiebreaks.scores}
+        tournament.add_round(make_round(players, number))
+        expected = recompute(tournament.rounds)
+        assert set(tiebreaks.scores) == set(expected)
+        for national_id, values in expected.items():
+            assert tiebreaks.values(national_id) == values  # Halves and quarters: exact in floating point
+            if values[:2] != before.get(national_id, (0, 0, 0))[:2]:  # The progressive score is not tracked
+                assert national_id in tiebreaks.changed
+        rebuilt = Tiebreaks.from_rounds(tournament.rounds)
+        assert {national_id: rebuilt.values(national_id) for national_id in expected} == expected
+
+
+def test_changed_holds_the_players_of_the_round_and_their_past_opponents():
+    random.seed(3)
+    players = [Player(f"Nom{number}", f"Prenom{number}", date(1990, 1, 1), f"FR{number:05d}") for number in range(100)]
+    rounds = [make_round(players, number) for number in range(1, 5)]
+    tiebreaks = Tiebreaks.from_rounds(rounds)
+    winner, loser = random.sample(players, 2)
+    round = Round("Tour 5")
+    round.matches = [Match(winner, 1, loser, 0)]
+    opponents = {(match.player2 if match.player1 is winner else match.player1).national_id
+                 for played in rounds for match in played.matches
+                 if match.player2 is not None and winner in (match.player1, match.player2)}
+
+    tiebreaks.record_round(round)
+    # Only the winner's points moved: its past opponents, and the two players of the round
+    assert tiebreaks.changed == opponents | {winner.national_id, loser.national_id}
+    assert len(tiebreaks.changed) <= 6
+
+
+def test_final_ranking_matches_a_full_sort(view):
+    random.seed(7)
+    tournament = Tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2), 6)
+    for number in range(25):
+        tournament.add_player(Player(f"Nom{number}", f"Prenom{number}", date(1990, 1, 1), f"FR{number:05d}",
+                                     rating=1500 + (number * 53) % 500))
+    seeds = {player.national_id: seed for seed, player in enumerate(tournament.players)}
+    Matchmaking(view).run_tournament(tournament)
+
+    tiebreaks = recompute(tournament.rounds)
+    ranking = sorted(tournament.players, key=lambda player: (
+        -player.tournament_points, *(-value for value in tiebreaks[player.national_id]), seeds[player.national_id]
+    ))
+    assert tournament.players == ranking
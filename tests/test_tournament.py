@@ -0,0 +1,71 @@
+from datetime import date
+
+from controller import Controller
+from controllers.storage import JsonStorage
+from models.tournament import Tournament
+
+from conftest import build_archive, json_paths, player_rows
+
+
+def test_changes_mark_the_tournament_dirty(tmp_path, view, answers):
+    controller = Controller(view, JsonStorage(*json_paths(tmp_path)))
+    build_archive(controller, answers)
+    controller.storage.compact()
+    controller.handle_choice_7()
+
+    controller = Controller(view, JsonStorage(*json_paths(tmp_path)))
+    tournament = controller.tournaments_data[0]
+    assert not tournament.dirty  # As loaded
+    tournament.rounds[0].matches[0].score1 = 0.5
+    assert tournament.dirty
+    tournament.mark_saved()
+    tournament.description = "Open d'hiver"
+    assert tournament.dirty
+    controller.refresh_json_files()
+    controller.storage.flush()
+    assert not tournament.dirty
+
+    reloaded = Controller(view, JsonStorage(*json_paths(tmp_path))).tournaments_data[0]
+    assert reloaded.description == "Open d'hiver" and reloaded.rounds[0].matches[0].score1 == 0.5
+
+    player = controller.player_registry.get("FR1")
+    version = player.version
+    player.rating = 1600
+    assert player.version == version + 1
+
+
+def test_assigning_rounds_marks_the_tournament_dirty(json_controller):
+    controller = json_controller()
+    controller.import_players(player_rows(4))
+    controller.create_tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2), 3, "",
+                                 [row["national_id"] for row in player_rows(4)])
+    controller.pair_round(0)
+    controller.storage.compact()
+    controller.close()
+
+    controller = json_controller()
+    tournament = controller.tournaments_data[0]
+    assert not tournament.dirty
+    tournament.rounds = []
+    assert tournament.dirty
+    controller.refresh_json_files()
+    controller.close()
+
+    assert json_controller().tournaments_data[0].rounds == []
+
+
+def test_version_increases_with_every_change():
+    tournament = Tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2))
+    versions = [tournament.version]
+    tournament.rounds = []
+    versions.append(tournament.version)
+    tournament.description = "Open d'été"
+    versions.append(tournament.version)
+    assert versions == sorted(set(versions))
+
+
+def test_rounds_setter_bumps_the_version_by_itself():
+    tournament = Tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2))
+    tournament.mark_saved()
+    Tournament.rounds.fset(tournament, [])  # Without the bump of __setattr__
+    assert tournament.dirty
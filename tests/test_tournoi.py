@@ -0,0 +1,84 @@
+import io
+import os
+import signal
+import subprocess
+import sys
+import time
+from datetime import date
+
+import pytest
+
+from controller import Controller
+from controllers.storage import JsonStorage
+from tournoi import run_menu
+from view import MenuView, TerminalWriter
+
+from conftest import json_paths
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_until(fd, text, timeout=10):
+    """Read the output of a pseudo-terminal until text appears."""
+    output = b""
+    deadline = time.monotonic() + timeout
+    while text not in output:
+        assert time.monotonic() < deadline, output
+        output += os.read(fd, 4096)
+    return output
+
+
+@pytest.mark.skipif(os.name == "nt", reason="needs a pseudo-terminal and SIGTERM")
+def test_sigterm_saves_and_exits_with_the_signal_status(tmp_path):
+    import pty
+    controller = Controller(MenuView(TerminalWriter(io.StringIO())), JsonStorage(*json_paths(tmp_path)))
+    controller.add_player("Nom", "Prenom", date(1990, 1, 1), "FR00001")
+    controller.storage.flush()  # Left in the journal, which closing the storage does not fold
+    controller.storage.writer.close()
+    master, slave = pty.openpty()
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "tournoi.py")], cwd=tmp_path,
+                               stdin=slave, stdout=slave, stderr=slave, env=dict(os.environ, PYTHONPATH=ROOT))
+    os.close(slave)
+    try:
+        read_until(master, "Quitter".encode())
+        process.send_signal(signal.SIGTERM)
+        assert process.wait(timeout=10) == 128 + signal.SIGTERM
+    finally:
+        process.kill()
+        os.close(master)
+    assert not (tmp_path / "data_players.json").exists()  # Quitting did not rewrite the JSON files
+    assert [player.national_id for player in
+            Controller(MenuView(), JsonStorage(*json_paths(tmp_path))).players_data] == ["FR00001"]
+
+
+class ScriptedMenuView(MenuView):
+    """A MenuView choosing the given menu options and typing the given answers, writing to memory."""
+
+    def __init__(self, choices, answers):
+        super().__init__(TerminalWriter(io.StringIO()))
+        self.choices = iter(choices)
+        self.answers = iter(answers)
+
+    def main_menu(self, controller, current_tournament):
+        return next(self.choices)
+
+    def prompt(self, message):
+        return next(self.answers)
+
+    def pause(self, message=""):
+        pass
+
+
+def test_unhandled_error_still_writes_the_queued_changes(tmp_path):
+    controller = Controller(MenuView(TerminalWriter(io.StringIO())), JsonStorage(*json_paths(tmp_path)))
+    controller.create_tournament("Open", "Paris", date(2024, 1, 1), date(2024, 1, 2), 3)
+    controller.close()
+
+    # Add a player, then answer "abc" to the number of the tournament to load
+    view = ScriptedMenuView([3, 1], ["Nom", "Prenom", "1990-01-01", "FR00001", "abc"])
+    controller = Controller(view, JsonStorage(*json_paths(tmp_path)))
+    controller.storage.writer.delay = controller.storage.writer.max_delay = 60  # Only a flush writes the journal
+    with pytest.raises(ValueError):
+        run_menu(view, controller)
+
+    assert "FR00001" in Controller(view, JsonStorage(*json_paths(tmp_path))).player_registry
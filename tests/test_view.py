@@ -0,0 +1,37 @@
+import io
+
+from view import CLEAR_LINE, CLEAR_SCREEN, TerminalWriter
+
+
+def take(stream):
+    """Return the text written to a StringIO, and empty it."""
+    text = stream.getvalue()
+    stream.seek(0)
+    stream.truncate()
+    return text
+
+
+def test_draw_rewrites_only_the_changed_lines():
+    stream = io.StringIO()
+    writer = TerminalWriter(stream)
+    writer.draw(["Menu", " >>>> Créer", "Charger", "Quitter"])
+    assert take(stream) == CLEAR_SCREEN + "Menu\n >>>> Créer\nCharger\nQuitter\n"
+
+    writer.draw(["Menu", "Créer", " >>>> Charger", "Quitter"])
+    assert take(stream) == f"\x1b[2;1H{CLEAR_LINE}Créer\x1b[3;1H{CLEAR_LINE} >>>> Charger\x1b[5;1H"
+
+    writer.line("Message")  # The frame is overwritten: the next one is drawn in full
+    writer.draw(["Menu", "Créer", " >>>> Charger", "Quitter"])
+    assert take(stream) == "Message\n" + CLEAR_SCREEN + "Menu\nCréer\n >>>> Charger\nQuitter\n"
+
+
+def test_output_is_buffered_until_flushed():
+    stream = io.StringIO()
+    writer = TerminalWriter(stream, max_buffer=10)
+    writer.line("abc")
+    assert stream.getvalue() == ""
+    writer.line("defghij")  # Over max_buffer
+    assert stream.getvalue() == "abc\ndefghij\n"
+    writer.write("k")
+    writer.flush()
+    assert stream.getvalue() == "abc\ndefghij\nk"
@@ -0,0 +1,43 @@
+import pytest
+
+from controllers.write_behind import WriteBehind, atomic_write
+
+
+def test_a_burst_of_items_is_written_with_one_call():
+    writes = []
+    writer = WriteBehind(delay=60)  # Only written by flush()
+    for item in range(5):
+        writer.submit_batch(writes.append, item)
+    writer.submit(lambda: writes.append("task"))
+    writer.submit_batch(writes.append, 5)
+    assert writes == []
+    writer.flush()
+    assert writes == [[0, 1, 2, 3, 4], "task", [5]]
+    writer.close()
+
+
+def test_errors_are_raised_by_the_next_flush():
+    writes = []
+    writer = WriteBehind(delay=0)
+
+    def fail():
+        raise OSError("disque plein")
+
+    writer.submit(fail)
+    writer.submit_batch(writes.append, 1)  # Still written after the error
+    with pytest.raises(OSError):
+        writer.flush()
+    assert writes == [[1]]
+    writer.close()
+
+
+def test_atomic_write_keeps_the_previous_content_on_error(tmp_path):
+    path = str(tmp_path / "data.json")
+    with atomic_write(path) as file:
+        file.write("avant")
+    with pytest.raises(ValueError):
+        with atomic_write(path) as file:
+            file.write("apr")
+            raise ValueError
+    with open(path) as file:
+        assert file.read() == "avant"
@@ -1,32 +1,88 @@
+import os
+import signal
+import sys
+
 from controller import Controller
+from controllers.sqlite_storage import SqliteStorage
+from controllers.sharded_storage import ShardedStorage
 from view import MenuView
 
-if __name__ == "__main__":
-    menu_view = MenuView()
-    controller = Controller(menu_view)
+
+def quit_on_signal(signum, frame):
+    """
+    Turn a termination signal into SystemExit with the status 128 + signum, so the pending writes are
+    flushed before quitting and a supervisor still sees the signal in the exit status.
+    """
+    sys.exit(128 + signum)
+
+
+def open_storage():
+    """
+    Open the storage backend of the data in the current directory: the SQLite database or the
+    sharded data directory once created by their migration script, the JSON files otherwise.
+    Returns:
+        Storage: The backend, or None for the default JsonStorage.
+    """
+    if os.path.exists("data_tournois.db"):
+        return SqliteStorage("data_tournois.db")
+    if os.path.exists(os.path.join("data", "manifest.json")):
+        return ShardedStorage("data")
+    return None
+
+
+def run_menu(menu_view, controller):
+    """
+    Run the main menu until the user quits. The storage is closed on every way out, so the writes
+    still queued in the background writer are never lost, even when an error ends the application.
+    Args:
+        menu_view (MenuView): The view of the menu.
+        controller (Controller): The controller of the data.
+    Raises:
+        SystemExit: After a termination signal, with the status 128 + signum.
+        Exception: Any unexpected error, raised again once the pending changes are saved.
+    """
     current_tournament = None
+    menu_view.print_message("Bienvenue dans le gestionnaire de tournois d'échecs!")
+
+    try:
+        while True:
+            choice = menu_view.main_menu(controller, current_tournament)
+
+            if choice == 0:
+                controller.handle_choice_0()
+            elif choice == 1:
+                current_tournament = controller.handle_choice_1(current_tournament)
+            elif choice == 2:
+                controller.handle_choice_2(current_tournament)
+            elif choice == 3:
+                controller.handle_choice_3()
+            elif choice == 4:
+                controller.handle_choice_4(current_tournament)
+            elif choice == 5:
+                controller.handle_choice_5(current_tournament)
+            elif choice == 6:
+                controller.handle_choice_6(current_tournament)
+            elif choice == 7:
+                if not controller.handle_choice_7():
+                    break
+            else:
+                menu_view.print_message("Option invalide, veuillez réessayer.")
+    except (KeyboardInterrupt, EOFError):
+        # Ctrl+C or end of input: quit as with option 7, saving the pending changes
+        menu_view.print_message("")
+        controller.handle_choice_7()
+    except BaseException:
+        # Termination signal (SystemExit with the status 128 + signum) or unexpected error, e.g. a
+        # ValueError on a non-numeric answer: save the pending changes, then let it end the process
+        controller.close()
+        menu_view.flush()
+        raise
+
 
-    print("Bienvenue dans le gestionnaire de tournois d'échecs!")
-
-    while True:
-        choice = menu_view.main_menu(controller, current_tournament)
-
-        if choice == 0:
-            controller.handle_choice_0()
-        elif choice == 1:
-            current_tournament = controller.handle_choice_1(current_tournament)
-        elif choice == 2:
-            controller.handle_choice_2(current_tournament)
-        elif choice == 3:
-            controller.handle_choice_3()
-        elif choice == 4:
-            controller.handle_choice_4(current_tournament)
-        elif choice == 5:
-            controller.handle_choice_5(current_tournament)
-        elif choice == 6:
-            controller.handle_choice_6(current_tournament)
-        elif choice == 7:
-            if not controller.handle_choice_7():
-                break
-        else:
-            print("Option invalide, veuillez réessayer.")
+if __name__ == "__main__":
+    for name in ("SIGTERM", "SIGHUP"):
+        if hasattr(signal, name):  # SIGHUP does not exist on Windows
+            signal.signal(getattr(signal, name), quit_on_signal)
+
+    menu_view = MenuView()
+    run_menu(menu_view, Controller(menu_view, open_storage()))
@@ -1,25 +1,169 @@
 import os
 import sys
+from itertools import chain, islice
 
 if os.name == 'nt':
     import msvcrt
 else:
+    import select
     import tty
     import termios
 
+# Number of report lines displayed per page.
+PAGE_SIZE = 20
+
+# ANSI escape sequences: cursor to the top left corner and clear the screen, clear the current line.
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+CLEAR_LINE = "\x1b[2K"
+
+# Unix escape sequences of the arrow keys, translated to the key codes returned by msvcrt.
+ARROW_KEYS = {"\x1b[A": b'H', "\x1b[B": b'P', "\x1bOA": b'H', "\x1bOB": b'P'}
+
+
+def enable_ansi():
+    """Enable the interpretation of ANSI escape sequences by the Windows console (always enabled elsewhere)."""
+    if os.name != 'nt':
+        return
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # Standard output
+        mode = ctypes.c_ulong()
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            kernel32.SetConsoleMode(handle, mode.value | 0x0004)  # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+    except (AttributeError, OSError):
+        pass
+
+
+class TerminalWriter:
+    """
+    A buffered writer through which all the output of the views goes.
+    Text is collected in memory and written to the terminal in a single call when the view waits
+    for the user (flush()), instead of one write per print. Screens are drawn with ANSI escape
+    sequences instead of running the clear command in a subprocess, and draw() only rewrites the
+    lines that differ from the frame it drew previously, e.g. the two lines whose highlight moved.
+    Attributes:
+        stream (file): The output stream, sys.stdout at the time of writing if None.
+        max_buffer (int): Number of buffered characters above which the buffer is flushed.
+    Methods:
+        write(text): Buffers text.
+        line(text): Buffers a line of text.
+        clear(): Buffers a screen clear.
+        draw(lines): Draws a frame, rewriting only the lines changed since the previous frame.
+        read_line(prompt): Flushes the buffer, then reads a line typed by the user.
+        flush(): Writes the buffered text to the terminal.
+    """
+
+    def __init__(self, stream=None, max_buffer=65536):
+        self.stream = stream
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._size = 0
+        self._frame = None  # Lines of the frame on screen, None once anything else was written
+
+    def _append(self, text):
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size > self.max_buffer:
+            self.flush()
+
+    def write(self, text):
+        """Buffers text. The frame on screen is then considered overwritten."""
+        self._frame = None
+        self._append(text)
+
+    def line(self, text=""):
+        """Buffers a line of text."""
+        self.write(f"{text}\n")
+
+    def clear(self):
+        """Buffers the sequence clearing the screen."""
+        self.write(CLEAR_SCREEN)
+
+    def draw(self, lines):
+        """
+        Draws a full-screen frame, then flushes.
+        If the previous frame is still on screen, only the lines that differ are rewritten
+        (cursor moved to the line, line cleared, new text); otherwise the screen is cleared first.
+
+        Args:
+            lines (List[str]): The lines of the frame.
+        """
+        previous = self._frame
+        if previous is None or len(previous) != len(lines):
+            self._append(CLEAR_SCREEN + "".join(f"{line}\n" for line in lines))
+        else:
+            for row, (old, new) in enumerate(zip(previous, lines), 1):
+                if old != new:
+                    self._append(f"\x1b[{row};1H{CLEAR_LINE}{new}")
+            self._append(f"\x1b[{len(lines) + 1};1H")  # Cursor back below the frame
+        self._frame = list(lines)
+        self.flush()
+
+    def read_line(self, prompt=""):
+        """
+        Flushes the buffered text and the prompt, then reads a line typed by the user.
+
+        Args:
+            prompt (str): The prompt displayed before the input.
+
+        Returns:
+            str: The line typed, without the trailing newline.
+        """
+        self.write(prompt)
+        self.flush()
+        return input()
+
+    def flush(self):
+        """Writes the buffered text to the terminal in a single call."""
+        if self._buffer:
+            stream = self.stream if self.stream is not None else sys.stdout
+            stream.write("".join(self._buffer))
+            stream.flush()
+            self._buffer.clear()
+            self._size = 0
+
 
 class MenuView:
     """
     Menu view for displaying and navigating the main menu.
+    All the output goes through a buffered TerminalWriter, and input is read through it so the
+    pending output is displayed first.
     Methods:
-        __init__(): Initialize the menu view.
-        print_header(current_tournament): Print the header for the menu.
+        __init__(writer): Initialize the menu view.
+        header_lines(current_tournament): Return the lines of the header for the menu.
+        print_header(current_tournament): Clear the screen and print the header for the menu.
         get_key(): Get a single key press from the user.
         main_menu(controller, current_tournament): Display the main menu and handle user input.
         print_message(message): Print a message to the console.
+        prompt(message): Ask the user for a line of text.
+        pause(message): Wait for the user to press Enter.
+        flush(): Display the buffered output.
+        page(title, lines, empty_message, page_size): Display report lines one page at a time.
     """
-    def __init__(self):
-        pass
+    def __init__(self, writer=None):
+        self.writer = writer if writer is not None else TerminalWriter()
+        enable_ansi()
+
+    def header_lines(self, current_tournament):
+        """
+        Returns the lines of the header for the chess tournament management system.
+
+        Args:
+            current_tournament (object): The current tournament object. It should have a 'name' attribute.
+                                         If None, a message indicating no tournament is loaded is displayed.
+
+        Returns:
+            List[str]: The lines of the header.
+        """
+        lines = ["\t\tGESTION DE TOURNOIS D'ECHECS", ""]
+        if current_tournament:
+            lines.append(f"\t\tTOURNOI OUVERT: {current_tournament.name}\t\t")
+        else:
+            lines.append("\t\t_________________________________________________________")
+            lines.append("\t\t   Aucun Tournoi Chargé                                  \t\t")
+            lines.append("\t\t_________________________________________________________")
+        return lines
 
     def print_header(self, current_tournament):
         """
@@ -32,24 +176,21 @@ class MenuView:
         Returns:
             None
         """
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("\t\tGESTION DE TOURNOIS D'ECHECS")
-        print("")
-        if current_tournament:
-            print(f"\t\tTOURNOI OUVERT: {current_tournament.name}\t\t")
-        else:
-            print("\t\t_________________________________________________________")
-            print("\t\t   Aucun Tournoi Chargé                                  \t\t")
-            print("\t\t_________________________________________________________")
+        self.writer.clear()
+        for line in self.header_lines(current_tournament):
+            self.writer.line(line)
 
     def get_key(self):
         """
         Get a single key press from the user (without needing him to press Enter).
+        The arrow keys and Enter are returned as on Windows (b'H', b'P', b'\\r') on every system.
 
         Returns:
             key (bytes or str): The key pressed by the user. On Windows, returns a byte string.
-                                On Unix-like systems, returns a single character string.
+                                On Unix-like systems, returns a single character string,
+                                or the Windows code of an arrow key or Enter.
         """
+        self.writer.flush()
         if os.name == 'nt':
             key = msvcrt.getch()
             if key == b'\xe0':  # Arrow keys are preceded by '\xe0'
@@ -59,15 +200,23 @@ class MenuView:
             fd = sys.stdin.fileno()
             old_settings = termios.tcgetattr(fd)
             try:
-                tty.setraw(sys.stdin.fileno())
-                key = sys.stdin.read(1)
+                tty.setraw(fd)
+                key = os.read(fd, 1).decode(errors="replace")
+                # The rest of an escape sequence follows at once; a lone Escape key does not
+                while key.startswith("\x1b") and len(key) < 3 and select.select([fd], [], [], 0.05)[0]:
+                    key += os.read(fd, 1).decode(errors="replace")
             finally:
                 termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
-            return key
+            if key in ("\r", "\n"):
+                return b'\r'
+            if key == "\x03":  # Ctrl+C, not turned into a signal in raw mode
+                raise KeyboardInterrupt
+            return ARROW_KEYS.get(key, key)
 
     def main_menu(self, controller, current_tournament):
         """
         Show the main menu and let the user navigate with arrow keys.
+        The menu is drawn once, then each key press only redraws the two options whose highlight changed.
         Args:
             controller: The controller object to manage the data.
             current_tournament: The current tournament object to show in the header.
@@ -89,22 +238,13 @@ class MenuView:
             "\tQuitter"
         ]
         selected_index = 0
+        header = self.header_lines(current_tournament) + [""]
+        offset = "\t\t"
 
         while True:
-            self.print_header(current_tournament)
-            print("")
-
-            offset = "\t\t"
-            for i, option in enumerate(options):
-                if i == selected_index:
-                    print(offset + " >>>> " f"{option}")
-                else:
-                    print(offset + option)
-
-            k = 0
-            while k < 5:
-                print()
-                k += 1
+            menu = [offset + " >>>> " f"{option}" if i == selected_index else offset + option
+                    for i, option in enumerate(options)]
+            self.writer.draw(header + menu + [""] * 5)
 
             key = self.get_key()
             if key == b'H':  # Up arrow key
@@ -122,12 +262,75 @@ class MenuView:
             winners (list): A list of players who won the round.
         """
         winner_names = ", ".join(f"{winner.first_name} {winner.last_name}" for winner in winners)
-        print(f"Gagnant(s) du tour {round_number}: {winner_names}")
+        self.writer.line(f"Gagnant(s) du tour {round_number}: {winner_names}")
 
     def print_message(self, message):
         """
-        Print a message to the console.
+        Print a message to the console. It is displayed at the next prompt or flush().
         Args:
             message (str): The message to print.
         """
-        print(message)
+        self.writer.line(message)
+
+    def prompt(self, message):
+        """
+        Ask the user for a line of text.
+        Args:
+            message (str): The prompt.
+        Returns:
+            str: The text typed by the user.
+        """
+        return self.writer.read_line(message)
+
+    def pause(self, message="Appuyez sur Entrée pour continuer..."):
+        """
+        Wait for the user to press Enter.
+        Args:
+            message (str): The prompt.
+        """
+        self.writer.read_line(message)
+
+    def flush(self):
+        """Display the buffered output, e.g. before quitting."""
+        self.writer.flush()
+
+    def page(self, title, lines, empty_message=None, page_size=PAGE_SIZE):
+        """
+        Display the lines of a report one page at a time.
+        The lines are consumed lazily: only the displayed pages are built, and leaving the pager
+        stops the generator, so the first page of a large report shows up at once.
+        Args:
+            title (str): The title of the report.
+            lines (Iterable[str]): The lines of the report.
+            empty_message (str): Displayed when there are no lines.
+            page_size (int): The number of lines per page.
+        Returns:
+            bool: True if the user asked to export the report.
+        """
+        source = lines = iter(lines)
+        page_number = 1
+        try:
+            self.writer.line(f"\n{title}")
+            while True:
+                page = list(islice(lines, page_size))
+                if not page and page_number == 1:
+                    if empty_message:
+                        self.writer.line(empty_message)
+                    self.pause()
+                    return False
+                for line in page:
+                    self.writer.line(line)
+                following = next(lines, None)
+                if following is None:
+                    choice = self.prompt("Fin du rapport. Entrée: retour, e: exporter ")
+                    return choice.strip().lower() == "e"
+                lines = chain([following], lines)
+                choice = self.prompt(f"Page {page_number}. Entrée: page suivante, e: exporter, q: retour ")
+                choice = choice.strip().lower()
+                if choice in ("e", "q"):
+                    return choice == "e"
+                page_number += 1
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()